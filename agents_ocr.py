@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Page-aware reader for the Department of Shipping approved agents OCR dump.
+
+agents_ocr.txt is a series of ``==Start of OCR for page N==`` sections. Every
+page repeats the table header and browser print footers, and an agent entry
+can start on one page and finish on the next. This module cleans each page on
+its own (in a process pool for large lists) and then stitches the pages back
+together in page order so entries that straddle a page break stay whole.
+"""
+
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+PAGE_PATTERN = re.compile(
+    r'==Start of OCR for page (\d+)==\n?(.*?)==End of OCR for page \1==',
+    re.DOTALL,
+)
+ENTRY_PATTERN = re.compile(r'(MLA\s*-?\s*\d+)')
+DANGLING_LICENSE = re.compile(r'MLA\s*-?\s*$')
+LEADING_LICENSE_NUMBER = re.compile(r'^\s*(\d+)\b')
+
+# Table header lines printed at the top of every page (compared lowercased)
+HEADER_LINES = {
+    'approved seamen recruiting agents',
+    'content: pages',
+    'license',
+    'no',
+    'license no',
+    "name of the company and address owner's name validity",
+}
+
+# Browser print furniture that can appear anywhere on a page
+FOOTER_PATTERNS = [
+    re.compile(r'^\d{1,2}/\d{1,2}/\d{2,4},\s*\d{1,2}:\d{2}\s*[AP]M\s*about:blank$', re.IGNORECASE),
+    re.compile(r'^about:blank\s*\d+/\d+$', re.IGNORECASE),
+]
+
+
+def normalize_license(raw):
+    """Turn OCR variants like 'MLA -\\n002' or 'MLA 140' into 'MLA-002'."""
+    license_no = re.sub(r'\s+', '', raw)
+    if 'MLA-' not in license_no:
+        license_no = license_no.replace('MLA', 'MLA-')
+    return license_no
+
+
+def split_pages(text):
+    """Return [(page_number, page_text)] in page order.
+
+    Text without page markers is treated as a single page.
+    """
+    pages = [(int(m.group(1)), m.group(2)) for m in PAGE_PATTERN.finditer(text)]
+    if not pages:
+        return [(1, text)]
+    pages.sort(key=lambda p: p[0])
+    return pages
+
+
+def strip_page_furniture(body):
+    """Drop the repeated table header and print footers from one page."""
+    lines = body.split('\n')
+
+    # The column header only ever appears before the first entry of a page,
+    # so only strip header lines at the top. "License" also shows up inside
+    # entries ("License\nsuspended") and must survive there.
+    start = 0
+    while start < len(lines):
+        stripped = lines[start].strip()
+        if stripped and stripped.lower() not in HEADER_LINES:
+            break
+        start += 1
+
+    kept = []
+    for line in lines[start:]:
+        stripped = line.strip()
+        if any(p.match(stripped) for p in FOOTER_PATTERNS):
+            continue
+        if stripped.lower() == "name of the company and address owner's name validity":
+            continue
+        kept.append(line)
+    return '\n'.join(kept)
+
+
+def parse_page(page):
+    """Split one (page_number, text) page into its pieces.
+
+    Returns a dict with the text before the first license on the page
+    (``head``, the tail of an entry from the previous page), the entries that
+    start on this page, and whether the page ends with a bare "MLA -" whose
+    number was pushed onto the next page.
+    """
+    page_no, body = page
+    cleaned = strip_page_furniture(body)
+    parts = ENTRY_PATTERN.split(cleaned)
+
+    entries = []
+    for i in range(1, len(parts), 2):
+        content = parts[i + 1] if i + 1 < len(parts) else ''
+        entries.append([normalize_license(parts[i]), content.strip()])
+
+    head = parts[0].strip()
+    dangling = False
+    if entries:
+        if DANGLING_LICENSE.search(entries[-1][1]):
+            entries[-1][1] = DANGLING_LICENSE.sub('', entries[-1][1]).strip()
+            dangling = True
+    elif DANGLING_LICENSE.search(head):
+        head = DANGLING_LICENSE.sub('', head).strip()
+        dangling = True
+
+    return {'page': page_no, 'head': head, 'entries': entries, 'dangling': dangling}
+
+
+def stitch_pages(parsed_pages):
+    """Merge parsed pages into [(license, content)] in a deterministic order.
+
+    Each page's head is appended to the last entry seen so far; a license
+    number split from its "MLA -" prefix by a page break starts a new entry.
+    """
+    entries = []
+    dangling = False
+
+    for page in sorted(parsed_pages, key=lambda p: p['page']):
+        head = page['head']
+
+        if dangling:
+            match = LEADING_LICENSE_NUMBER.match(head)
+            if match:
+                entries.append([f"MLA-{match.group(1)}", head[match.end():].strip()])
+                head = ''
+
+        if head:
+            if entries:
+                entries[-1][1] = f"{entries[-1][1]}\n{head}".strip()
+            # Text before the very first entry is preamble and is dropped
+
+        entries.extend([list(e) for e in page['entries']])
+        dangling = page['dangling']
+
+    return [(license_no, content) for license_no, content in entries]
+
+
+def _chunksize(count, workers):
+    return max(1, count // (workers * 4))
+
+
+def read_entries(file_path, workers=None, build=None):
+    """Read an OCR dump page by page and return its stitched entries.
+
+    Pages are parsed across ``workers`` processes (all cores by default,
+    ``1`` to stay in-process). If ``build`` is given it must be a picklable
+    top-level callable taking ``(license, content)``; it is mapped over the
+    stitched entries in the same pool and its results are returned instead.
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        text = f.read()
+
+    pages = split_pages(text)
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(pages) < 2:
+        entries = stitch_pages([parse_page(p) for p in pages])
+        if build is None:
+            return entries
+        return [build(license_no, content) for license_no, content in entries]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        parsed = list(pool.map(parse_page, pages, chunksize=_chunksize(len(pages), workers)))
+        entries = stitch_pages(parsed)
+        if build is None:
+            return entries
+        return list(pool.map(
+            build,
+            [e[0] for e in entries],
+            [e[1] for e in entries],
+            chunksize=_chunksize(len(entries), workers),
+        ))
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Incremental sync of the approved agents list.
+
+Re-parses agents_ocr.txt, compares a fingerprint per license number with the
+previous run and writes only the added, changed and removed agents as a SQL
+delta. components/agentsData.ts is rewritten only when its content changes.
+
+The saved fingerprints only move forward once a delta is applied: with
+--dsn right after applying it, otherwise when `--mark-applied` is run after
+agents_delta.sql was applied by hand. Until then each run rewrites the delta
+against the last applied state, so no change is lost. A parse that comes back
+empty, or would remove more than MAX_REMOVED_SHARE of the known licenses,
+aborts without touching the delta or the state (--allow-removals overrides
+the share check).
+"""
+
+import os
+import sys
+import json
+import hashlib
+import argparse
+from datetime import datetime
+
+import parse
+import generate_agents_ts
+
+STATE_FILE = "agents_sync_state.json"
+DELTA_FILE = "agents_delta.sql"
+TS_FILE = os.path.join("components", "agentsData.ts")
+MAX_REMOVED_SHARE = 0.2  # more removals than this looks like a broken parse, not a list update
+
+
+def fingerprint(agent):
+    """Stable hash of the fields that end up in public.manning_agents."""
+    row = {k: v for k, v in agent.items() if k != 'id'}
+    payload = json.dumps(row, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def load_state(path):
+    if not os.path.exists(path):
+        return {'fingerprints': {}}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_state(path, fingerprints):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'synced_at': datetime.utcnow().isoformat(),
+            'total_agents': len(fingerprints),
+            'fingerprints': fingerprints,
+        }, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def diff_agents(agents, previous):
+    """Split agents into (added, changed, removed_licenses, fingerprints)."""
+    current = {}
+    by_license = {}
+    for a in agents:
+        # Last occurrence wins, matching the upsert batches in parse.write_sql
+        by_license[a['license']] = a
+        current[a['license']] = fingerprint(a)
+
+    added = [a for lic, a in by_license.items() if lic not in previous]
+    changed = [a for lic, a in by_license.items() if lic in previous and previous[lic] != current[lic]]
+    removed = sorted(lic for lic in previous if lic not in current)
+    return added, changed, removed, current
+
+
+def write_delta_sql(out, added, changed, removed, batch_size=100):
+    out.write(f"-- Agents delta generated {datetime.utcnow().isoformat()}\n")
+    out.write(f"-- {len(added)} added, {len(changed)} changed, {len(removed)} removed\n\n")
+    out.write("BEGIN;\n\n")
+    parse.write_sql(added + changed, out, batch_size=batch_size, include_schema=False)
+    if removed:
+        licenses = ", ".join(parse._sql_literal(lic) for lic in removed)
+        out.write(f"DELETE FROM public.manning_agents WHERE license_number IN ({licenses});\n\n")
+    out.write("COMMIT;\n")
+
+
+def _pending_path(state_file):
+    return f"{state_file}.pending"
+
+
+def sync(ocr_file, state_file=STATE_FILE, delta_file=DELTA_FILE, ts_file=TS_FILE,
+         page_aware=False, workers=None, dsn=None, allow_removals=False):
+    state = load_state(state_file)
+    previous = state.get('fingerprints', {})
+
+    agents = parse.parse_agents(ocr_file, page_aware=page_aware, workers=workers)
+    if not agents:
+        raise RuntimeError(f"No agents parsed from {ocr_file}; delta and state left unchanged")
+    added, changed, removed, current = diff_agents(agents, previous)
+
+    print(f"🔍 {len(agents)} agents parsed: {len(added)} added, {len(changed)} changed, {len(removed)} removed")
+
+    if previous and len(removed) > MAX_REMOVED_SHARE * len(previous) and not allow_removals:
+        raise RuntimeError(f"{len(removed)} of {len(previous)} licenses would be removed; check the parse "
+                           "or rerun with --allow-removals. Delta and state left unchanged")
+
+    if added or changed or removed:
+        with open(delta_file, 'w', encoding='utf-8') as f:
+            write_delta_sql(f, added, changed, removed)
+        print(f"💾 Delta written to {delta_file}")
+
+        if dsn:
+            apply_delta(delta_file, dsn)
+            print("✅ Delta applied to database")
+            save_state(state_file, current)
+            if os.path.exists(_pending_path(state_file)):
+                os.remove(_pending_path(state_file))
+        else:
+            # Not applied yet: the next run diffs against the last applied state again
+            save_state(_pending_path(state_file), current)
+            print(f"⏳ State not advanced; run with --mark-applied once {delta_file} is applied")
+    else:
+        print("✅ No license changes since last sync")
+        save_state(state_file, current)
+
+    ts_agents = generate_agents_ts.parse_agents(ocr_file, page_aware=page_aware, workers=workers)
+    if generate_agents_ts.write_if_changed(ts_file, generate_agents_ts.to_ts_array(ts_agents)):
+        print(f"💾 Regenerated {ts_file}")
+    else:
+        print(f"⏭️  {ts_file} unchanged")
+
+    return added, changed, removed
+
+
+def mark_applied(state_file=STATE_FILE):
+    """Advance the state to the fingerprints of the last delta written without --dsn."""
+    pending = _pending_path(state_file)
+    if not os.path.exists(pending):
+        raise RuntimeError(f"No pending delta state ({pending})")
+    os.replace(pending, state_file)
+
+
+def apply_delta(delta_file, dsn):
+    try:
+        import psycopg
+    except ImportError:
+        raise RuntimeError('Applying deltas needs psycopg: pip install "psycopg[binary]"')
+
+    with open(delta_file, 'r', encoding='utf-8') as f:
+        sql = f.read()
+    # The delta carries its own BEGIN/COMMIT
+    with psycopg.connect(dsn, autocommit=True) as conn:
+        conn.execute(sql)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Emit only the agent licenses that changed since the last sync")
+    parser.add_argument('ocr_file', nargs='?', default='agents_ocr.txt')
+    parser.add_argument('--state', default=STATE_FILE)
+    parser.add_argument('--delta', default=DELTA_FILE)
+    parser.add_argument('--ts-out', default=TS_FILE)
+    parser.add_argument('--page-aware', action='store_true')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--dsn', default=os.environ.get('DATABASE_URL'), help="Apply the delta to this database")
+    parser.add_argument('--allow-removals', action='store_true',
+                        help=f"Accept deltas removing more than {MAX_REMOVED_SHARE:.0%} of the known licenses")
+    parser.add_argument('--mark-applied', action='store_true',
+                        help="Record the last delta (written without --dsn) as applied")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.mark_applied:
+            mark_applied(args.state)
+            print(f"✅ {args.state} advanced to the last written delta")
+            return
+        sync(args.ocr_file, state_file=args.state, delta_file=args.delta, ts_file=args.ts_out,
+             page_aware=args.page_aware, workers=args.workers, dsn=args.dsn,
+             allow_removals=args.allow_removals)
+    except RuntimeError as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""
+Agents list benchmarks: OCR parsing in both modes and SQL generation.
+"""
+
+import io
+import os
+import sys
+import tempfile
+import contextlib
+
+from generators import REPO_ROOT, make_ocr_list
+
+sys.path.insert(0, REPO_ROOT)
+
+BASE_AGENTS = 83  # entries in the current Department of Shipping list
+
+
+def _ocr_file(scale):
+    fd, path = tempfile.mkstemp(prefix="bench-agents-", suffix=".txt")
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(make_ocr_list(BASE_AGENTS * scale))
+    return path
+
+
+def bench_parse_agents(scale):
+    from parse import parse_agents
+    path = _ocr_file(scale)
+    return lambda: parse_agents(path)
+
+
+def bench_parse_agents_page_aware(scale):
+    from parse import parse_agents
+    path = _ocr_file(scale)
+    return lambda: parse_agents(path, page_aware=True)
+
+
+def bench_generate_agents_ts(scale):
+    import generate_agents_ts
+    path = _ocr_file(scale)
+    return lambda: generate_agents_ts.to_ts_array(generate_agents_ts.parse_agents(path))
+
+
+def bench_write_sql(scale):
+    from parse import parse_agents, write_sql
+    with contextlib.redirect_stdout(io.StringIO()):
+        agents = parse_agents(_ocr_file(scale))
+    return lambda: write_sql(agents, io.StringIO())
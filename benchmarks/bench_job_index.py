@@ -0,0 +1,86 @@
+"""
+Static job search index benchmarks: building the index files after a run and
+answering JobBoard filter queries from them.
+
+Jobs are the extracted synthetic listings repeated to JOBS_PER_SCALE per
+scale step (24,000 at scale 100), each made distinct and given its own
+salary, contract, agency and date so the facets and ranges are realistic.
+Query runs fetch one page of ids per query, as the JobBoard does, and report
+the match count of the last query as ``matches``.
+"""
+
+import shutil
+import tempfile
+
+from bench_sinks import _jobs
+
+JOBS_PER_SCALE = 240
+AGENCIES = 150
+PAGE_SIZE = 50  # the JobBoard shows one page of matches
+
+
+def _index_jobs(scale):
+    base = [job.to_dict() for job in _jobs(1)]
+    jobs = []
+    for i in range(JOBS_PER_SCALE * scale):
+        job = dict(base[i % len(base)])
+        job['raw_content'] = f"{job.get('raw_content', '')} #{i}"
+        salary = 1200 + (i * 37) % 9000 if i % 3 else None
+        job['salary'] = f"${salary}" if salary else None
+        job['salary_min'], job['salary_max'] = salary, salary
+        job['salary_currency'], job['salary_period'] = ('USD', 'month') if salary else (None, None)
+        job['contract'], job['contract_months'] = f"{3 + i % 10}M (+1)", 3 + i % 10
+        job['agency'] = f"Agency {i % AGENCIES}"
+        job['scraped_at'] = f"2026-{1 + i % 12:02d}-{1 + i % 28:02d}T00:00:{i % 60:02d}"
+        jobs.append(job)
+    return jobs
+
+
+def _built_index(scale):
+    from job_index import JobIndex, write_job_index
+    out_dir = tempfile.mkdtemp(prefix="bench-job-index-")
+    write_job_index(_index_jobs(scale), out_dir)
+    return JobIndex(out_dir)
+
+
+def bench_build_job_index(scale):
+    from job_index import write_job_index
+    jobs = _index_jobs(scale)
+
+    def run():
+        out_dir = tempfile.mkdtemp(prefix="bench-job-index-")
+        try:
+            report = write_job_index(jobs, out_dir)
+            return {"output_bytes": report['bytes'], "index_bytes": report['index_bytes']}
+        finally:
+            shutil.rmtree(out_dir)
+    return run
+
+
+def bench_query_job_index_facets(scale):
+    """Rank + ship type + agency: bitset intersections only."""
+    index = _built_index(scale)
+    queries = [{'rank': 'Able Seaman'}, {'rank': 'Fitter', 'agency': 'Agency 7'},
+               {'rank': 'Able Seaman', 'ship_type': 'Container'}]
+
+    def run():
+        for q in queries:
+            index.query(limit=PAGE_SIZE, **q)
+        return {"matches": index.count(**queries[-1])}
+    return run
+
+
+def bench_query_job_index_ranges(scale):
+    """Salary and contract ranges combined with a rank and a title prefix."""
+    index = _built_index(scale)
+    queries = [{'salary_min': 3000, 'salary_max': 5000},
+               {'rank': 'Able Seaman', 'salary_min': 2000, 'contract_max': 6},
+               {'title': 'ab', 'contract_min': 8}]
+    for q in queries:  # range and term files are loaded once, like the browser caches them
+        index.query(**q)
+
+    def run():
+        for q in queries:
+            index.query(limit=PAGE_SIZE, **q)
+        return {"matches": index.count(**queries[-1])}
+    return run
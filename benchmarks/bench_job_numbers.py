@@ -0,0 +1,47 @@
+"""
+Numeric normalizer benchmarks over the archived snapshots (jobs/jobs_<stamp>.json / .ndjson,
+repeated ``scale`` times): parsing each row's strings in turn against
+`job_numbers.normalize_jobs`, which works column by column and parses each
+distinct card, salary and contract string once per batch.
+
+Each run reports the jobs that got a salary as ``with_salary``.
+"""
+
+import os
+import glob
+
+from generators import JOBS_DIR
+
+
+def _snapshot_jobs(scale):
+    from job_sinks import read_jobs
+    jobs = [job for path in sorted(glob.glob(os.path.join(JOBS_DIR, "jobs_[0-9]*.*json")))
+            for job in read_jobs(path)]
+    return [dict(job) for _ in range(scale) for job in jobs]
+
+
+def bench_normalize_rows(scale):
+    """Row at a time: every salary, contract and card is parsed for every job."""
+    from job_numbers import card_text, parse_contract, parse_salary, parse_size, _salary_label
+    jobs = _snapshot_jobs(scale)
+
+    def run():
+        with_salary = 0
+        for job in jobs:
+            card = card_text(job)
+            salary = parse_salary(_salary_label(card) or job.get('salary'))
+            if salary:
+                job['salary_min'], job['salary_max'], job['salary_currency'], job['salary_period'] = salary
+                with_salary += 1
+            contract = parse_contract(job.get('contract'))
+            if contract:
+                job['contract_months'], job['contract_extension_months'] = contract
+            job.update(parse_size(card) or {})
+        return {"with_salary": with_salary}
+    return run
+
+
+def bench_normalize_batch(scale):
+    from job_numbers import normalize_jobs
+    jobs = _snapshot_jobs(scale)
+    return lambda: {"with_salary": normalize_jobs(jobs)}
@@ -0,0 +1,71 @@
+"""
+JobPosting record benchmarks: memory and encode time against the plain job
+dicts the scrapers used before.
+
+Records are loaded from NDJSON lines (as when reading archived snapshots), so
+every record starts with its own copies of the strings.
+"""
+
+import json
+
+from bench_sinks import _jobs
+
+
+def _ndjson_lines(scale):
+    return [json.dumps(job.to_dict(), ensure_ascii=False) for job in _jobs(scale)] * 10
+
+
+def _legacy_row(job):
+    """upload_to_supabase_rest's row construction before JobPosting."""
+    return {
+        'raw_content': job.get('raw_content', ''),
+        'source': job.get('source', 'MariAid'),
+        'status': 'parsed',
+        'rank': job.get('rank', 'Other'),
+        'salary': job.get('salary'),
+        'joining_date': 'ASAP',
+        'mla_number': job.get('mla_number'),
+        'agency': job.get('agency'),
+        'agency_address': job.get('agent_address'),
+        'agency_email': job.get('agent_email'),
+        'parsed_content': {
+            'rank': job.get('rank'),
+            'shipType': job.get('ship_type', 'Other'),
+            'salary': job.get('salary'),
+            'wage': job.get('salary'),
+            'joining_date': 'ASAP',
+            'joiningDate': 'ASAP',
+            'description': job.get('raw_content', ''),
+            'company': job.get('agency'),
+            'companyName': job.get('agency'),
+            'mla_number': job.get('mla_number'),
+            'contact': job.get('apply_url', ''),
+            'contactInfo': job.get('apply_url', ''),
+            'agentName': job.get('agent_name'),
+            'agentStatus': job.get('agent_status'),
+            'licenseValidity': job.get('agent_validity'),
+            'licenseFlag': job.get('license_flag'),
+        }
+    }
+
+
+def bench_load_job_dicts(scale):
+    lines = _ndjson_lines(scale)
+    return lambda: [json.loads(line) for line in lines]
+
+
+def bench_load_job_postings(scale):
+    from job_posting import JobPosting
+    lines = _ndjson_lines(scale)
+    return lambda: [JobPosting.from_dict(json.loads(line)) for line in lines]
+
+
+def bench_encode_rows_dicts(scale):
+    jobs = [json.loads(line) for line in _ndjson_lines(scale)]
+    return lambda: [_legacy_row(job) for job in jobs]
+
+
+def bench_encode_rows_postings(scale):
+    from job_posting import JobPosting
+    jobs = [JobPosting.from_dict(json.loads(line)) for line in _ndjson_lines(scale)]
+    return lambda: [job.to_row() for job in jobs]
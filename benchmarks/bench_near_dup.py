@@ -0,0 +1,46 @@
+"""
+Near-duplicate detection benchmarks: MinHash signatures for scraped jobs, and
+LSH lookups against a large persisted index.
+
+The large index holds 2,000 x scale postings (200,000 at scale 100) with
+random signatures, so building it skips the MinHash step; lookups cost the
+same either way.
+"""
+
+import os
+import random
+import tempfile
+from array import array
+
+from bench_sinks import _jobs
+
+
+def _texts(scale):
+    return [job.raw_content for job in _jobs(scale)]
+
+
+def bench_minhash_signatures(scale):
+    from near_dup import MinHasher
+    hasher = MinHasher()
+    texts = _texts(scale)
+    return lambda: [hasher.signature(text) for text in texts]
+
+
+def bench_lookup_large_index(scale):
+    """check_and_add for 24 fresh jobs, rolled back so every run sees the same index."""
+    from job_sinks import content_hash
+    from near_dup import NearDupIndex, MAX_HASH
+    index = NearDupIndex(os.path.join(tempfile.mkdtemp(prefix="bench-near-dup-"), "near_dup.sqlite"))
+    rng = random.Random(0)
+    num_perm = index.hasher.num_perm
+    for i in range(2000 * scale):
+        index.add(f"bench-{i}", None, signature=array('Q', [rng.randrange(MAX_HASH) for _ in range(num_perm)]))
+    index.conn.commit()
+    jobs = [(content_hash(job), job.raw_content) for job in _jobs(1)]
+
+    def run():
+        try:
+            return [index.check_and_add(key, text) for key, text in jobs]
+        finally:
+            index.conn.rollback()
+    return run
@@ -0,0 +1,135 @@
+"""
+Scraper benchmarks: job extraction helpers and the offline scrape -> save path.
+
+Each ``bench_*`` function takes a scale factor, does its setup and returns the
+zero-argument callable that gets timed.
+"""
+
+import os
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from generators import REPO_ROOT, archived_postings, make_listing_html
+
+sys.path.insert(0, os.path.join(REPO_ROOT, "scripts"))
+sys.path.insert(0, REPO_ROOT)
+
+BASE_JOBS = 24  # jobs on a typical MariAid page
+
+
+def _job_elements(scale):
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(make_listing_html(BASE_JOBS * scale), 'html.parser')
+    return soup.find_all('h4')
+
+
+def bench_extract_job_details(scale):
+    from scrape_mariaid_jobs_simple import extract_job_details
+    elements = _job_elements(scale)
+    return lambda: [extract_job_details(e) for e in elements]
+
+
+def bench_extract_rank(scale):
+    from scrape_mariaid_jobs_simple import extract_rank
+    titles = [p.split(' | ', 1)[0] for p in archived_postings()] * (10 * scale)
+    return lambda: [extract_rank(t) for t in titles]
+
+
+def bench_clean_body_content(scale):
+    from scrape import extract_body_content, clean_body_content
+    body = extract_body_content(make_listing_html(BASE_JOBS * scale))
+    return lambda: clean_body_content(body)
+
+
+def bench_split_dom_content(scale):
+    from scrape import split_dom_content
+    content = "Careers at Sea\n" + "\n".join(archived_postings()) * (50 * scale)
+    return lambda: split_dom_content(content)
+
+
+class _ListingServer:
+    """Serves one synthetic listing page on localhost."""
+
+    def __init__(self, page):
+        data = page.encode('utf-8')
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/careers-at-sea"
+
+
+def bench_scrape_extract_save(scale):
+    """Full scrape_jobs -> extract_job_details -> save_jobs against a local page."""
+    import io
+    import contextlib
+    import scrape_mariaid_jobs as scraper
+
+    server = _ListingServer(make_listing_html(BASE_JOBS * scale))
+    jobs_dir = tempfile.mkdtemp(prefix="bench-jobs-")
+    scraper.URL = server.url
+    scraper.JOBS_DIR = jobs_dir
+    scraper.LATEST_FILE = os.path.join(jobs_dir, "latest_jobs.json")
+    scraper.HISTORY_FILE = os.path.join(jobs_dir, "jobs_history.json")
+    scraper.ARCHIVE_DIR = os.path.join(jobs_dir, "html")
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            scraper.save_jobs(scraper.scrape_jobs())
+    return run
+
+
+class _SupabaseRestServer:
+    """Minimal PostgREST stand-in: duplicate checks find nothing, inserts succeed."""
+
+    def __init__(self):
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                self._reply(200, b'[]')
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                self._reply(201, b'[{"id": "00000000-0000-0000-0000-000000000000"}]')
+
+            def _reply(self, status, data):
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+
+def bench_upload_to_supabase_rest(scale):
+    """upload_to_supabase_rest against a local REST stub (one check + insert per job)."""
+    import io
+    import contextlib
+    import scrape_mariaid_jobs_simple as scraper
+
+    server = _SupabaseRestServer()
+    scraper.SUPABASE_URL = server.url
+    scraper.SUPABASE_KEY = "bench-key"
+    jobs = [j for j in (scraper.extract_job_details(e) for e in _job_elements(scale)) if j]
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            scraper.upload_to_supabase_rest(jobs)
+    return run
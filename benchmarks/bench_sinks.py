@@ -0,0 +1,72 @@
+"""
+Job output benchmarks: the one-pass sink fan-out against the previous
+save_jobs serialization (latest JSON + indented timestamped JSON + CSV).
+
+Each run reports the bytes it wrote as ``output_bytes``.
+"""
+
+import io
+import os
+import csv
+import json
+import shutil
+import tempfile
+import contextlib
+
+from bench_scraper import _job_elements
+
+
+def _jobs(scale):
+    from scrape_mariaid_jobs_simple import extract_job_details
+    from enrich_jobs import enrich_jobs
+    jobs = [j for j in (extract_job_details(e) for e in _job_elements(scale)) if j]
+    with contextlib.redirect_stdout(io.StringIO()):
+        enrich_jobs(jobs)
+    return jobs
+
+
+def _dir_size(path):
+    return sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+
+
+def _legacy_save(jobs, jobs_dir):
+    """save_jobs as it was before the sink layer: three full passes over the list."""
+    latest_file = os.path.join(jobs_dir, "latest_jobs.json")
+    with open(latest_file, 'w', encoding='utf-8') as f:
+        json.dump({'scraped_at': '', 'total_jobs': len(jobs), 'jobs': jobs}, f, indent=2, ensure_ascii=False)
+
+    with open(os.path.join(jobs_dir, "jobs_bench.json"), 'w', encoding='utf-8') as f:
+        json.dump(jobs, f, indent=2, ensure_ascii=False)
+
+    all_keys = set()
+    for job in jobs:
+        all_keys.update(job.keys())
+    with open(os.path.join(jobs_dir, "jobs_bench.csv"), 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=sorted(all_keys), extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(jobs)
+
+
+def bench_save_jobs_legacy(scale):
+    jobs = [job.to_dict() for job in _jobs(scale)]
+    jobs_dir = tempfile.mkdtemp(prefix="bench-legacy-")
+
+    def run():
+        _legacy_save(jobs, jobs_dir)
+        return {"output_bytes": _dir_size(jobs_dir)}
+    return run
+
+
+def bench_save_jobs_sinks(scale):
+    """JSON snapshot + NDJSON + gzip CSV (+ Parquet when pyarrow is installed)."""
+    from job_sinks import local_sinks, write_jobs
+    jobs = _jobs(scale)
+
+    def run():
+        jobs_dir = tempfile.mkdtemp(prefix="bench-sinks-")
+        try:
+            stats = write_jobs(jobs, local_sinks(jobs_dir, "bench", os.path.join(jobs_dir, "latest_jobs.json")))
+            return {"output_bytes": sum(s['bytes'] for s in stats.values())}
+        finally:
+            shutil.rmtree(jobs_dir)
+    return run
@@ -0,0 +1,98 @@
+"""
+Synthetic inputs for the benchmarks, scaled from the real fixtures.
+
+Listings are rebuilt from the single-posting texts archived in jobs/jobs_<stamp>.json / .ndjson and
+OCR lists from the entries in agents_ocr.txt, so scaled inputs keep the shape
+(field mix, line lengths, page breaks) of what the scrapers actually see.
+"""
+
+import os
+import re
+import glob
+import random
+import html
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+JOBS_DIR = os.path.join(REPO_ROOT, "jobs")
+AGENTS_OCR_FILE = os.path.join(REPO_ROOT, "agents_ocr.txt")
+
+_FALLBACK_POSTINGS = [
+    "AB - Crude Oil | Deadline: Urgent | Contract Duration: 8M (+1) | Total Needed: 1 | "
+    "Salary: Negotiable | DWT/GRT/TEU: 105940/57220",
+]
+
+
+def archived_postings(jobs_dir=JOBS_DIR):
+    """Unique single-card posting texts from the archived snapshots (.json and .ndjson)."""
+    from job_sinks import read_jobs
+    seen = set()
+    for path in sorted(glob.glob(os.path.join(jobs_dir, "jobs_[0-9]*.*json"))):
+        for job in read_jobs(path):
+            text = re.sub(r'\s+', ' ', job.get('raw_text') or job.get('raw_content') or '')
+            text = text.replace(' | View Details | Apply Now', '').strip()
+            if text.count('Deadline:') == 1 and text.split(' | ', 1)[0] != 'Careers at Sea':
+                seen.add(text)
+    return sorted(seen) or list(_FALLBACK_POSTINGS)
+
+
+def make_listing_html(n_jobs, seed=0):
+    """A careers-at-sea style page with n_jobs job cards."""
+    rng = random.Random(seed)
+    postings = archived_postings()
+    cards = []
+    for i in range(n_jobs):
+        fields = rng.choice(postings).split(' | ')
+        title, rest = fields[0], fields[1:]
+        body = "".join(f"<p>{html.escape(f)}</p>" for f in rest)
+        cards.append(
+            '<div class="col-md-4"><div class="card">'
+            f'<h4>{html.escape(title)}</h4>{body}'
+            f'<a href="/job-details?id={i}">View Details</a> '
+            f'<a href="apply-now?id={i}">Apply Now</a>'
+            '</div></div>'
+        )
+    return (
+        "<html><head><title>Careers at Sea</title>"
+        "<style>.card{padding:1rem}</style><script>var x = 1;</script></head><body>"
+        "<nav><a href='/'>HOME</a> <a href='/careers'>CAREERS</a> <a>CAREERS AT SEA</a></nav>"
+        '<section class="careers-section"><h2>Features Jobs at Sea</h2>'
+        "<p>View our latest jobs. Also keep an eye on our <a>LinkedIn</a> for regular updates.</p>"
+        f'<div class="row">{"".join(cards)}</div></section>'
+        "<footer>MariAid Limited</footer></body></html>"
+    )
+
+
+def _ocr_entries(ocr_file=AGENTS_OCR_FILE):
+    with open(ocr_file, 'r', encoding='utf-8') as f:
+        text = f.read()
+    text = re.sub(r'==(Start|End) of OCR for page \d+==\n?', '', text)
+    parts = re.split(r'MLA\s*-?\s*\d+', text)[1:]
+    return [p.strip() for p in parts if p.strip()]
+
+
+def make_ocr_list(n_agents, lines_per_page=60, seed=0):
+    """An agents_ocr.txt style dump with n_agents entries and page markers.
+
+    Page breaks fall every `lines_per_page` lines regardless of entry
+    boundaries, so entries straddle pages just like the real OCR output.
+    """
+    rng = random.Random(seed)
+    entries = _ocr_entries()
+    lines = [
+        "APPROVED SEAMEN RECRUITING AGENTS",
+        "Content: Pages",
+        "License",
+        "No",
+        "Name of the Company and Address Owner's Name Validity",
+    ]
+    for i in range(n_agents):
+        lines.append("MLA -")
+        lines.append(f"{i + 1:03d}")
+        lines.extend(rng.choice(entries).split('\n'))
+
+    out = []
+    for page, start in enumerate(range(0, len(lines), lines_per_page), 1):
+        out.append(f"==Start of OCR for page {page}==")
+        out.extend(lines[start:start + lines_per_page])
+        out.append(f"==End of OCR for page {page}==")
+    return "\n".join(out) + "\n"
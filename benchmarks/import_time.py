@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Startup Import-Time Check
+Runs CLI entry points under `python -X importtime`, sums the cumulative import
+time of the top-level modules each one loads and fails when a command pulls
+in a heavy dependency it should load lazily, or goes over its time budget.
+
+Usage:
+    python benchmarks/import_time.py            # report
+    python benchmarks/import_time.py --check    # exit 1 on a regression
+    python benchmarks/import_time.py --json reports/benchmarks/import-time.json
+"""
+
+import os
+import re
+import sys
+import json
+import argparse
+import subprocess
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must only be imported by the subcommand that needs them
+HEAVY_MODULES = {
+    'streamlit', 'selenium', 'supabase', 'google.genai', 'langchain', 'langchain_ollama',
+    'bs4', 'lxml', 'requests', 'pyarrow', 'numpy',
+}
+
+# (name, argv after `python -X importtime`, budget in ms, modules allowed from HEAVY_MODULES)
+COMMANDS = [
+    ("cli --help", ["cli.py", "--help"], 100, set()),
+    ("cli agents --help", ["cli.py", "agents", "--help"], 100, set()),
+    ("cli agents sql --help", ["cli.py", "agents", "sql", "--help"], 150, set()),
+    ("cli models check --help", ["cli.py", "models", "check", "--help"], 150, set()),
+    ("cli schedule --help", ["cli.py", "schedule", "--help"], 150, set()),
+    ("cli queue --help", ["cli.py", "queue", "--help"], 150, set()),
+    ("import scrape", ["-c", "import scrape"], 100, set()),
+    ("import scrape_mariaid_jobs_v2", ["-c", "import sys; sys.path.insert(0, 'scripts'); import scrape_mariaid_jobs_v2"],
+     400, {'requests', 'bs4', 'lxml'}),
+]
+RUNS = 5
+LINE_RE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+
+def measure(argv, runs=RUNS):
+    """Best of `runs`: total top-level cumulative import time (ms), the modules imported and the exit code."""
+    best, modules, returncode = None, set(), 0
+    for _ in range(runs):
+        proc = subprocess.run([sys.executable, "-X", "importtime", *argv], cwd=REPO_ROOT,
+                              capture_output=True, text=True, env={**os.environ, 'PYTHONDONTWRITEBYTECODE': '1'})
+        returncode = returncode or proc.returncode
+        total = 0
+        for line in proc.stderr.splitlines():
+            match = LINE_RE.match(line)
+            if not match:
+                continue
+            cumulative, indent, module = int(match.group(2)), len(match.group(3)), match.group(4)
+            modules.add(module)
+            if indent == 1:  # top-level import (nested ones are part of its cumulative time)
+                total += cumulative
+        best = total if best is None else min(best, total)
+    return best / 1000, modules, returncode
+
+
+def heavy(modules):
+    return sorted(m for m in HEAVY_MODULES if m in modules)
+
+
+def run(commands=COMMANDS, runs=RUNS):
+    results = []
+    for name, argv, budget_ms, allowed in commands:
+        ms, modules, returncode = measure(argv, runs)
+        loaded = [m for m in heavy(modules) if m not in allowed]
+        results.append({
+            'name': name,
+            'import_ms': round(ms, 1),
+            'budget_ms': budget_ms,
+            'modules': len(modules),
+            'heavy_modules': loaded,
+            'exit_code': returncode,
+            'ok': ms <= budget_ms and not loaded and returncode == 0,
+        })
+    return results
+
+
+def to_markdown(results):
+    lines = [
+        "| Command | Import time | Budget | Modules | Heavy imports | |",
+        "|---------|-------------|--------|---------|---------------|-|",
+    ]
+    for r in results:
+        lines.append(f"| `{r['name']}` | {r['import_ms']:.1f} ms | {r['budget_ms']} ms | {r['modules']} | "
+                     f"{', '.join(r['heavy_modules']) or '-'} | {'✅' if r['ok'] else '❌'} |")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check CLI startup import time")
+    parser.add_argument('--check', action='store_true', help="Exit 1 if a command is over budget or imports a heavy module")
+    parser.add_argument('--runs', type=int, default=RUNS)
+    parser.add_argument('--json', help="Also write the results to this file")
+    args = parser.parse_args()
+
+    results = run(runs=args.runs)
+    report = to_markdown(results)
+    print(report)
+    if os.environ.get("GITHUB_STEP_SUMMARY"):
+        with open(os.environ["GITHUB_STEP_SUMMARY"], 'a', encoding='utf-8') as f:
+            f.write("## 🚀 Startup import time\n\n" + report + "\n")
+    if args.json:
+        os.makedirs(os.path.dirname(args.json) or '.', exist_ok=True)
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    if args.check and not all(r['ok'] for r in results):
+        sys.exit(1)
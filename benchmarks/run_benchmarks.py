@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark Runner
+Discovers bench_* functions in benchmarks/bench_*.py, runs each at the
+requested scales and reports wall time and peak Python memory.
+
+Usage:
+    python benchmarks/run_benchmarks.py                  # scales 1 and 100
+    python benchmarks/run_benchmarks.py --scale 1 --filter extract
+    python benchmarks/run_benchmarks.py --json results.json
+"""
+
+import os
+import sys
+import gc
+import glob
+import json
+import time
+import argparse
+import statistics
+import tracemalloc
+import importlib
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+
+
+def discover(name_filter=None):
+    """Yield (name, factory) for every bench_* function, sorted by name."""
+    found = []
+    for path in sorted(glob.glob(os.path.join(BENCH_DIR, "bench_*.py"))):
+        module = importlib.import_module(os.path.splitext(os.path.basename(path))[0])
+        for attr in sorted(dir(module)):
+            if attr.startswith("bench_") and callable(getattr(module, attr)):
+                name = f"{module.__name__}.{attr[len('bench_'):]}"
+                if not name_filter or name_filter in name:
+                    found.append((name, getattr(module, attr)))
+    return found
+
+
+def measure(fn, repeat, min_time=0.0):
+    """Time fn `repeat` times (more if the total is under min_time), then trace one run."""
+    times = []
+    started = time.perf_counter()
+    while len(times) < repeat or time.perf_counter() - started < min_time:
+        gc.collect()
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    stats = {
+        "runs": len(times),
+        "min_s": min(times),
+        "median_s": statistics.median(times),
+        "mean_s": statistics.fmean(times),
+        "stdev_s": statistics.stdev(times) if len(times) > 1 else 0.0,
+        "samples_s": times,
+        "peak_mem_bytes": peak,
+    }
+    # Benchmarks that write files may report how much they wrote
+    if isinstance(result, dict) and "output_bytes" in result:
+        stats["output_bytes"] = result["output_bytes"]
+    return stats
+
+
+def run(scales, repeat=5, name_filter=None, min_time=0.0):
+    results = []
+    for name, factory in discover(name_filter):
+        for scale in scales:
+            try:
+                fn = factory(scale)
+            except ImportError as e:
+                print(f"⏭️  {name} [x{scale}] skipped: {e}")
+                results.append({"name": name, "scale": scale, "skipped": str(e)})
+                continue
+            stats = measure(fn, repeat, min_time)
+            output = f"   out {stats['output_bytes'] / 1024:10.1f} KiB" if "output_bytes" in stats else ""
+            print(f"⏱️  {name:<45} x{scale:<4} median {stats['median_s'] * 1000:10.2f} ms   "
+                  f"peak {stats['peak_mem_bytes'] / 1024:10.1f} KiB{output}")
+            results.append({"name": name, "scale": scale, **stats})
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the scraper/parser benchmark suite")
+    parser.add_argument('--scale', type=int, nargs='*', default=[1, 100], help="Input scale factors")
+    parser.add_argument('--repeat', type=int, default=5, help="Timed runs per benchmark")
+    parser.add_argument('--min-time', type=float, default=0.0, help="Keep repeating until this many seconds pass")
+    parser.add_argument('--filter', default=None, help="Only run benchmarks whose name contains this")
+    parser.add_argument('--json', default=None, help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    results = run(args.scale, repeat=args.repeat, name_filter=args.filter, min_time=args.min_time)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n📁 Results saved to: {args.json}")
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Benchmark Regression Tracker
+Runs the benchmark suite, stores the results with the commit and a machine
+fingerprint under reports/benchmarks/, and compares them against a baseline.
+
+Exits non-zero when a tracked hot path is significantly slower than the
+baseline (median ratio above the threshold and a Mann-Whitney U test below
+alpha). The comparison is written as a markdown table and appended to
+$GITHUB_STEP_SUMMARY when running in GitHub Actions.
+
+Usage:
+    python benchmarks/track.py                          # run + compare with baseline.json
+    python benchmarks/track.py --update-baseline        # run and store as the new baseline
+    python benchmarks/track.py --baseline reports/benchmarks/bench-2026-03-01_10-00-00.json
+    python benchmarks/track.py --compare-only base.json head.json
+"""
+
+import os
+import sys
+import json
+import math
+import hashlib
+import argparse
+import platform
+import subprocess
+from datetime import datetime
+
+from run_benchmarks import run
+
+# Constants
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(REPO_ROOT, "reports", "benchmarks")
+BASELINE_FILE = os.path.join(RESULTS_DIR, "baseline.json")
+TRACKED = ["extract_job_details", "parse_agents", "upload_to_supabase_rest"]
+DEFAULT_THRESHOLD = 0.10  # 10% slower
+DEFAULT_ALPHA = 0.05
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def machine_fingerprint():
+    info = {
+        "system": platform.system(),
+        "release": platform.release(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+    }
+    info["id"] = hashlib.sha256(json.dumps(info, sort_keys=True).encode()).hexdigest()[:12]
+    return info
+
+
+def save_run(results, results_dir=RESULTS_DIR):
+    os.makedirs(results_dir, exist_ok=True)
+    record = {
+        "timestamp": datetime.utcnow().isoformat(),
+        "commit": git_commit(),
+        "machine": machine_fingerprint(),
+        "results": results,
+    }
+    path = os.path.join(results_dir, f"bench-{datetime.utcnow().strftime('%Y-%m-%d_%H-%M-%S')}.json")
+    for target in (path, os.path.join(results_dir, "latest.json")):
+        with open(target, 'w') as f:
+            json.dump(record, f, indent=2)
+    return record, path
+
+
+def _exact_u_cdf(n1, n2):
+    """Counts of each U value for samples of size n1, n2 without ties."""
+    # f[i][j] = distribution of U for sizes i, j as a list indexed by U
+    prev_row = [[1] for _ in range(n2 + 1)]
+    for i in range(1, n1 + 1):
+        row = [[1]]
+        for j in range(1, n2 + 1):
+            size = i * j + 1
+            counts = [0] * size
+            for u, c in enumerate(prev_row[j]):  # last value from x: beats all j of y
+                counts[u + j] += c
+            for u, c in enumerate(row[j - 1]):  # last value from y
+                counts[u] += c
+            row.append(counts)
+        prev_row = row
+    return prev_row[n2]
+
+
+def mann_whitney_u(a, b):
+    """Two-sided Mann-Whitney U test. Returns (U for a, p-value)."""
+    n1, n2 = len(a), len(b)
+    if not n1 or not n2:
+        return None, 1.0
+
+    combined = sorted([(v, 0) for v in a] + [(v, 1) for v in b])
+    ranks = [0.0] * len(combined)
+    tie_sum = 0
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        t = j - i + 1
+        tie_sum += t ** 3 - t
+        i = j + 1
+
+    r1 = sum(r for r, (_, group) in zip(ranks, combined) if group == 0)
+    u1 = r1 - n1 * (n1 + 1) / 2
+    mean = n1 * n2 / 2
+
+    if tie_sum == 0 and n1 * n2 <= 2500:
+        counts = _exact_u_cdf(n1, n2)
+        total = sum(counts)
+        dist = abs(u1 - mean)
+        extreme = sum(c for u, c in enumerate(counts) if abs(u - mean) >= dist - 1e-9)
+        return u1, min(1.0, extreme / total)
+
+    n = n1 + n2
+    var = n1 * n2 / 12 * ((n + 1) - tie_sum / (n * (n - 1)))
+    if var <= 0:
+        return u1, 1.0
+    z = (abs(u1 - mean) - 0.5) / math.sqrt(var)
+    return u1, math.erfc(max(z, 0) / math.sqrt(2))
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD, alpha=DEFAULT_ALPHA, tracked=TRACKED):
+    """Compare two stored runs. Returns a list of row dicts."""
+    base = {(r["name"], r["scale"]): r for r in baseline["results"] if "samples_s" in r}
+    rows = []
+    for r in current["results"]:
+        key = (r["name"], r["scale"])
+        if "samples_s" not in r or key not in base:
+            continue
+        b = base[key]
+        ratio = r["median_s"] / b["median_s"] if b["median_s"] else float('inf')
+        _, p = mann_whitney_u(b["samples_s"], r["samples_s"])
+        is_tracked = any(t in r["name"] for t in tracked)
+        if ratio > 1 + threshold and p < alpha:
+            verdict = "regression"
+        elif ratio < 1 - threshold and p < alpha:
+            verdict = "improvement"
+        else:
+            verdict = "unchanged"
+        rows.append({
+            "name": r["name"],
+            "scale": r["scale"],
+            "baseline_ms": b["median_s"] * 1000,
+            "current_ms": r["median_s"] * 1000,
+            "ratio": ratio,
+            "p_value": p,
+            "baseline_peak_kib": b.get("peak_mem_bytes", 0) / 1024,
+            "current_peak_kib": r.get("peak_mem_bytes", 0) / 1024,
+            "tracked": is_tracked,
+            "verdict": verdict,
+        })
+    return rows
+
+
+def to_markdown(rows, baseline, current, threshold):
+    icons = {"regression": "🔴", "improvement": "🟢", "unchanged": "⚪"}
+    lines = [
+        "## ⏱️ Benchmark Comparison",
+        "",
+        f"Baseline `{(baseline.get('commit') or 'unknown')[:10]}` → current `{(current.get('commit') or 'unknown')[:10]}`"
+        f" · threshold {threshold:.0%}",
+        "",
+    ]
+    if baseline.get("machine", {}).get("id") != current.get("machine", {}).get("id"):
+        lines += ["> ⚠️ Baseline was recorded on a different machine; timings may not be comparable.", ""]
+    lines += [
+        "| | Benchmark | Scale | Baseline (ms) | Current (ms) | Change | p-value | Peak KiB |",
+        "|---|-----------|-------|---------------|--------------|--------|---------|----------|",
+    ]
+    for row in sorted(rows, key=lambda r: (not r["tracked"], r["name"], r["scale"])):
+        name = f"**{row['name']}**" if row["tracked"] else row["name"]
+        lines.append(
+            f"| {icons[row['verdict']]} | {name} | x{row['scale']} | {row['baseline_ms']:.2f} | "
+            f"{row['current_ms']:.2f} | {(row['ratio'] - 1):+.1%} | {row['p_value']:.3f} | "
+            f"{row['current_peak_kib']:.0f} |"
+        )
+    failing = [r for r in rows if r["tracked"] and r["verdict"] == "regression"]
+    lines += ["", f"❌ **{len(failing)} tracked hot path(s) regressed**" if failing
+              else "✅ **No tracked hot path regressed**", "", "Tracked hot paths are in bold."]
+    return "\n".join(lines) + "\n"
+
+
+def report(baseline, current, threshold, alpha, results_dir=RESULTS_DIR):
+    rows = compare(baseline, current, threshold, alpha)
+    markdown = to_markdown(rows, baseline, current, threshold)
+    print("\n" + markdown)
+
+    os.makedirs(results_dir, exist_ok=True)
+    with open(os.path.join(results_dir, "latest-comparison.md"), 'w') as f:
+        f.write(markdown)
+    summary = os.environ.get("GITHUB_STEP_SUMMARY")
+    if summary:
+        with open(summary, 'a') as f:
+            f.write(markdown)
+
+    return 1 if any(r["tracked"] and r["verdict"] == "regression" for r in rows) else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Track benchmark regressions against a baseline")
+    parser.add_argument('--baseline', default=BASELINE_FILE, help="Baseline results file")
+    parser.add_argument('--update-baseline', action='store_true', help="Store this run as the baseline")
+    parser.add_argument('--compare-only', nargs=2, metavar=('BASELINE', 'CURRENT'), help="Compare two stored runs")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help="Allowed slowdown (0.10 = 10%%)")
+    parser.add_argument('--alpha', type=float, default=DEFAULT_ALPHA, help="Significance level")
+    parser.add_argument('--scale', type=int, nargs='*', default=[1, 100])
+    parser.add_argument('--repeat', type=int, default=7)
+    parser.add_argument('--filter', default=None)
+    parser.add_argument('--results-dir', default=RESULTS_DIR)
+    args = parser.parse_args()
+
+    if args.compare_only:
+        with open(args.compare_only[0]) as f:
+            baseline = json.load(f)
+        with open(args.compare_only[1]) as f:
+            current = json.load(f)
+        sys.exit(report(baseline, current, args.threshold, args.alpha, args.results_dir))
+
+    current, path = save_run(run(args.scale, repeat=args.repeat, name_filter=args.filter), args.results_dir)
+    print(f"\n📁 Results saved to: {path}")
+
+    if args.update_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(current, f, indent=2)
+        print(f"📌 Baseline updated: {args.baseline}")
+        sys.exit(0)
+
+    if not os.path.exists(args.baseline):
+        print(f"⚠️  No baseline at {args.baseline}; run with --update-baseline first")
+        sys.exit(0)
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    sys.exit(report(baseline, current, args.threshold, args.alpha, args.results_dir))
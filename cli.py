@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+BD Mariner Hub command line
+One entry point for the job scrapers, the approved agents list tools and the
+Gemini model checks.
+
+Only the standard library is imported up front. Each subcommand imports its
+module when it runs, so `--help` and quick commands never load selenium,
+supabase, bs4 or google-genai. `benchmarks/import_time.py` checks this.
+
+Usage:
+    python cli.py scrape [simple|v2|basic] [--profile]
+    python cli.py schedule [--plan|--once]
+    python cli.py queue {enqueue,worker,stats,publish} [options]
+    python cli.py archive {reextract,stats} [--workers N]
+    python cli.py upload [jobs/latest_jobs.json]
+    python cli.py doctors ["Authorized Doctors List.pdf"] [--sql insert_doctors.sql] [--json doctors.json]
+    python cli.py agents parse [agents_ocr.txt] [--page-aware] [--out agents.json]
+    python cli.py agents sql [parse.py options]
+    python cli.py agents ts [generate_agents_ts.py options]
+    python cli.py agents sync [agents_sync.py options]
+    python cli.py models check [--refresh]
+    python cli.py models bench [benchmark_gemini_models.py options]
+"""
+
+import os
+import sys
+import argparse
+import importlib
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS_DIR = os.path.join(REPO_ROOT, "scripts")
+SCRAPERS = {
+    'simple': 'scrape_mariaid_jobs_simple',
+    'v2': 'scrape_mariaid_jobs_v2',
+    'basic': 'scrape_mariaid_jobs',
+}
+
+# Subcommands that hand their remaining arguments to an existing script's main(argv)
+PASSTHROUGH = {
+    (None, 'schedule'): ('scheduler', "Poll job sources on adaptive intervals (long-running)"),
+    (None, 'queue'): ('work_queue', "Distributed scrape work queue: enqueue, worker, stats, publish"),
+    (None, 'archive'): ('html_archive', "Raw HTML archive: re-extract all archived pages, stats"),
+    (None, 'index'): ('job_index', "Static job search index: build from snapshots, query"),
+    (None, 'numbers'): ('job_numbers', "Numeric salary / contract / vessel size: coverage stats, parse"),
+    (None, 'doctors'): ('parse_doctors', "Parse the Authorized Doctors List PDF into doctorsData.ts / SQL / JSON"),
+    ('agents', 'sql'): ('parse', "Write the agents SQL (batched upserts / COPY) or load it with --load"),
+    ('agents', 'ts'): ('generate_agents_ts', "Generate components/agentsData.ts and the search shards"),
+    ('agents', 'sync'): ('agents_sync', "Write only the agent licenses that changed since the last sync"),
+    ('models', 'check'): ('check_gemini_models', "Check Gemini model availability"),
+    ('models', 'bench'): ('benchmark_gemini_models', "Benchmark Gemini models on archived postings"),
+}
+
+
+def _import(name):
+    """Import a root or scripts/ module on first use."""
+    for path in (REPO_ROOT, SCRIPTS_DIR):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    return importlib.import_module(name)
+
+
+def cmd_scrape(args):
+    profiling = _import('profiling')
+    scraper = _import(SCRAPERS[args.variant])
+    with profiling.profile_run(SCRAPERS[args.variant], enabled=profiling.profiling_enabled(args.profile)):
+        scraper.main()
+
+
+def cmd_upload(args):
+    supabase_url = os.environ.get("SUPABASE_URL")
+    supabase_key = os.environ.get("SUPABASE_SERVICE_KEY")
+    if not supabase_url or not supabase_key:
+        sys.exit("❌ SUPABASE_URL and SUPABASE_SERVICE_KEY must be set")
+
+    job_sinks = _import('job_sinks')
+    JobPosting = _import('job_posting').JobPosting
+    FetchClient = _import('fetch_client').FetchClient
+
+    jobs = [JobPosting.from_dict(job) for job in job_sinks.read_jobs(args.file)]
+    print(f"📤 Uploading {len(jobs)} jobs from {args.file}...")
+    sink = job_sinks.SupabaseBatchSink(FetchClient(), supabase_url, supabase_key, batch_size=args.batch_size)
+    job_sinks.write_jobs(jobs, [sink])
+    print(f"✅ {sink.uploaded} uploaded, {sink.skipped} already present, {sink.failed} failed")
+    if sink.failed:
+        sys.exit(1)
+
+
+def cmd_agents_parse(args):
+    parse = _import('parse')
+    agents = parse.parse_agents(args.ocr_file, page_aware=args.page_aware, workers=args.workers) or []
+    if args.out:
+        import json
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(agents, f, indent=2, ensure_ascii=False)
+        print(f"Parsed {len(agents)} agents -> {args.out}")
+    else:
+        print(f"Parsed {len(agents)} agents")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="cli.py", description="BD Mariner Hub data tools")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    scrape = commands.add_parser('scrape', help="Scrape MariAid jobs")
+    scrape.add_argument('variant', nargs='?', choices=sorted(SCRAPERS), default='simple',
+                        help="simple: REST upload (default), v2: supabase client, basic: local files only")
+    scrape.add_argument('--profile', action='store_true', help="Write profiling reports to reports/profiles/")
+    scrape.set_defaults(func=cmd_scrape)
+
+    upload = commands.add_parser('upload', help="Upload saved jobs to Supabase (deduped by content hash)")
+    upload.add_argument('file', nargs='?', default=os.path.join("jobs", "latest_jobs.json"),
+                        help="latest_jobs.json, a jobs_*.json list or a jobs_*.ndjson snapshot")
+    upload.add_argument('--batch-size', type=int, default=50)
+    upload.set_defaults(func=cmd_upload)
+
+    groups = {
+        None: commands,
+        'agents': commands.add_parser('agents', help="Approved manning agents list").add_subparsers(dest='action', required=True),
+        'models': commands.add_parser('models', help="Gemini model checks").add_subparsers(dest='action', required=True),
+    }
+
+    agents_parse = groups['agents'].add_parser('parse', help="Parse the agents OCR text")
+    agents_parse.add_argument('ocr_file', nargs='?', default='agents_ocr.txt')
+    agents_parse.add_argument('--out', help="Write the parsed agents as JSON")
+    agents_parse.add_argument('--page-aware', action='store_true', help="Parse pages in parallel and stitch entries across page breaks")
+    agents_parse.add_argument('--workers', type=int, default=None)
+    agents_parse.set_defaults(func=cmd_agents_parse)
+
+    for (group, action), (module, help_text) in PASSTHROUGH.items():
+        sub = groups[group].add_parser(action, help=help_text, add_help=False,
+                                       description=f"{help_text}. Options are those of {module}.py (try --help).")
+        sub.set_defaults(func=lambda args, module=module: _import(module).main(args.argv), passthrough=True)
+
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args, rest = parser.parse_known_args(argv)
+    if getattr(args, 'passthrough', False):
+        args.argv = rest
+    elif rest:
+        parser.error(f"unrecognized arguments: {' '.join(rest)}")
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@ import { JobPosting, UserProfile, ShipType, Rank } from '../types';
 import { Briefcase, MapPin, DollarSign, Calendar, Search, Filter, MessageSquare, Phone, Mail, PlusCircle, Sparkles, Loader2, Copy } from 'lucide-react';
 import { parseJobPosting } from '../services/geminiService';
 import { supabase } from '../services/supabase';
+import { IndexedJob, loadJobIndex, monthlySalary, searchJobs } from '../services/jobsIndex';
 import { matchesRankFilter, matchesShipTypeFilter } from '../utils/rankShipNormalizer';
 
 // Mock Initial Jobs
@@ -45,6 +46,28 @@ const INITIAL_JOBS: JobPosting[] = [
   }
 ];
 
+// Minimum monthly salary (USD) the Salary filter offers; 0 = any
+const SALARY_STEPS = [0, 1000, 2000, 3000, 5000];
+
+// A scraped job from the static index (public/data/jobs)
+const fromIndexedJob = (item: IndexedJob): JobPosting => ({
+  id: item.id,
+  rank: item.rank || Rank.OTHER,
+  shipType: item.ship_type || ShipType.OTHER,
+  wage: item.salary || 'Negotiable',
+  joiningDate: 'ASAP',
+  description: item.raw_content || item.title || '',
+  contactInfo: 'N/A',
+  source: 'Other',
+  postedDate: item.scraped_at ? new Date(item.scraped_at).getTime() : Date.now(),
+  companyName: item.agency || 'Unknown',
+  mlaNumber: item.mla_number || 'N/A',
+  agencyAddress: 'N/A',
+  mobile: 'N/A',
+  email: 'N/A',
+  salaryMin: monthlySalary(item)
+});
+
 interface JobBoardProps {
   userProfile?: UserProfile;
   onNavigateToAgents?: (mlaNumber: string) => void;
@@ -55,6 +78,8 @@ export const JobBoard: React.FC<JobBoardProps> = ({ userProfile, onNavigateToAge
   const [isLoading, setIsLoading] = useState(true);
   const [filterRank, setFilterRank] = useState<string>(userProfile?.rank || 'All');
   const [filterType, setFilterType] = useState<string>(userProfile?.preferredShipType || 'All');
+  const [filterSalary, setFilterSalary] = useState<number>(0);
+  const [fromIndex, setFromIndex] = useState(false);
   const [expandedDescriptions, setExpandedDescriptions] = useState<Set<string>>(new Set());
 
   // Import Modal State
@@ -107,12 +132,16 @@ export const JobBoard: React.FC<JobBoardProps> = ({ userProfile, onNavigateToAge
               mlaNumber: item.mla_number || parsed.mla_number || 'N/A',
               agencyAddress: item.agency_address || parsed.address || 'N/A',
               mobile: item.mobile_number || parsed.mobile || parsed.contactInfo || 'N/A',
-              email: item.agency_email || parsed.email || 'N/A'
+              email: item.agency_email || parsed.email || 'N/A',
+              salaryMin: item.salary_currency && item.salary_currency !== 'USD' ? undefined : item.salary_min_monthly ?? undefined
             };
           });
           setJobs(mappedJobs);
         } else if (error) {
           console.error("Error fetching jobs:", error);
+          // Database unreachable: show the scraped jobs from the static index
+          // published with the app (loaded below, with the filters applied)
+          setFromIndex(true);
         }
       }
       setIsLoading(false);
@@ -121,6 +150,32 @@ export const JobBoard: React.FC<JobBoardProps> = ({ userProfile, onNavigateToAge
     fetchJobs();
   }, []);
 
+  // Scraped jobs are filtered by the index itself, so a filter reaches every
+  // indexed job rather than only the page already loaded
+  useEffect(() => {
+    if (!fromIndex) return;
+    let cancelled = false;
+    const loadIndexedJobs = async () => {
+      setIsLoading(true);
+      try {
+        // Index values the fuzzy filters accept ('3/O' and '3rd Officer' for 3rd Officer)
+        const index = await loadJobIndex();
+        const { jobs: indexed } = await searchJobs({
+          rank: filterRank === 'All' ? undefined : Object.keys(index.rank).filter(rank => matchesRankFilter(rank, filterRank)),
+          shipType: filterType === 'All' ? undefined : Object.keys(index.shipType).filter(type => matchesShipTypeFilter(type, filterType)),
+          salaryMin: filterSalary || undefined
+        }, { limit: 200 });
+        if (!cancelled) setJobs(indexed.map(fromIndexedJob));
+      } catch (indexError) {
+        console.error("Error loading static job index:", indexError);
+      }
+      if (!cancelled) setIsLoading(false);
+    };
+
+    loadIndexedJobs();
+    return () => { cancelled = true; };
+  }, [fromIndex, filterRank, filterType, filterSalary]);
+
   const filteredJobs = useMemo(() => {
     return jobs.filter(job => {
       // Use smart matching to handle rank variants (e.g., "3/O" matches "3rd Officer")
@@ -129,9 +184,11 @@ export const JobBoard: React.FC<JobBoardProps> = ({ userProfile, onNavigateToAge
       // Use smart matching to handle ship type variants (e.g., "Aframax" matches "Oil Tanker")
       const matchType = matchesShipTypeFilter(job.shipType, filterType);
 
-      return matchRank && matchType;
+      const matchSalary = !filterSalary || (job.salaryMin ?? 0) >= filterSalary;
+
+      return matchRank && matchType && matchSalary;
     }).sort((a, b) => b.postedDate - a.postedDate);
-  }, [jobs, filterRank, filterType]);
+  }, [jobs, filterRank, filterType, filterSalary]);
 
   const handleSmartImport = async () => {
     if (!importText.trim()) return;
@@ -253,6 +310,23 @@ export const JobBoard: React.FC<JobBoardProps> = ({ userProfile, onNavigateToAge
             </button>
           ))}
         </div>
+
+        {/* Salary Filter */}
+        <div className="flex gap-2 overflow-x-auto pb-1 scrollbar-hide -mx-2 px-2">
+          <span className="text-[10px] uppercase font-bold text-slate-400 self-center mr-2">Salary:</span>
+          {SALARY_STEPS.map(step => (
+            <button
+              key={step}
+              onClick={() => setFilterSalary(step)}
+              className={`px-3 py-1.5 rounded-full text-xs font-medium whitespace-nowrap transition-colors border ${filterSalary === step
+                ? 'bg-slate-800 text-white border-slate-800 shadow-md'
+                : 'bg-white text-slate-600 border-slate-200 hover:bg-slate-50'
+                }`}
+            >
+              {step ? `$${step.toLocaleString()}+ /mo` : 'Any'}
+            </button>
+          ))}
+        </div>
       </div>
 
       {/* Job List */}
@@ -0,0 +1,389 @@
+// Auto-generated from the Department of Shipping Authorized Doctors List
+// Source: Authorized Doctors List.pdf (python parse_doctors.py)
+import { MedicalCenter } from '../types';
+
+export const AUTHORIZED_DOCTORS: MedicalCenter[] = [
+  {
+    id: 'dhk-1',
+    name: 'Dr. Md. Mizanur Rahman',
+    centerName: 'Ibn Sina Diagnostic and Consultation Center',
+    approvalNumber: 'A-13508',
+    address: 'House # 479, DIT Road, Malibagh, Dhaka 1217',
+    phone: '01711156230',
+    email: 'selimmizan@gmail.com',
+    website: 'www.drmizan.com',
+    city: 'Dhaka',
+    specialty: 'General',
+    status: 'Approved',
+    isCenter: true,
+  },
+  {
+    id: 'dhk-2',
+    name: 'Dr. Md. Asif Masud Chowdhury',
+    centerName: 'Dhaka National Medical College & Hospital',
+    approvalNumber: 'A-32919',
+    address: '53/1, Jhonson Road, Dhaka',
+    phone: '01711152220',
+    email: 'dashif2006@gmail.com',
+    city: 'Dhaka',
+    specialty: 'General',
+    status: 'Approved',
+    isCenter: true,
+  },
+  {
+    id: 'dhk-3',
+    name: 'Dr. Mir Md. Raihan',
+    centerName: 'Radical Hospitals Limited',
+    approvalNumber: 'A-55144',
+    address: '35, Shah Makhdum Avenue, Sector 12, Uttara, Dhaka',
+    phone: '01716134074',
+    email: 'radical_hospitals@yahoo.com',
+    website: 'www.drraihanbd.com',
+    city: 'Dhaka',
+    specialty: 'General',
+    status: 'Approved',
+    isCenter: true,
+  },
+  {
+    id: 'dhk-4',
+    name: 'Dr. Mohammad Saifuddin',
+    centerName: 'New Popular Medical Services',
+    approvalNumber: 'A-41434',
+    address: 'Ta-143 MaddayaBadda Highschool Road, Gulshan Badda Ling Road, Dhaka-1212',
+    phone: '01715257606',
+    email: 'newpopularms@gmail.com',
+    website: 'www.newpopularmedicalservices.com',
+    city: 'Dhaka',
+    specialty: 'General',
+    status: 'Approved',
+    isCenter: true,
+  },
+  {
+    id: 'dhk-5',
+    name: 'Dr. A. T. M. Anwarul Haque',
+    centerName: 'Marine Health Care Pvt. Ltd.',
+    approvalNumber: 'A-27902',
+    address: 'Ka-196/1/B, Tatultala, Khilkhet, Dhaka-1229',
+    phone: '01907798504',
+    email: 'marinehcpl@gmail.com',
+    city: 'Dhaka',
+    specialty: 'General',
+    status: 'Approved',
+    isCenter: true,
+  },
+  {
+    id: 'dhk-6',
+    name: 'Dr. Saymon Sahariar',
+    centerName: 'Praava Health Bangladesh Ltd',
+    approvalNumber: 'A-99771',
+    address: 'Plot-9, Road-17, Block-C, Banani, Dhaka-1212',
+    phone: '01715610306',
+    email: 'saymon.sahariar@yahoo.com',
+    city: 'Dhaka',
+    specialty: 'General',
+    status: 'Approved',
+    isCenter: true,
+  },
+  {
+    id: 'dhk-7',
+    name: 'Dr. Ashutosh Saha',
+    centerName: 'Praava Health Bangladesh Ltd',
+    approvalNumber: 'A-80473',
+    address: 'Plot-9, Road-17, Block-C, Banani, Dhaka-1212',
+    phone: '01712143607',
+    email: 'dr.ashutosh@praavahealth.com',
+    city: 'Dhaka',
+    specialty: 'General',
+    status: 'Approved',
+    isCenter: true,
+  },
+  {
+    id: 'dhk-8',
+    name: 'Dr. Sonjay Sutradhar',
+    centerName: 'Praava Health Bangladesh Ltd',
+    approvalNumber: 'A-94676',
+    address: 'Plot-9, Road-17, Block-C, Banani, Dhaka-1212',
+    phone: '01786222134',
+    email: 'sonjaysutradhar333@gmail.com',
+    city: 'Dhaka',
+    specialty: 'General',
+    status: 'Approved',
+    isCenter: true,
+  },
+  {
+    id: 'dhk-9',
+    name: 'Dr. Tuli Akter',
+    centerName: 'Sumaiya Pharmacy',
+    approvalNumber: 'A-106062',
+    address: '69/1, Peererbag Middle, 60ft Road, Agargaon, Dhaka-1207',
+    phone: '01950247767',
+    email: 'tulisbmc45@gmail.com',
+    city: 'Dhaka',
+    specialty: 'General',
+    status: 'Approved',
+    isCenter: true,
+  },
+  {
+    id: 'dhk-10',
+    name: 'Sabrina Sarkar',
+    centerName: 'Bangladesh Critical Care and General Hospital',
+    approvalNumber: 'A-103248',
+    address: 'Plot No. 2/8-A, Road No. 3, Block-A Lalmatia, Dhaka-1207',
+    phone: '01725433300',
+    email: 'sarkarsabrina871@gmail.com',
+    city: 'Dhaka',
+    specialty: 'General',
+    status: 'Approved',
+    isCenter: true,
+  },
+  {
+    id: 'ctg-1',
+    name: 'Dr. Mesbah Uddin Ahmed',
+    approvalNumber: 'A-24912',
+    address: 'Road # 4, House # 12, Khulshi, 3rd Floor, Chittagong',
+    phone: '01979323529',
+    email: 'doctor@brsml.com',
+    website: 'www.mesbahbd.com',
+    city: 'Chittagong',
+    specialty: 'General',
+    status: 'Approved',
+    isCenter: false,
+  },
+  {
+    id: 'ctg-2',
+    name: 'Dr. Md. Ayubur Rahman',
+    centerName: 'Saba Diagnostic Centre',
+    approvalNumber: 'A-11820',
+    address: 'Taher Chamber, 10 Agrabad C/A, Chittagong',
+    phone: '01727690222',
+    email: 'sdc_ctg@yahoo.com',
+    website: 'www.drayubur.com',
+    city: 'Chittagong',
+    specialty: 'General',
+    status: 'Approved',
+    isCenter: true,
+  },
+  {
+    id: 'ctg-3',
+    name: 'Dr. Ariful Islam',
+    centerName: 'College of Dentistry',
+    approvalNumber: 'A-62563',
+    address: 'House 1, Road 1, Block-L, Lane-5, Halishahar H/E, Chittagong',
+    phone: '01717028785',
+    email: 'pushon05@gmail.com',
+    website: 'www.drariful.com',
+    city: 'Chittagong',
+    specialty: 'General',
+    status: 'Approved',
+    isCenter: true,
+  },
+  {
+    id: 'ctg-4',
+    name: 'Dr. Sabrina Mostafa',
+    centerName: 'Idean Pathology',
+    approvalNumber: 'A-68208',
+    address: '122, Sk. Mujib Road, Agrabad, Chattagram',
+    phone: '01781112677',
+    email: 'drsabrinamostafa@gmail.com',
+    website: 'www.drsabrinamostafa.com',
+    city: 'Chittagong',
+    specialty: 'General',
+    status: 'Approved',
+    isCenter: true,
+  },
+  {
+    id: 'ctg-5',
+    name: 'Dr. Md. Rafiqul Islam',
+    centerName: 'M/S Bablu Bappi',
+    approvalNumber: 'A-22539',
+    address: '17/3, Bisic Market, Badamtali, Agrabad, Chattagram',
+    phone: '01740721751',
+    email: 'rafique58@gmail.com',
+    website: 'www.drmdrafiqulislam.com',
+    city: 'Chittagong',
+    specialty: 'General',
+    status: 'Approved',
+    isCenter: true,
+  },
+  {
+    id: 'ctg-6',
+    name: 'Dr. Habibur Rahman Khan',
+    approvalNumber: 'A-10528',
+    address: 'Taher Chamber, 10, Agrabad C/A, Chattagram',
+    phone: '031-2521388',
+    email: 'habib.dr257@gmail.com',
+    city: 'Chittagong',
+    specialty: 'General',
+    status: 'Approved',
+    isCenter: false,
+  },
+  {
+    id: 'ctg-7',
+    name: 'Dr. Farhan Ferdous Muksed',
+    approvalNumber: 'A-25051',
+    address: 'House : 03, Road: 06, Block-G, Halishahar Housing Society, Baropul, Chattagram',
+    phone: '01977807007',
+    email: 'drhemel69@gmail.com',
+    website: 'www.drmuksed.com',
+    city: 'Chittagong',
+    specialty: 'General',
+    status: 'Approved',
+    isCenter: false,
+  },
+  {
+    id: 'ctg-8',
+    name: 'Dr. Naushad Ahmed Khan',
+    centerName: 'AKS Khan Diagnostic Ltd',
+    approvalNumber: 'A-12627',
+    address: 'Faruk Chamber (1st Floor), 1403, Sheikh Mujib Road, Chowmuhoni, Agrabad C/A, Chattogram',
+    phone: '01819317880',
+    email: 'drnaushadrup@gmail.com',
+    website: 'www.drnaushad.com',
+    city: 'Chittagong',
+    specialty: 'General',
+    status: 'Approved',
+    isCenter: true,
+  },
+  {
+    id: 'ctg-9',
+    name: 'Dr. Hosne Ara Malek',
+    approvalNumber: 'A-35191',
+    address: 'AKH Tower (4th Floor), Plot-10, Lame-05, Road-01, Block-L, Agrabad Access Road, Boropool, Chittagong-4216',
+    phone: '01711386614',
+    email: 'runamalek@gmail.com',
+    city: 'Chittagong',
+    specialty: 'General',
+    status: 'Approved',
+    isCenter: false,
+  },
+  {
+    id: 'ctg-10',
+    name: 'Dr. Paritosh Chakraborty',
+    approvalNumber: 'A-16713',
+    address: 'Flat No-G/1, Sanmar Mahfuz Manor House-33, Mehedibag Road, Kotwali, Chattogram',
+    phone: '01711171054',
+    email: 'dr.paritosh7@gmail.com',
+    city: 'Chittagong',
+    specialty: 'General',
+    status: 'Approved',
+    isCenter: false,
+  },
+  {
+    id: 'ctg-11',
+    name: 'Dr. Md. Abdur Rob',
+    centerName: 'Asperia Health Care Ltd.',
+    approvalNumber: 'A-30462',
+    address: 'Al Noor Badrun Center, 1486/1672, O.R. Nizam Road, Probartak Circle, Opposite of Badna-Shah Majar (City Bank Building) 4th Floor, Chattogram',
+    phone: '01714080593',
+    email: 'imdrrob@gmail.com',
+    website: 'www.drabdurrob.com',
+    city: 'Chittagong',
+    specialty: 'General',
+    status: 'Approved',
+    isCenter: true,
+  },
+  {
+    id: 'ctg-12',
+    name: 'Dr. Farhana Rahman',
+    centerName: 'Safe Ideal Health Care Ltd.',
+    approvalNumber: 'A-46059',
+    address: '1516/1725, 1 K.M. Opposite Shah Waliullah Residential, Bahaddarhat, Chittagong',
+    phone: '01715477017',
+    email: 'dr.farhanarahman007@gmail.com',
+    website: 'www.drfarhanarahman.com',
+    city: 'Chittagong',
+    specialty: 'General',
+    status: 'Approved',
+    isCenter: true,
+  },
+  {
+    id: 'ctg-13',
+    name: 'Dr. Sharmin Akter',
+    centerName: 'International Medical Resource Center',
+    approvalNumber: 'A-53430',
+    address: 'IMRC 73/74 korim\'s icon, Muradpur, chittagong',
+    phone: '01714381416',
+    email: 'sharmin26akter@gmail.com',
+    website: 'www.drsharminakter.xyz',
+    city: 'Chittagong',
+    specialty: 'General',
+    status: 'Approved',
+    isCenter: true,
+  },
+  {
+    id: 'ctg-14',
+    name: 'Dr. Goutam Das Gupta',
+    centerName: 'Safe Ideal Diagnostic Centre / Epic Diagnostic Centre',
+    approvalNumber: 'A-34151',
+    address: '1 Kilometer, New Chandgaon Thana, Bahaddarhat, Chattogram',
+    phone: '01715741351',
+    email: 'gautamg307@gmail.com',
+    city: 'Chittagong',
+    specialty: 'General',
+    status: 'Approved',
+    isCenter: true,
+  },
+  {
+    id: 'ctg-15',
+    name: 'Dr. Minhaz Mahmud Chowdhury',
+    centerName: 'Ocean Diagnostic Centre (Ocean Tower)',
+    approvalNumber: 'A-66813',
+    address: '3rd & 4th Floor, Halishahar Road, (Banari Para Circle), Near the Access Road, North Agrabad, Chattogram',
+    phone: '01620981698',
+    email: 'minhazchy13@gmail.com',
+    city: 'Chittagong',
+    specialty: 'General',
+    status: 'Approved',
+    isCenter: true,
+  },
+  {
+    id: 'eye-1',
+    name: 'Colonel Dr. Md. Zahidur Rahman',
+    centerName: 'Noor Fatema Eye Care and Phaco Center',
+    approvalNumber: 'A-24510',
+    address: 'House No. 10, Lane No-6, G-Block, Boropole, Halishahor, Chattogram',
+    phone: '01714093530',
+    city: 'Chittagong',
+    specialty: 'Eye Specialist',
+    status: 'Approved',
+    isCenter: true,
+  },
+  {
+    id: 'eye-2',
+    name: 'Dr. Naushad Ahmed Khan',
+    centerName: 'AKS Khan Diagnostics Ltd.',
+    approvalNumber: 'A-12627',
+    address: 'Faruk Chamber (1st Floor), 1403, Sheikh Mujib Road, Chowmuhoni Agrabad, Chattogram',
+    phone: '01819317880',
+    email: 'drnaushadrup@gmail.com',
+    website: 'www.drnaushad.com',
+    city: 'Chittagong',
+    specialty: 'Eye Specialist',
+    status: 'Approved',
+    isCenter: true,
+  },
+  {
+    id: 'eye-3',
+    name: 'Dr. Md. Shahriar Kabir Khan',
+    centerName: 'Ideal Pathology',
+    approvalNumber: 'A-32254',
+    address: 'Mustafa Palaza (2nd Floor), Mazar Gate, Bandamtoly, 162, Sk. Mujib Road, Agrabad, Chattogram',
+    phone: '01716488950',
+    email: 'shahriarkabirkhan555@gmail.com',
+    city: 'Chittagong',
+    specialty: 'Eye Specialist',
+    status: 'Approved',
+    isCenter: true,
+  },
+  {
+    id: 'eye-4',
+    name: 'Dr. Md. Abul Kalam Azad',
+    approvalNumber: 'A-25031',
+    address: '192/A-Doctors Goli, Moghbazar, Dhaka',
+    phone: '01711835284',
+    city: 'Dhaka',
+    specialty: 'Eye Specialist',
+    status: 'Approved',
+    isCenter: false,
+  },
+];
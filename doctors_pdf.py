@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Page-parallel reader for the Department of Shipping Authorized Doctors List PDF.
+
+Each page's text is taken from the PDF text layer (pypdf). Pages with no text
+layer (scans) fall back to local OCR: the page is rendered with pypdfium2 and
+read with tesseract. Pages are extracted across a process pool and cached in
+.cache/doctors_pdf/ under a hash of the page's content stream, so a re-run
+only extracts pages that changed.
+
+The extracted pages are then split and stitched the same way agents_ocr.py
+handles the agents list: every page repeats the table header, and an entry
+can start on one page and finish on the next, so each page is split into the
+text before its first entry (the tail of the previous page's last entry),
+section headings and the entries that start on it, and the pages are joined
+back together in order.
+"""
+
+import os
+import re
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+
+CACHE_DIR = os.path.join(".cache", "doctors_pdf")
+EXTRACTOR_VERSION = 1  # bump when page text extraction changes to invalidate the cache
+MIN_TEXT_CHARS = 20  # pages with less text than this are treated as scans
+OCR_DPI = 300
+
+# "DHAKA AREA" / "CHITTAGONG AREA" headings and the "(Eye Doctor)" list
+SECTION_PATTERN = re.compile(r'^(?:([A-Z]+)\s+AREA|\((Eye)\s+Doctors?\))$', re.IGNORECASE)
+ENTRY_PATTERN = re.compile(r'^(\d{1,3})\.\s*(.*)$')
+
+# Title and table header lines printed at the top of pages (compared lowercased)
+HEADER_PREFIXES = (
+    'list of accredited physicians',
+    'maritime administration',
+    'sl. name & address',
+)
+
+
+def _reader(pdf_path):
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        raise RuntimeError('Reading the doctors PDF needs pypdf: pip install pypdf')
+    return PdfReader(pdf_path)
+
+
+def page_hash(page):
+    """Stable id for a page: its decoded content stream plus the fonts it uses."""
+    h = hashlib.sha256(f"v{EXTRACTOR_VERSION}".encode())
+    contents = page.get_contents()
+    if contents is not None:
+        h.update(contents.get_data())
+    fonts = (page.get('/Resources') or {}).get('/Font') or {}
+    for name in sorted(fonts):
+        h.update(f"{name}={fonts[name].get_object().get('/BaseFont')}".encode())
+    return h.hexdigest()
+
+
+def ocr_page(pdf_path, index, dpi=OCR_DPI):
+    """Render one page and OCR it with the local tesseract install."""
+    try:
+        import pypdfium2
+        import pytesseract
+    except ImportError:
+        raise RuntimeError('OCR of scanned pages needs pypdfium2 and pytesseract '
+                           '(pip install pypdfium2 pytesseract, plus the tesseract binary)')
+    pdf = pypdfium2.PdfDocument(pdf_path)
+    try:
+        image = pdf[index].render(scale=dpi / 72).to_pil()
+    finally:
+        pdf.close()
+    return pytesseract.image_to_string(image)
+
+
+_worker_reader = None
+
+
+def _init_worker(pdf_path):
+    global _worker_reader
+    _worker_reader = _reader(pdf_path)
+
+
+def extract_page(pdf_path, index, reader=None):
+    """(index, text, method) for one page; method is 'text' or 'ocr'."""
+    reader = reader or _worker_reader or _reader(pdf_path)
+    text = reader.pages[index].extract_text() or ''
+    if len(text.strip()) >= MIN_TEXT_CHARS:
+        return index, text, 'text'
+    return index, ocr_page(pdf_path, index), 'ocr'
+
+
+def _extract_in_worker(args):
+    return extract_page(*args)
+
+
+def _cache_path(cache_dir, digest):
+    return os.path.join(cache_dir, f"{digest}.txt")
+
+
+def extract_pages(pdf_path, workers=None, cache_dir=CACHE_DIR):
+    """Return ([(page_number, text)], stats) for every page of the PDF.
+
+    Cached pages are read from ``cache_dir``; the rest are extracted across
+    ``workers`` processes (all cores by default, ``1`` to stay in-process).
+    """
+    reader = _reader(pdf_path)
+    digests = [page_hash(page) for page in reader.pages]
+    texts, missing = {}, []
+    for index, digest in enumerate(digests):
+        path = _cache_path(cache_dir, digest) if cache_dir else None
+        if path and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                texts[index] = f.read()
+        else:
+            missing.append(index)
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(missing) < 2:
+        results = [extract_page(pdf_path, index, reader) for index in missing]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(missing)), initializer=_init_worker,
+                                 initargs=(pdf_path,)) as pool:
+            results = list(pool.map(_extract_in_worker, [(pdf_path, index) for index in missing]))
+
+    methods = {}
+    for index, text, method in results:
+        texts[index] = text
+        methods[method] = methods.get(method, 0) + 1
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            path = _cache_path(cache_dir, digests[index])
+            with open(f"{path}.tmp", 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(f"{path}.tmp", path)
+
+    stats = {'pages': len(digests), 'cached': len(digests) - len(missing), **methods}
+    return [(index + 1, texts[index]) for index in range(len(digests))], stats
+
+
+def _is_header(line):
+    lowered = line.lower()
+    return any(lowered.startswith(prefix) for prefix in HEADER_PREFIXES)
+
+
+def parse_page(page):
+    """Split one (page_number, text) page into its pieces.
+
+    Returns a dict with the lines before the first entry or heading on the
+    page (``head``, the tail of an entry from the previous page) and the
+    ``items`` in page order: ``('section', city, specialty)`` for headings and
+    ``('entry', serial, lines)`` for entries that start on this page.
+    """
+    page_no, body = page
+    head, items = [], []
+    for raw in body.split('\n'):
+        line = raw.strip()
+        if not line or _is_header(line):
+            continue
+        section = SECTION_PATTERN.match(line)
+        entry = ENTRY_PATTERN.match(line)
+        if section:
+            if section.group(2):
+                items.append(('section', None, 'Eye Specialist'))
+            else:
+                items.append(('section', section.group(1).title(), 'General'))
+        elif entry:
+            items.append(('entry', int(entry.group(1)), [entry.group(2)] if entry.group(2) else []))
+        elif items and items[-1][0] == 'entry':
+            items[-1][2].append(line)
+        elif items:
+            continue  # stray text between a heading and the first entry
+        else:
+            head.append(line)
+    return {'page': page_no, 'head': head, 'items': items}
+
+
+def stitch_pages(parsed_pages):
+    """Merge parsed pages into [(city, specialty, serial, lines)] in page order.
+
+    Each page's head is appended to the last entry seen so far. The "(Eye
+    Doctor)" list keeps the city of the area heading before it; the record
+    builder refines the city from the address.
+    """
+    entries = []
+    city, specialty = None, 'General'
+    for page in sorted(parsed_pages, key=lambda p: p['page']):
+        if page['head'] and entries:
+            entries[-1][3].extend(page['head'])
+        for kind, a, b in page['items']:
+            if kind == 'section':
+                city = a or city
+                specialty = b
+            else:
+                entries.append((city, specialty, a, list(b)))
+    return entries
+
+
+def read_entries(pdf_path, workers=None, build=None, cache_dir=CACHE_DIR):
+    """Extract, split and stitch the PDF; returns (entries or built records, extract stats).
+
+    If ``build`` is given it must be a callable taking ``(city, specialty,
+    serial, lines)``; its non-None results are returned instead.
+    """
+    pages, stats = extract_pages(pdf_path, workers=workers, cache_dir=cache_dir)
+    entries = stitch_pages([parse_page(p) for p in pages])
+    if build is None:
+        return entries, stats
+    records = (build(*entry) for entry in entries)
+    return [r for r in records if r is not None], stats
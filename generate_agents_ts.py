@@ -1,10 +1,25 @@
 #!/usr/bin/env python3
 """Parse the agents_ocr.txt and generate a TypeScript ManningAgent[] array."""
 
+import os
 import re
 import json
+import time
+import base64
+import hashlib
+import argparse
+
+from agents_ocr import read_entries
+from profiling import profile_run, profiling_enabled
+
+
+def parse_agents(file_path, page_aware=False, workers=None):
+    if page_aware:
+        # Pages are cleaned and parsed in a process pool, then stitched
+        # back together so entries split across a page break stay whole
+        agents = read_entries(file_path, workers=workers, build=_build_agent)
+        return _assign_ids([a for a in agents if a is not None])
 
-def parse_agents(file_path):
     with open(file_path, 'r', encoding='utf-8') as f:
         text = f.read()
 
@@ -12,7 +27,6 @@ def parse_agents(file_path):
     parts = entry_pattern.split(text)
 
     agents = []
-    agent_id = 1
 
     for i in range(1, len(parts), 2):
         if i + 1 >= len(parts):
@@ -23,127 +37,139 @@ def parse_agents(file_path):
         if 'MLA-' not in license_raw:
             license_raw = license_raw.replace('MLA', 'MLA-')
 
-        content = parts[i + 1].strip()
-        # Remove page markers
-        content = re.sub(r'==.*?==', '', content)
-        content = content.strip()
-
-        lines = [l.strip() for l in content.split('\n') if l.strip()]
-        if not lines:
+        agent = _build_agent(license_raw, parts[i + 1].strip())
+        if agent is None:
             continue
+        agents.append(agent)
 
-        company_name = lines[0]
-
-        # Extract structured data
-        address_parts = []
-        phones = []
-        emails = []
-        websites = []
-        owner_parts = []
-        validity = ''
-
-        # Determine status
-        status = 'Active'
-        full_text_lower = content.lower()
-        if 'suspended' in full_text_lower:
-            status = 'Suspended'
-        elif 'expired' in full_text_lower:
-            status = 'Expired'
-
-        # Determine city
-        cities = []
-        if any(x in content.lower() for x in ['dhaka', 'dkaka']):
-            cities.append('Dhaka')
-        if any(x in content.lower() for x in ['chittagong', 'chattogram', 'chattogra', 'chattagram', 'ctg']):
-            cities.append('Chittagong')
-        if 'khulna' in content.lower():
-            cities.append('Khulna')
-        if not cities:
-            # Try to infer from address
-            cities.append('Other')
-
-        # Parse lines for contact info
-        in_contact = False
-        for j, line in enumerate(lines[1:], 1):
-            line_lower = line.lower()
-
-            # Check for email
-            email_match = re.findall(r'[\w\.\-\+]+@[\w\.\-]+\.\w+', line)
-            if email_match:
-                emails.extend(email_match)
-                continue
+    return _assign_ids(agents)
 
-            # Check for website
-            web_match = re.findall(r'(?:www\.[\w\.\-]+\.\w+|https?://[\w\.\-]+\.\w+)', line, re.IGNORECASE)
-            if web_match:
-                websites.extend(web_match)
-                # Could also have other info on same line
-                if line_lower.startswith('web'):
-                    continue
-
-            # Check for phone/tel/fax
-            if any(x in line_lower for x in ['tel', 'phone', 'ph.', 'ph:', 'ph ', 'fax', 'call', 'cell', 'mob']):
-                phones.append(line)
-                in_contact = True
-                continue
 
-            # If line starts with "E-mail" or "Email"
-            if line_lower.startswith('e-mail') or line_lower.startswith('email'):
-                email_match2 = re.findall(r'[\w\.\-\+]+@[\w\.\-]+\.\w+', line)
-                if email_match2:
-                    emails.extend(email_match2)
-                continue
+def _assign_ids(agents):
+    for agent_id, agent in enumerate(agents, 1):
+        agent['id'] = str(agent_id)
+    return agents
+
 
-            # If line starts with Web/Website
+def _build_agent(license_raw, content):
+    """Build one agent record (without id) from a license number and its OCR text."""
+    # Remove page markers
+    content = re.sub(r'==.*?==', '', content)
+    content = content.strip()
+
+    lines = [l.strip() for l in content.split('\n') if l.strip()]
+    if not lines:
+        return None
+
+    company_name = lines[0]
+
+    # Extract structured data
+    address_parts = []
+    phones = []
+    emails = []
+    websites = []
+    owner_parts = []
+    validity = ''
+
+    # Determine status
+    status = 'Active'
+    full_text_lower = content.lower()
+    if 'suspended' in full_text_lower:
+        status = 'Suspended'
+    elif 'expired' in full_text_lower:
+        status = 'Expired'
+
+    # Determine city
+    cities = []
+    if any(x in content.lower() for x in ['dhaka', 'dkaka']):
+        cities.append('Dhaka')
+    if any(x in content.lower() for x in ['chittagong', 'chattogram', 'chattogra', 'chattagram', 'ctg']):
+        cities.append('Chittagong')
+    if 'khulna' in content.lower():
+        cities.append('Khulna')
+    if not cities:
+        # Try to infer from address
+        cities.append('Other')
+
+    # Parse lines for contact info
+    in_contact = False
+    for j, line in enumerate(lines[1:], 1):
+        line_lower = line.lower()
+
+        # Check for email
+        email_match = re.findall(r'[\w\.\-\+]+@[\w\.\-]+\.\w+', line)
+        if email_match:
+            emails.extend(email_match)
+            continue
+
+        # Check for website
+        web_match = re.findall(r'(?:www\.[\w\.\-]+\.\w+|https?://[\w\.\-]+\.\w+)', line, re.IGNORECASE)
+        if web_match:
+            websites.extend(web_match)
+            # Could also have other info on same line
             if line_lower.startswith('web'):
-                web_match2 = re.findall(r'(?:www\.[\w\.\-]+\.\w+)', line, re.IGNORECASE)
-                if web_match2:
-                    websites.extend(web_match2)
                 continue
 
-            # Address or owner?
-            if not in_contact:
-                # Before contact info = address
-                address_parts.append(line)
-            else:
-                # After contact info = could be owner or validity
-                pass
-
-        # Extract validity from end of content
-        validity_match = re.search(r'(\d{1,2}[\.\-\s]+(?:\w+|\d{1,2})[\.\-\s]+\d{4})', content)
-        if validity_match:
-            validity = validity_match.group(1).strip()
-
-        address = ', '.join(address_parts) if address_parts else ''
-        # Clean address: remove "Address:" prefix
-        address = re.sub(r'^(?:Permanent\s*(?:&|and)\s*Present\s*)?Address:\s*', '', address, flags=re.IGNORECASE).strip()
-
-        # Get first phone
-        phone_str = phones[0] if phones else ''
-        # Clean phone string
-        phone_str = re.sub(r'^(?:Tel|Phone|Ph|Fax|Call|Cell|Mob)\s*[\.\:\-\s]*', '', phone_str, flags=re.IGNORECASE).strip()
-
-        # Get first email
-        email_str = emails[0] if emails else ''
-
-        # Get first website
-        website_str = websites[0] if websites else ''
-
-        agent = {
-            'id': str(agent_id),
-            'licenseNumber': license_raw,
-            'name': company_name,
-            'address': address if address else 'Bangladesh',
-            'phone': phone_str if phone_str else 'N/A',
-            'email': email_str if email_str else 'N/A',
-            'website': website_str if website_str else None,
-            'status': status,
-            'cities': cities if cities != ['Other'] else None,
-        }
-        agents.append(agent)
-        agent_id += 1
+        # Check for phone/tel/fax
+        if any(x in line_lower for x in ['tel', 'phone', 'ph.', 'ph:', 'ph ', 'fax', 'call', 'cell', 'mob']):
+            phones.append(line)
+            in_contact = True
+            continue
 
-    return agents
+        # If line starts with "E-mail" or "Email"
+        if line_lower.startswith('e-mail') or line_lower.startswith('email'):
+            email_match2 = re.findall(r'[\w\.\-\+]+@[\w\.\-]+\.\w+', line)
+            if email_match2:
+                emails.extend(email_match2)
+            continue
+
+        # If line starts with Web/Website
+        if line_lower.startswith('web'):
+            web_match2 = re.findall(r'(?:www\.[\w\.\-]+\.\w+)', line, re.IGNORECASE)
+            if web_match2:
+                websites.extend(web_match2)
+            continue
+
+        # Address or owner?
+        if not in_contact:
+            # Before contact info = address
+            address_parts.append(line)
+        else:
+            # After contact info = could be owner or validity
+            pass
+
+    # Extract validity from end of content (the last date-like match, so
+    # phone numbers earlier in the entry are not mistaken for it)
+    validity_matches = re.findall(r'(\d{1,2}[\.\-\s]+(?:[A-Za-z]+|\d{1,2})[\.\-\s]+\d{4})\b', content)
+    if validity_matches:
+        validity = validity_matches[-1].strip()
+
+    address = ', '.join(address_parts) if address_parts else ''
+    # Clean address: remove "Address:" prefix
+    address = re.sub(r'^(?:Permanent\s*(?:&|and)\s*Present\s*)?Address:\s*', '', address, flags=re.IGNORECASE).strip()
+
+    # Get first phone
+    phone_str = phones[0] if phones else ''
+    # Clean phone string
+    phone_str = re.sub(r'^(?:Tel|Phone|Ph|Fax|Call|Cell|Mob)\s*[\.\:\-\s]*', '', phone_str, flags=re.IGNORECASE).strip()
+
+    # Get first email
+    email_str = emails[0] if emails else ''
+
+    # Get first website
+    website_str = websites[0] if websites else ''
+
+    return {
+        'licenseNumber': license_raw,
+        'name': company_name,
+        'address': address if address else 'Bangladesh',
+        'phone': phone_str if phone_str else 'N/A',
+        'email': email_str if email_str else 'N/A',
+        'website': website_str if website_str else None,
+        'status': status,
+        'cities': cities if cities != ['Other'] else None,
+        'validity': validity,
+    }
 
 
 def to_ts_array(agents):
@@ -174,16 +200,145 @@ def to_ts_array(agents):
     return '\n'.join(lines)
 
 
+SHARD_FIELDS = ['id', 'licenseNumber', 'name', 'address', 'phone', 'email', 'website', 'status', 'cities']
+AGENT_STATUSES = ['Active', 'Suspended', 'Expired']
+AGENT_CITIES = ['Dhaka', 'Chittagong', 'Khulna']
+
+
+def _search_key(s):
+    return re.sub(r'[^a-z0-9]', '', s.lower())
+
+
+def _bitmap(ids, total):
+    """Base64 bitset with bit i set (LSB first) for every doc id in ids."""
+    bits = bytearray((total + 7) // 8)
+    for i in ids:
+        bits[i >> 3] |= 1 << (i & 7)
+    return base64.b64encode(bytes(bits)).decode('ascii')
+
+
+def build_index(agents, shard_size):
+    """Build the lookup index over agents, addressed by list position (doc id).
+
+    - ``terms``: sorted ``[term, [doc ids]]`` for every name word and the
+      compact license key (``mla002``), so a prefix lookup is one binary search
+    - ``licenses``: exact compact license key -> doc id
+    - ``cities`` / ``statuses``: base64 bitsets over doc ids
+    """
+    postings = {}
+    licenses = {}
+    cities = {c: [] for c in AGENT_CITIES}
+    statuses = {s: [] for s in AGENT_STATUSES}
+
+    for doc_id, a in enumerate(agents):
+        license_key = _search_key(a['licenseNumber'])
+        licenses[license_key] = doc_id
+        words = {w for w in re.split(r'[^a-z0-9]+', a['name'].lower()) if w}
+        for term in words | {license_key}:
+            postings.setdefault(term, []).append(doc_id)
+        for city in a['cities'] or []:
+            cities.setdefault(city, []).append(doc_id)
+        statuses.setdefault(a['status'], []).append(doc_id)
+
+    total = len(agents)
+    return {
+        'version': 1,
+        'total': total,
+        'shardSize': shard_size,
+        'fields': SHARD_FIELDS,
+        'terms': sorted([term, ids] for term, ids in postings.items()),
+        'licenses': licenses,
+        'cities': {c: _bitmap(ids, total) for c, ids in cities.items()},
+        'statuses': {s: _bitmap(ids, total) for s, ids in statuses.items()},
+    }
+
+
+def write_shards(agents, out_dir, shard_size=32):
+    """Write agents as compact JSON shards plus index.json into out_dir.
+
+    Each shard is a list of rows in SHARD_FIELDS order; agent doc id ``i``
+    lives in shard ``i // shard_size``. Returns a report with index build
+    time and file sizes.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+
+    started = time.perf_counter()
+    index = build_index(agents, shard_size)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    shards = []
+    for n, start in enumerate(range(0, len(agents), shard_size)):
+        rows = [[a.get(field) for field in SHARD_FIELDS] for a in agents[start:start + shard_size]]
+        name = f"shard-{n:03d}.json"
+        content = json.dumps(rows, ensure_ascii=False, separators=(',', ':'))
+        write_if_changed(os.path.join(out_dir, name), content)
+        shards.append({'file': name, 'count': len(rows), 'bytes': len(content.encode('utf-8'))})
+
+    index['shards'] = shards
+    index_content = json.dumps(index, ensure_ascii=False, separators=(',', ':'))
+    write_if_changed(os.path.join(out_dir, 'index.json'), index_content)
+
+    # Drop shards left over from a previously larger list
+    keep = {s['file'] for s in shards}
+    for name in os.listdir(out_dir):
+        if name.startswith('shard-') and name not in keep:
+            os.remove(os.path.join(out_dir, name))
+
+    return {
+        'index_build_ms': round(build_ms, 3),
+        'index_bytes': len(index_content.encode('utf-8')),
+        'terms': len(index['terms']),
+        'shards': shards,
+    }
+
+
+def write_if_changed(path, content):
+    """Write content to path only if its hash differs. Returns True if written."""
+    new_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            if hashlib.sha256(f.read()).hexdigest() == new_hash:
+                return False
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+    return True
+
+
 def _escape(s):
     return s.replace("'", "\\'").replace('\n', ' ')
 
 
-if __name__ == '__main__':
-    agents = parse_agents('/Users/rafsun/Documents/Antigravity/M-hub1/agents_ocr.txt')
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate components/agentsData.ts from the agents OCR text")
+    parser.add_argument('ocr_file', nargs='?', default='/Users/rafsun/Documents/Antigravity/M-hub1/agents_ocr.txt')
+    parser.add_argument('--out', default='/Users/rafsun/Documents/Antigravity/M-hub1/components/agentsData.ts')
+    parser.add_argument('--page-aware', action='store_true', help="Parse pages in parallel and stitch entries across page breaks")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes for --page-aware (default: all cores)")
+    parser.add_argument('--shards-dir', default=None, help="Also write lazily loadable JSON shards + search index here (e.g. public/data/agents)")
+    parser.add_argument('--shard-size', type=int, default=32)
+    parser.add_argument('--profile', action='store_true', help="Write cProfile/tracemalloc reports to reports/profiles/ (or set ENABLE_PROFILING=1)")
+    args = parser.parse_args(argv)
+
+    with profile_run('generate_agents_ts', enabled=profiling_enabled(args.profile)):
+        agents = parse_agents(args.ocr_file, page_aware=args.page_aware, workers=args.workers)
+        ts_code = to_ts_array(agents)
     print(f"Parsed {len(agents)} agents")
 
-    ts_code = to_ts_array(agents)
-    out_path = '/Users/rafsun/Documents/Antigravity/M-hub1/components/agentsData.ts'
-    with open(out_path, 'w') as f:
-        f.write(ts_code)
-    print(f"Written to {out_path}")
+    out_path = args.out
+    if write_if_changed(out_path, ts_code):
+        print(f"Written to {out_path}")
+    else:
+        print(f"{out_path} unchanged")
+
+    if args.shards_dir:
+        report = write_shards(agents, args.shards_dir, shard_size=args.shard_size)
+        print(f"Index built in {report['index_build_ms']} ms: {report['terms']} terms, {report['index_bytes']} bytes")
+        for shard in report['shards']:
+            print(f"  {shard['file']}: {shard['count']} agents, {shard['bytes']} bytes")
+
+
+if __name__ == '__main__':
+    main()
@@ -11,15 +11,16 @@ CREATE TABLE IF NOT EXISTS public.manning_agents (
     created_at timestamp with time zone DEFAULT timezone('utc'::text, now()) NOT NULL
 );
 
+-- Upserts are keyed on the license number
+CREATE UNIQUE INDEX IF NOT EXISTS manning_agents_license_number_key ON public.manning_agents (license_number);
+
 -- Enable RLS
 ALTER TABLE public.manning_agents ENABLE ROW LEVEL SECURITY;
 
 -- Allow public read access
+DROP POLICY IF EXISTS "Allow public read access" ON public.manning_agents;
 CREATE POLICY "Allow public read access" ON public.manning_agents FOR SELECT USING (true);
 
--- Clear existing data (optional, maybe we want to upsert)
-TRUNCATE TABLE public.manning_agents;
-
 INSERT INTO public.manning_agents (license_number, company_name, contact_details, validity_date) VALUES
 ('MLA-002', 'Unicorn Shipping Services Limited', 'Unicorn Shipping Services Limited
 Address: Finlay House (4th Floor), 11 Agrabad, C/A, Chattogram
@@ -941,4 +942,6 @@ Bayas
 (Chairman)
 25-08-
 2027
-', '');
\ No newline at end of file
+', '')
+ON CONFLICT (license_number) DO UPDATE SET company_name = EXCLUDED.company_name, contact_details = EXCLUDED.contact_details, validity_date = EXCLUDED.validity_date;
+
@@ -0,0 +1,257 @@
+"""
+Token, latency and cost accounting for LLM calls.
+
+Every model call goes through ``usage.call()``, which records prompt and
+completion tokens, time to first token, total latency, retries, cache hits
+and errors. Calls are aggregated per model and per parse description, priced
+from PRICES (USD per million tokens, an estimate; local Ollama models are
+free) and written as JSON next to the model-availability reports:
+
+    reports/llm-usage-<run>-<stamp>.json   one run
+    reports/latest-llm-usage.json          the most recent run
+
+Usage:
+    from llm_usage import usage
+
+    with usage.call('llama3', provider='ollama', description=parse_description) as call:
+        for piece in stream:
+            call.first_token()
+            ...
+        call.tokens(prompt=data['prompt_eval_count'], completion=data['eval_count'])
+
+    usage.write()
+
+Override or extend the price table with LLM_PRICES_FILE (JSON
+``{"model": [input_per_million, output_per_million]}``).
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+# Constants
+REPORTS_DIR = "reports"
+DESCRIPTION_CHARS = 80  # parse descriptions are grouped by this prefix
+MAX_CALL_RECORDS = 1000  # per-call detail kept in a report; aggregates cover every call
+
+# USD per million (input, output) tokens
+PRICES = {
+    'gemini-2.5-flash': (0.30, 2.50),
+    'gemini-2.5-pro': (1.25, 10.00),
+    'gemini-2.0-flash': (0.10, 0.40),
+    'gemini-2.0-flash-exp': (0.10, 0.40),
+    'gemini-1.5-flash': (0.075, 0.30),
+    'gemini-1.5-flash-latest': (0.075, 0.30),
+    'gemini-pro': (0.50, 1.50),
+}
+FREE_PROVIDERS = {'ollama'}  # runs locally
+
+
+def _load_prices():
+    prices = dict(PRICES)
+    path = os.environ.get("LLM_PRICES_FILE")
+    if path:
+        with open(path, 'r', encoding='utf-8') as f:
+            prices.update({model: tuple(pair) for model, pair in json.load(f).items()})
+    return prices
+
+
+def _model_key(model):
+    return model[len('models/'):] if model.startswith('models/') else model
+
+
+def _percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100
+    lo, hi = int(k), min(int(k) + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 1) if seconds is not None else None
+
+
+class Call:
+    """One model request, filled in while it runs."""
+
+    __slots__ = ('model', 'provider', 'description', 'meta', 'prompt_tokens', 'completion_tokens',
+                 'cached_tokens', 'retries', 'cache_hit', 'cancelled', 'error', 'ttft', 'latency', '_t0')
+
+    def __init__(self, model, provider, description=None, **meta):
+        self.model = model
+        self.provider = provider
+        self.description = description
+        self.meta = meta
+        self.prompt_tokens = None
+        self.completion_tokens = None
+        self.cached_tokens = None
+        self.retries = 0
+        self.cache_hit = False
+        self.cancelled = False
+        self.error = None
+        self.ttft = None
+        self.latency = None
+        self._t0 = time.perf_counter()
+
+    def first_token(self):
+        """Mark the first streamed token (later calls are ignored)."""
+        if self.ttft is None:
+            self.ttft = time.perf_counter() - self._t0
+
+    def tokens(self, prompt=None, completion=None, cached=None):
+        self.prompt_tokens = prompt
+        self.completion_tokens = completion
+        self.cached_tokens = cached
+
+    def retry(self):
+        self.retries += 1
+
+    def hit(self):
+        """The answer came from a cache; no tokens were spent."""
+        self.cache_hit = True
+
+    def cancel(self):
+        """The caller stopped the request; counted apart from errors."""
+        self.cancelled = True
+
+    def to_dict(self):
+        return {
+            'model': self.model,
+            'provider': self.provider,
+            'description': self.description,
+            'prompt_tokens': self.prompt_tokens,
+            'completion_tokens': self.completion_tokens,
+            'cached_tokens': self.cached_tokens,
+            'ttft_ms': _ms(self.ttft),
+            'latency_ms': _ms(self.latency),
+            'retries': self.retries,
+            'cache_hit': self.cache_hit,
+            'cancelled': self.cancelled,
+            'error': self.error,
+            **self.meta,
+        }
+
+
+class LLMUsage:
+    """Model calls of one run. A module-level instance is shared by the callers."""
+
+    def __init__(self, run_name=None):
+        self._lock = threading.Lock()
+        self.reset(run_name)
+
+    def reset(self, run_name=None):
+        self.run_name = run_name or os.path.splitext(os.path.basename(sys.argv[0]))[0] or 'llm'
+        self.started_at = datetime.utcnow()
+        self.prices = _load_prices()
+        with self._lock:
+            self.calls = []
+
+    @contextmanager
+    def call(self, model, provider, description=None, **meta):
+        """Time a model request; the yielded Call takes tokens, first token, retries and cache hits."""
+        record = Call(model, provider, description, **meta)
+        try:
+            yield record
+        except BaseException as e:
+            record.error = f"{type(e).__name__}: {e}"[:200]
+            raise
+        finally:
+            record.latency = time.perf_counter() - record._t0
+            with self._lock:
+                self.calls.append(record)
+
+    def cost(self, call):
+        """Estimated USD for a call; None when the model has no price."""
+        if call.cache_hit or call.provider in FREE_PROVIDERS:
+            return 0.0
+        price = self.prices.get(_model_key(call.model))
+        if price is None:
+            return None
+        return ((call.prompt_tokens or 0) * price[0] + (call.completion_tokens or 0) * price[1]) / 1_000_000
+
+    def _aggregate(self, calls):
+        latencies = [c.latency for c in calls if c.latency is not None and not c.cache_hit and not c.error]
+        ttfts = [c.ttft for c in calls if c.ttft is not None]
+        costs = [self.cost(c) for c in calls]
+        return {
+            'calls': len(calls),
+            'errors': sum(1 for c in calls if c.error and not c.cancelled),
+            'cancelled': sum(1 for c in calls if c.cancelled),
+            'retries': sum(c.retries for c in calls),
+            'cache_hits': sum(1 for c in calls if c.cache_hit),
+            'prompt_tokens': sum(c.prompt_tokens or 0 for c in calls),
+            'completion_tokens': sum(c.completion_tokens or 0 for c in calls),
+            'cached_tokens': sum(c.cached_tokens or 0 for c in calls),
+            'p50_ttft_ms': _ms(_percentile(ttfts, 50)),
+            'p95_ttft_ms': _ms(_percentile(ttfts, 95)),
+            'p50_latency_ms': _ms(_percentile(latencies, 50)),
+            'p95_latency_ms': _ms(_percentile(latencies, 95)),
+            'total_latency_ms': _ms(sum(latencies)),
+            'cost_usd': round(sum(c for c in costs if c is not None), 6),
+            'unpriced_calls': sum(1 for c in costs if c is None),
+        }
+
+    def summary(self, calls=None):
+        """Totals plus breakdowns per model and per parse description."""
+        with self._lock:
+            calls = list(self.calls if calls is None else calls)
+        by_model, by_description = {}, {}
+        for c in calls:
+            by_model.setdefault(c.model, []).append(c)
+            if c.description:
+                by_description.setdefault(c.description[:DESCRIPTION_CHARS], []).append(c)
+        return {
+            'run': self.run_name,
+            'started_at': self.started_at.isoformat(),
+            'totals': self._aggregate(calls),
+            'by_model': {model: self._aggregate(group) for model, group in sorted(by_model.items())},
+            'by_description': {d: self._aggregate(group) for d, group in sorted(by_description.items())},
+        }
+
+    def to_dict(self):
+        data = self.summary()
+        with self._lock:
+            data['calls'] = [c.to_dict() for c in self.calls[-MAX_CALL_RECORDS:]]
+        data['prices_usd_per_million'] = {m: list(p) for m, p in sorted(self.prices.items())}
+        return data
+
+    def write(self, reports_dir=REPORTS_DIR):
+        """Write the dated report and latest-llm-usage.json atomically. Returns the dated path (None if no calls)."""
+        if not self.calls:
+            return None
+        os.makedirs(reports_dir, exist_ok=True)
+        content = json.dumps(self.to_dict(), indent=2)
+        stamp = datetime.utcnow().strftime('%Y-%m-%d_%H-%M-%S')
+        dated = os.path.join(reports_dir, f"llm-usage-{self.run_name}-{stamp}.json")
+        for path in (dated, os.path.join(reports_dir, "latest-llm-usage.json")):
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        print(f"🧾 LLM usage saved to {dated}")
+        return dated
+
+
+def to_markdown(data):
+    """Markdown table of a usage report (per model), for summaries and the Streamlit app."""
+    lines = [
+        "| Model | Calls | Cache hits | Retries | Errors | Prompt tok | Completion tok | p50 TTFT ms | p50 ms | p95 ms | Cost (USD) |",
+        "|-------|-------|------------|---------|--------|------------|----------------|-------------|--------|--------|------------|",
+    ]
+    for model, a in data['by_model'].items():
+        lines.append(
+            f"| `{model}` | {a['calls']} | {a['cache_hits']} | {a['retries']} | {a['errors']} | "
+            f"{a['prompt_tokens']} | {a['completion_tokens']} | {a['p50_ttft_ms'] if a['p50_ttft_ms'] is not None else '-'} | "
+            f"{a['p50_latency_ms'] if a['p50_latency_ms'] is not None else '-'} | "
+            f"{a['p95_latency_ms'] if a['p95_latency_ms'] is not None else '-'} | {a['cost_usd']:.6f} |"
+        )
+    return "\n".join(lines) + "\n"
+
+
+usage = LLMUsage()
@@ -1,9 +1,25 @@
+import time
+from contextlib import closing
+
 import streamlit as st
 from scrape import (scrape_website,
                     split_dom_content,
                     clean_body_content,
                     extract_body_content)
-from parse import parse_with_ollama
+from parse import stream_parse_with_ollama
+from profiling import profile_run
+from llm_usage import usage, to_markdown
+
+UI_REFRESH = 0.1  # seconds between redraws of a streaming chunk
+HEARTBEAT = 0.25  # redraw this often while no tokens arrive, so Cancel is noticed
+
+
+def show_usage():
+    # Tokens, latency and cost of this parse (reports/latest-llm-usage.json)
+    usage.write()
+    with st.expander("LLM usage"):
+        st.markdown(to_markdown(usage.summary()))
+
 
 st.title("Ai Web Scraper")
 url = st.text_input("Enter the URL")
@@ -11,10 +27,10 @@ url = st.text_input("Enter the URL")
 if st.button("Scrape"):
     st.write("Scraping the website...")
     result = scrape_website(url)
-    
+
     body_content = extract_body_content(result)
     clean_content = clean_body_content(body_content)
-    
+
     st.session_state.dom_content = clean_content
 
     with st.expander("Scraped Content"):
@@ -25,10 +41,62 @@ if "dom_content" in st.session_state:
 
     if st.button("Parse Content"):
         if parse_description:
-            st.button("Parsing the content...")
-
             dom_chunks = split_dom_content(st.session_state.dom_content)
-            result = parse_with_ollama(dom_chunks, parse_description)
-            st.write(result)
-            
+            answers = [""] * len(dom_chunks)
+            st.session_state.parse_answers = answers
+            st.session_state.parse_running = True
+
+            # Any click reruns the script, which stops this run at its next
+            # redraw; closing the stream then aborts the chunks in flight
+            st.button("Cancel")
+            overall = st.progress(0.0, text=f"Parsing {len(dom_chunks)} chunks...")
+            bars, outputs = [], []
+            for i in range(1, len(dom_chunks) + 1):
+                bars.append(st.progress(0.0, text=f"Chunk {i} · queued"))
+                outputs.append(st.empty())
+
+            usage.reset('main_parse')
+            tokens = [0] * len(dom_chunks)
+            drawn = [0.0] * len(dom_chunks)
+            finished = 0
+            started = time.perf_counter()
+
+            # Opt-in: ENABLE_PROFILING=1 or `streamlit run main.py -- --profile`
+            with profile_run('main_parse'), \
+                    closing(stream_parse_with_ollama(dom_chunks, parse_description, heartbeat=HEARTBEAT)) as events:
+                for event in events:
+                    elapsed = time.perf_counter() - started
+                    if event is None:
+                        overall.progress(finished / len(dom_chunks),
+                                         text=f"{finished} of {len(dom_chunks)} chunks · {elapsed:.1f}s")
+                        continue
+                    k = event.index - 1
+                    if event.done:
+                        answers[k] = event.text
+                        finished += 1
+                        bars[k].progress(1.0, text=f"Chunk {event.index} · done")
+                        outputs[k].markdown(event.text or "_nothing found_")
+                        overall.progress(finished / len(dom_chunks),
+                                         text=f"{finished} of {len(dom_chunks)} chunks · {elapsed:.1f}s")
+                        continue
+                    answers[k] += event.text
+                    tokens[k] += 1
+                    if elapsed - drawn[k] >= UI_REFRESH:
+                        # The answer is at most as long as the text it is extracted from
+                        drawn[k] = elapsed
+                        bars[k].progress(min(len(answers[k]) / len(dom_chunks[k]), 0.99),
+                                         text=f"Chunk {event.index} · {tokens[k]} tokens")
+                        outputs[k].markdown(answers[k])
+
+            st.session_state.parse_running = False
+            overall.empty()
+            for bar in bars:
+                bar.empty()
+            show_usage()
 
+    elif st.session_state.get("parse_running"):
+        # The previous run was stopped part-way (Cancel or another click)
+        st.session_state.parse_running = False
+        st.warning("Parsing cancelled; partial results below.")
+        st.write("\n".join(answer for answer in st.session_state.parse_answers if answer))
+        show_usage()
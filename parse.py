@@ -1,7 +1,45 @@
+import io
+import os
 import re
 import json
+import hashlib
+import argparse
+import threading
+from collections import namedtuple
+
+from agents_ocr import read_entries
+from llm_usage import usage
+from profiling import profile_run, profiling_enabled
+
+# Ollama chunk parsing for the Streamlit app (main.py)
+OLLAMA_URL = os.environ.get("OLLAMA_HOST", "http://localhost:11434")
+OLLAMA_MODEL = os.environ.get("OLLAMA_MODEL", "llama3")
+OLLAMA_RETRIES = 2
+OLLAMA_TIMEOUT = (5, 300)  # connect, read (between streamed lines)
+OLLAMA_WORKERS = int(os.environ.get("OLLAMA_WORKERS", "2"))  # chunks streamed at once (see OLLAMA_NUM_PARALLEL)
+CANCEL_POLL = 0.2  # seconds between cancel checks while no tokens arrive
+LLM_CACHE_DIR = os.path.join(".cache", "llm")  # answers keyed by model + prompt
+PARSE_TEMPLATE = (
+    "You are tasked with extracting specific information from the following text content: {dom_content}. "
+    "Please follow these instructions carefully: \n\n"
+    "1. **Extract Information:** Only extract the information that directly matches the provided description: {parse_description}. "
+    "2. **No Extra Content:** Do not include any additional text, comments, or explanations in your response. "
+    "3. **Empty Response:** If no information matches the description, return an empty string ('')."
+    "4. **Direct Data Only:** Your output should contain only the data that is explicitly requested, with no other text."
+)
+ChunkEvent = namedtuple('ChunkEvent', 'index text done')  # see stream_parse_with_ollama
+
+
+def parse_agents(file_path, page_aware=False, workers=None):
+    if page_aware:
+        # Pages are cleaned and parsed in a process pool, then stitched
+        # back together so entries split across a page break stay whole
+        agents = read_entries(file_path, workers=workers, build=_build_agent)
+        if not agents:
+            print("No entries found")
+            return
+        return agents
 
-def parse_agents(file_path):
     with open(file_path, 'r', encoding='utf-8') as f:
         text = f.read()
 
@@ -33,72 +71,76 @@ def parse_agents(file_path):
         if 'MLA-' not in license_no:
             license_no = license_no.replace('MLA', 'MLA-')
         content = parts[i+1].strip()
+        agents.append(_build_agent(license_no, content))
+
+    return agents
+
+def _build_agent(license_no, content):
+    """Build one agent record from a license number and its OCR text."""
+    # remove page headers/footers if matched inside
+    content = re.sub(r'==.*?==', '', content)
+    content = re.sub(r'2/10/26, 10:11 PM about:blank', '', content)
+    content = re.sub(r'about:blank \d+/\d+', '', content)
+    
+    lines = [l.strip() for l in content.split('\n') if l.strip()]
+    
+    # Heuristic extraction
+    # Name is usually the first line
+    company_name = lines[0] if lines else ""
+    
+    # Address usually follows until keywords like "Tel", "Phone", "Email", "Web"
+    address_lines = []
+    contact_lines = []
+    owner_part = []
+    validity = ""
+    
+    # Extract validity (date at the end)
+    # Pattern: dd-mm-yyyy or similar at end
+    validity_match = re.search(r'(\d{1,2}[\.\-\s]\d{1,2}[\.\-\s]\d{2,4})', content.split('\n')[-1])
+    if validity_match:
+         validity = validity_match.group(1)
+    
+    # Re-process lines to separate address, contact, owner
+    # This is tricky without strict structure.
+    # We can try to identify phone/email lines.
+    
+    is_contact_section = False
+    is_owner_section = False
+    
+    for line in lines[1:]:
+        if any(x in line.lower() for x in ['tel', 'phone', 'fax', 'mob', 'cell', 'mail', 'web', 'www']):
+            is_contact_section = True
         
-        # remove page headers/footers if matched inside
-        content = re.sub(r'==.*?==', '', content)
-        content = re.sub(r'2/10/26, 10:11 PM about:blank', '', content)
-        content = re.sub(r'about:blank \d+/\d+', '', content)
-        
-        lines = [l.strip() for l in content.split('\n') if l.strip()]
-        
-        # Heuristic extraction
-        # Name is usually the first line
-        company_name = lines[0] if lines else ""
-        
-        # Address usually follows until keywords like "Tel", "Phone", "Email", "Web"
-        address_lines = []
-        contact_lines = []
-        owner_part = []
-        validity = ""
-        
-        # Extract validity (date at the end)
-        # Pattern: dd-mm-yyyy or similar at end
-        validity_match = re.search(r'(\d{1,2}[\.\-\s]\d{1,2}[\.\-\s]\d{2,4})', content.split('\n')[-1])
-        if validity_match:
-             validity = validity_match.group(1)
-        
-        # Re-process lines to separate address, contact, owner
-        # This is tricky without strict structure.
-        # We can try to identify phone/email lines.
-        
-        is_contact_section = False
-        is_owner_section = False
+        # If we hit a very short line or a name-like line at the end, might be owner
+        # But the OCR sometimes puts Owner Name in a separate column visually, which might interleave or appear at end.
+        # In the text provided:
+        # "Capt. A.T.M\nAnwarul Haque\n26 May\n2026"
         
-        for line in lines[1:]:
-            if any(x in line.lower() for x in ['tel', 'phone', 'fax', 'mob', 'cell', 'mail', 'web', 'www']):
-                is_contact_section = True
-            
-            # If we hit a very short line or a name-like line at the end, might be owner
-            # But the OCR sometimes puts Owner Name in a separate column visually, which might interleave or appear at end.
-            # In the text provided:
-            # "Capt. A.T.M\nAnwarul Haque\n26 May\n2026"
-            
-            if is_contact_section and not is_owner_section:
-                # Check if we moved passed contact info to owner info
-                # Owner info often doesn't have contact keywords
-                if not any(x in line.lower() for x in ['tel', 'phone', 'fax', 'mail', 'web', 'www']):
-                     # Could be address continuation or owner?
-                     # If it looks like a name and is near end?
-                     pass
-            
-            contact_lines.append(line) # Dump everything else in contact/raw for now
-            
+        if is_contact_section and not is_owner_section:
+            # Check if we moved passed contact info to owner info
+            # Owner info often doesn't have contact keywords
+            if not any(x in line.lower() for x in ['tel', 'phone', 'fax', 'mail', 'web', 'www']):
+                 # Could be address continuation or owner?
+                 # If it looks like a name and is near end?
+                 pass
         
-        # Let's clean up the "raw" approach.
-        # Everything between Name and Validity is "Details"
-        # We will save: License, Name, RawText (to be parsed manually or shown as is), Validity
+        contact_lines.append(line) # Dump everything else in contact/raw for now
         
-        agents.append({
-            "license": license_no,
-            "name": company_name,
-            "raw_text": content, 
-            "validity": validity
-        })
+    
+    # Let's clean up the "raw" approach.
+    # Everything between Name and Validity is "Details"
+    # We will save: License, Name, RawText (to be parsed manually or shown as is), Validity
+    
+    return {
+        "license": license_no,
+        "name": company_name,
+        "raw_text": content, 
+        "validity": validity
+    }
 
-    return agents
+AGENT_COLUMNS = ('license_number', 'company_name', 'contact_details', 'validity_date')
 
-def generate_sql(agents):
-    sql = """
+SCHEMA_SQL = """
 -- Create agencies table
 CREATE TABLE IF NOT EXISTS public.manning_agents (
     id uuid DEFAULT gen_random_uuid() PRIMARY KEY,
@@ -111,35 +153,342 @@ CREATE TABLE IF NOT EXISTS public.manning_agents (
     created_at timestamp with time zone DEFAULT timezone('utc'::text, now()) NOT NULL
 );
 
+-- Upserts are keyed on the license number
+CREATE UNIQUE INDEX IF NOT EXISTS manning_agents_license_number_key ON public.manning_agents (license_number);
+
 -- Enable RLS
 ALTER TABLE public.manning_agents ENABLE ROW LEVEL SECURITY;
 
 -- Allow public read access
+DROP POLICY IF EXISTS "Allow public read access" ON public.manning_agents;
 CREATE POLICY "Allow public read access" ON public.manning_agents FOR SELECT USING (true);
+"""
 
--- Clear existing data (optional, maybe we want to upsert)
-TRUNCATE TABLE public.manning_agents;
+UPSERT_CONFLICT_SQL = (
+    "ON CONFLICT (license_number) DO UPDATE SET "
+    + ", ".join(f"{c} = EXCLUDED.{c}" for c in AGENT_COLUMNS[1:])
+)
 
-INSERT INTO public.manning_agents (license_number, company_name, contact_details, validity_date) VALUES
-"""
-    values = []
+# Staged rows keep their input position so a license repeated in the OCR
+# text resolves to its last occurrence, as the batched upserts do
+STAGE_TABLE_SQL = (
+    "CREATE TEMP TABLE manning_agents_stage ON COMMIT DROP AS\n"
+    f"    SELECT {', '.join(AGENT_COLUMNS)}, 0::bigint AS ordinal FROM public.manning_agents WITH NO DATA"
+)
+STAGE_MERGE_SQL = (
+    f"INSERT INTO public.manning_agents ({', '.join(AGENT_COLUMNS)})\n"
+    f"SELECT DISTINCT ON (license_number) {', '.join(AGENT_COLUMNS)} FROM manning_agents_stage\n"
+    "ORDER BY license_number, ordinal DESC\n"
+    f"{UPSERT_CONFLICT_SQL}"
+)
+
+def _agent_row(a):
+    return (a['license'], a['name'], a['raw_text'], a['validity'])
+
+
+def _sql_literal(value):
+    # Escape single quotes
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _copy_field(value):
+    return (value.replace('\\', '\\\\').replace('\t', '\\t')
+            .replace('\n', '\\n').replace('\r', '\\r'))
+
+
+def _batches(agents, batch_size):
+    # A single INSERT ... ON CONFLICT may not touch the same row twice, so
+    # repeated licenses inside a batch collapse to the last occurrence
+    batch = {}
     for a in agents:
-        # Escape single quotes
-        name = a['name'].replace("'", "''")
-        license = a['license'].replace("'", "''")
-        raw = a['raw_text'].replace("'", "''")
-        validity = a['validity'].replace("'", "''")
-        
-        values.append(f"('{license}', '{name}', '{raw}', '{validity}')")
-    
-    sql += ",\n".join(values) + ";"
-    return sql
+        batch[a['license']] = _agent_row(a)
+        if len(batch) >= batch_size:
+            yield list(batch.values())
+            batch = {}
+    if batch:
+        yield list(batch.values())
 
-if __name__ == "__main__":
-    data = parse_agents('/Users/rafsun/Documents/Antigravity/M-hub1/agents_ocr.txt')
+
+def write_sql(agents, out, batch_size=100, fmt='upsert', include_schema=True):
+    """Stream agents to ``out`` (any object with ``write``) as SQL.
+
+    ``fmt='upsert'`` writes batched ``INSERT ... ON CONFLICT (license_number)
+    DO UPDATE`` statements. ``fmt='copy'`` writes a psql ``COPY`` into a
+    temporary staging table followed by one upsert from it. Either way rows
+    are replaced in place, so readers never see an empty table. Returns the
+    number of rows written.
+    """
+    if include_schema:
+        out.write(SCHEMA_SQL)
+        out.write("\n")
+
+    columns = ", ".join(AGENT_COLUMNS)
+    count = 0
+
+    if fmt == 'copy':
+        out.write("BEGIN;\n\n")
+        out.write(f"{STAGE_TABLE_SQL};\n\n")
+        out.write(f"COPY manning_agents_stage ({columns}, ordinal) FROM stdin;\n")
+        for row in agents:
+            count += 1
+            out.write("\t".join(_copy_field(v) for v in _agent_row(row)) + f"\t{count}\n")
+        out.write("\\.\n\n")
+        out.write(f"{STAGE_MERGE_SQL};\n\n")
+        out.write("COMMIT;\n")
+        return count
+
+    if fmt != 'upsert':
+        raise ValueError(f"Unknown SQL format: {fmt}")
+
+    for batch in _batches(agents, batch_size):
+        out.write(f"INSERT INTO public.manning_agents ({columns}) VALUES\n")
+        out.write(",\n".join("(" + ", ".join(_sql_literal(v) for v in row) + ")" for row in batch))
+        out.write(f"\n{UPSERT_CONFLICT_SQL};\n\n")
+        count += len(batch)
+    return count
+
+
+def generate_sql(agents):
+    buf = io.StringIO()
+    write_sql(agents, buf)
+    return buf.getvalue()
+
+
+def load_agents(agents, dsn, batch_size=500):
+    """Apply agents directly to Postgres in one short transaction.
+
+    Rows are streamed with COPY into a temporary staging table and merged
+    with a single upsert, so there is no truncate window. Needs psycopg 3
+    (``pip install "psycopg[binary]"``).
+    """
+    try:
+        import psycopg
+    except ImportError:
+        raise RuntimeError('Direct load needs psycopg: pip install "psycopg[binary]"')
+
+    columns = ", ".join(AGENT_COLUMNS)
+    count = 0
+    with psycopg.connect(dsn) as conn:
+        with conn.cursor() as cur:
+            cur.execute(SCHEMA_SQL)
+            cur.execute(STAGE_TABLE_SQL)
+            with cur.copy(f"COPY manning_agents_stage ({columns}, ordinal) FROM STDIN") as copy:
+                for batch in _batches(agents, batch_size):
+                    for row in batch:
+                        count += 1
+                        copy.write_row(row + (count,))
+            cur.execute(STAGE_MERGE_SQL)
+        # Leaving the connection block commits the transaction
+    return count
+
+
+def _cache_path(cache_dir, model, prompt):
+    digest = hashlib.sha256(f"{model}\0{prompt}".encode('utf-8')).hexdigest()
+    return os.path.join(cache_dir, f"{digest}.txt")
+
+
+class ParseCancelled(Exception):
+    """The chunk parse was cancelled before it finished."""
+
+    def __init__(self, message="parse cancelled"):
+        super().__init__(message)
+
+
+class _InFlight:
+    """Open streaming responses, so a cancel can close them from another thread."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._responses = set()
+
+    def add(self, response):
+        with self._lock:
+            self._responses.add(response)
+
+    def discard(self, response):
+        with self._lock:
+            self._responses.discard(response)
+
+    def close_all(self):
+        with self._lock:
+            responses, self._responses = list(self._responses), set()
+        for response in responses:
+            response.close()  # the worker's read fails at once instead of waiting for the next token
+
+
+def _ollama_generate(session, prompt, model, call, base_url=OLLAMA_URL, on_piece=None, cancel=None, in_flight=None):
+    """Stream one /api/generate answer, recording first token and token counts on `call`."""
+    response = session.post(f"{base_url}/api/generate", json={'model': model, 'prompt': prompt, 'stream': True},
+                            stream=True, timeout=OLLAMA_TIMEOUT)
+    if in_flight is not None:
+        in_flight.add(response)
+    pieces = []
+    try:
+        response.raise_for_status()
+        for line in response.iter_lines(chunk_size=None):  # as each chunk arrives
+            if cancel is not None and cancel.is_set():
+                raise ParseCancelled()
+            if not line:
+                continue
+            data = json.loads(line)
+            if data.get('error'):
+                raise RuntimeError(f"Ollama: {data['error']}")
+            if data.get('response'):
+                call.first_token()
+                pieces.append(data['response'])
+                if on_piece is not None:
+                    on_piece(data['response'])
+            if data.get('done'):
+                call.tokens(prompt=data.get('prompt_eval_count'), completion=data.get('eval_count'))
+    finally:
+        if in_flight is not None:
+            in_flight.discard(response)
+        response.close()
+    return ''.join(pieces)
+
+
+def _parse_chunk(session, index, chunk, parse_description, model, cache_dir, base_url, on_piece, cancel, in_flight):
+    import requests
+
+    prompt = PARSE_TEMPLATE.format(dom_content=chunk, parse_description=parse_description)
+    path = _cache_path(cache_dir, model, prompt) if cache_dir else None
+    with usage.call(model, 'ollama', parse_description, chunk=index, prompt_chars=len(prompt)) as call:
+        try:
+            if cancel.is_set():
+                raise ParseCancelled()
+            if path and os.path.exists(path):
+                call.hit()
+                with open(path, 'r', encoding='utf-8') as f:
+                    return f.read()
+            for attempt in range(OLLAMA_RETRIES + 1):
+                try:
+                    answer = _ollama_generate(session, prompt, model, call, base_url, on_piece, cancel, in_flight)
+                    break
+                except (requests.ConnectionError, requests.Timeout):
+                    # Once tokens have been shown, a retry would repeat them
+                    if attempt == OLLAMA_RETRIES or call.ttft is not None or cancel.is_set():
+                        raise
+                    call.retry()
+                    cancel.wait(2 ** attempt)
+        except ParseCancelled:
+            call.cancel()
+            raise
+        except Exception as e:
+            if cancel.is_set():
+                call.cancel()
+                raise ParseCancelled() from e  # the read was cut off by close_all()
+            raise
+        if path:
+            os.makedirs(cache_dir, exist_ok=True)
+            with open(f"{path}.tmp", 'w', encoding='utf-8') as f:
+                f.write(answer)
+            os.replace(f"{path}.tmp", path)
+        return answer
+
+
+def stream_parse_with_ollama(dom_chunks, parse_description, model=OLLAMA_MODEL, cache_dir=LLM_CACHE_DIR,
+                             base_url=OLLAMA_URL, workers=OLLAMA_WORKERS, cancel=None, heartbeat=None):
+    """Parse the chunks concurrently, yielding ChunkEvent(index, text, done) as the model produces tokens.
+
+    Pieces of a chunk's answer arrive as ``done=False`` events; the final event
+    of each chunk has ``done=True`` and the whole answer (cache hits only send
+    that one). Chunks are numbered from 1 and interleave, up to ``workers`` at
+    a time. With ``heartbeat`` set, None is yielded after that many idle
+    seconds, so a UI loop can redraw while chunks wait for their first token.
+
+    Setting ``cancel`` (a threading.Event), or closing the generator early,
+    stops queued chunks and closes the responses still streaming; the
+    generator then raises ParseCancelled. A failed chunk cancels the rest and
+    its error is raised. Each chunk is one accounted call in `llm_usage.usage`.
+    """
+    import queue
+    import requests
+    from concurrent.futures import ThreadPoolExecutor
+
+    cancel = cancel or threading.Event()
+    in_flight = _InFlight()
+    events = queue.Queue()
+    local = threading.local()
+
+    def work(index, chunk):
+        if not hasattr(local, 'session'):
+            local.session = requests.Session()
+        try:
+            answer = _parse_chunk(local.session, index, chunk, parse_description, model, cache_dir, base_url,
+                                  lambda piece: events.put(ChunkEvent(index, piece, False)), cancel, in_flight)
+        except BaseException as e:
+            events.put(e)
+        else:
+            events.put(ChunkEvent(index, answer, True))
+
+    remaining = len(dom_chunks)
+    pool = ThreadPoolExecutor(max_workers=max(1, min(workers, remaining or 1)))
+    try:
+        for index, chunk in enumerate(dom_chunks, start=1):
+            pool.submit(work, index, chunk)
+        while remaining:
+            try:
+                event = events.get(timeout=heartbeat or CANCEL_POLL)
+            except queue.Empty:
+                if cancel.is_set():
+                    raise ParseCancelled()
+                if heartbeat:
+                    yield None
+                continue
+            if isinstance(event, BaseException):
+                raise event
+            if event.done:
+                remaining -= 1
+            yield event
+    finally:
+        if remaining:
+            cancel.set()
+            in_flight.close_all()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def parse_with_ollama(dom_chunks, parse_description, **options):
+    """Ask the local Ollama model to pull `parse_description` out of each chunk; returns the answers joined.
+
+    Options are those of `stream_parse_with_ollama`. Answers are cached under
+    ``cache_dir`` by model and prompt, so re-parsing the same page with the
+    same description costs nothing (``cache_dir=None`` disables it).
+    """
+    answers = {}
+    for event in stream_parse_with_ollama(dom_chunks, parse_description, **options):
+        if event.done:
+            answers[event.index] = event.text
+            print(f"Parsed batch {len(answers)} of {len(dom_chunks)}")
+    return "\n".join(answers[i] for i in range(1, len(dom_chunks) + 1))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parse the approved agents OCR text into SQL")
+    parser.add_argument('ocr_file', nargs='?', default='/Users/rafsun/Documents/Antigravity/M-hub1/agents_ocr.txt')
+    parser.add_argument('--out', default='/Users/rafsun/Documents/Antigravity/M-hub1/insert_agents.sql')
+    parser.add_argument('--page-aware', action='store_true', help="Parse pages in parallel and stitch entries across page breaks")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes for --page-aware (default: all cores)")
+    parser.add_argument('--format', choices=['upsert', 'copy'], default='upsert', help="Batched upserts or a psql COPY script")
+    parser.add_argument('--batch-size', type=int, default=100)
+    parser.add_argument('--dsn', default=os.environ.get('DATABASE_URL'), help="Postgres DSN for --load (default: $DATABASE_URL)")
+    parser.add_argument('--load', action='store_true', help="Apply directly to the database instead of writing a file")
+    parser.add_argument('--profile', action='store_true', help="Write cProfile/tracemalloc reports to reports/profiles/ (or set ENABLE_PROFILING=1)")
+    args = parser.parse_args(argv)
+
+    with profile_run('parse_agents', enabled=profiling_enabled(args.profile)):
+        data = parse_agents(args.ocr_file, page_aware=args.page_aware, workers=args.workers)
     if data:
         print(f"Parsed {len(data)} agents.")
-        sql_script = generate_sql(data)
-        with open('/Users/rafsun/Documents/Antigravity/M-hub1/insert_agents.sql', 'w') as f:
-            f.write(sql_script)
-        print("SQL script generated: insert_agents.sql")
+        if args.load:
+            if not args.dsn:
+                parser.error("--load needs --dsn or DATABASE_URL")
+            loaded = load_agents(data, args.dsn, batch_size=args.batch_size)
+            print(f"Upserted {loaded} agents into public.manning_agents")
+        else:
+            with open(args.out, 'w') as f:
+                write_sql(data, f, batch_size=args.batch_size, fmt=args.format)
+            print("SQL script generated: insert_agents.sql")
+
+
+if __name__ == "__main__":
+    main()
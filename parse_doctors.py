@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+Parse the Authorized Doctors List PDF into MedicalCenter records.
+
+Pages are extracted in parallel and cached by page hash (doctors_pdf.py), so
+re-runs only re-read pages that changed. Outputs:
+
+- SQL: batched upserts into public.medical_centers keyed on
+  (approval_number, specialty), or applied directly with --load
+- TS:  components/doctorsData.ts (AUTHORIZED_DOCTORS: MedicalCenter[])
+- JSON: the records plus every phone / email found
+
+Usage:
+    python parse_doctors.py ["Authorized Doctors List.pdf"] [--ts components/doctorsData.ts]
+        [--sql insert_doctors.sql | --load --dsn ...] [--json doctors.json] [--workers N]
+"""
+
+import os
+import re
+import json
+import argparse
+
+from doctors_pdf import CACHE_DIR, read_entries
+from generate_agents_ts import write_if_changed, _escape
+from parse import _sql_literal
+from profiling import profile_run, profiling_enabled
+
+DEFAULT_PDF = "Authorized Doctors List.pdf"
+DEFAULT_TS = os.path.join("components", "doctorsData.ts")
+
+# Govt. registration numbers: "A-13508", "A 55144", "A- 35191"
+APPROVAL_PATTERN = re.compile(r'\bA\s*-?\s*(\d{4,6})\b')
+EMAIL_PATTERN = re.compile(r'[\w.+-]+@[\w-]+(?:\.[\w-]+)+')
+WEBSITE_PATTERN = re.compile(r'\b(?:https?://)?www\.[\w.-]+\w(?:/\S*)?', re.IGNORECASE)
+PHONE_PATTERN = re.compile(r'(?<![\w/])0\d[\d-]{5,12}\d\b|(?<![\w/-])\d{7}\b')
+MOBILE_PATTERN = re.compile(r'^01\d{9}$')
+EYE_PATTERN = re.compile(r'\(\s*Eye\s+(?:Specialist|Consultants?)\s*\)', re.IGNORECASE)
+
+CENTER_WORDS = re.compile(
+    r'\b(Hospitals?|Diagnostics?|Medical|Health|Clinic|Cent(?:er|re)|Pathology|Pharmacy|Care|College|'
+    r'Ltd\.?|Limited|Services)\b', re.IGNORECASE)
+STREET_WORDS = re.compile(r'^(Road|Avenue|Lane|Street|Circle|Tower|Housing|Society|Chamber(?!:)|Palaza|Plaza|Market|Thana)\b')
+# Job titles and degrees: neither the chamber nor its address
+TITLE_PARTS = re.compile(
+    r'^(Medical (Officer|Director)|Associate Professor|Professor|Instructor|Father|Mother|'
+    r'MBBS|M\.B\.B\.S|BCS|CMU|DFM|D-CARD|C\.C\.D|F\.C\.P\.S|\(F\.P\)|MPH)', re.IGNORECASE)
+CHAMBER_PREFIX = re.compile(r'^\(?Chamber:\s*')
+PART_PREFIXES = re.compile(r'^(?:C/[oO]\.?|[a-z]\))\s*')
+# A wrapped line continues the previous one (no comma) when it ends like this
+CONTINUES = re.compile(r'(,|-|&|\band|\bof|\bthe|\bNo\.?|\bNew|\b[A-Z]\.)$')
+# Further chambers listed after the contact columns: "b) Epic Diagnostic Centre, ..."
+MORE_CHAMBERS = re.compile(r'(?:^|\s)[b-z]\)\s')
+NAME_TAIL_WORDS = re.compile(r'^(Chamber|Hospitals?|Diagnostics?|Pathology|Clinic|Cent(?:er|re))\b')
+
+CITY_PATTERNS = [
+    ('Dhaka', re.compile(r'\bDhaka\b', re.IGNORECASE)),
+    ('Chittagong', re.compile(r'\b(Chittagong|Chattogram|Chattagram|Chiattagong)\b', re.IGNORECASE)),
+    ('Khulna', re.compile(r'\bKhulna\b', re.IGNORECASE)),
+]
+ID_PREFIXES = {'Dhaka': 'dhk', 'Chittagong': 'ctg', 'Khulna': 'khl'}
+
+DOCTOR_COLUMNS = ('approval_number', 'specialty', 'name', 'center_name', 'address', 'phone', 'email',
+                  'website', 'city', 'is_center')
+
+SCHEMA_SQL = """
+-- Create medical centers table
+CREATE TABLE IF NOT EXISTS public.medical_centers (
+    id uuid DEFAULT gen_random_uuid() PRIMARY KEY,
+    approval_number text NOT NULL,
+    specialty text NOT NULL DEFAULT 'General',
+    name text NOT NULL,
+    center_name text,
+    address text,
+    phone text,
+    email text,
+    website text,
+    city text,
+    is_center boolean NOT NULL DEFAULT false,
+    created_at timestamp with time zone DEFAULT timezone('utc'::text, now()) NOT NULL
+);
+
+-- A doctor can be listed once per specialty (general and eye lists)
+CREATE UNIQUE INDEX IF NOT EXISTS medical_centers_approval_specialty_key
+    ON public.medical_centers (approval_number, specialty);
+
+-- Enable RLS
+ALTER TABLE public.medical_centers ENABLE ROW LEVEL SECURITY;
+
+-- Allow public read access
+DROP POLICY IF EXISTS "Allow public read access" ON public.medical_centers;
+CREATE POLICY "Allow public read access" ON public.medical_centers FOR SELECT USING (true);
+"""
+
+UPSERT_CONFLICT_SQL = (
+    "ON CONFLICT (approval_number, specialty) DO UPDATE SET "
+    + ", ".join(f"{c} = EXCLUDED.{c}" for c in DOCTOR_COLUMNS[2:])
+)
+
+
+def _join_lines(lines):
+    """Re-join wrapped lines into one comma-separated string."""
+    text, last = '', ''
+    for line in lines:
+        if not text:
+            text = line
+        elif text.endswith('-'):
+            text += line
+        elif (CONTINUES.search(text) or line[:1].islower() or last.count('(') > last.count(')')
+              or CENTER_WORDS.match(line) or STREET_WORDS.match(line)):
+            text += ' ' + line
+        else:
+            text += ', ' + line
+        last = line
+    return text
+
+
+def _clean_part(part):
+    part = PART_PREFIXES.sub('', part.strip()).strip(' ;')
+    if part.startswith('(') and ')' not in part:
+        part = part[1:]
+    if part.endswith(')') and part.count(')') > part.count('('):
+        part = part[:-1]
+    if part.endswith('.') and not re.search(r'\b(Ltd|Pvt|Co)\.$', part):
+        part = part[:-1]
+    return re.sub(r'\s+', ' ', part).strip()
+
+
+def _parts(lines):
+    """Cleaned comma parts of some wrapped lines, with their Chamber: flag."""
+    parts = []
+    for raw in _join_lines(lines).split(','):
+        chamber = bool(CHAMBER_PREFIX.match(raw.strip()))
+        part = _clean_part(CHAMBER_PREFIX.sub('', raw.strip()))
+        if part and not TITLE_PARTS.match(part):
+            parts.append((part, chamber))
+    return parts
+
+
+def _center_index(parts):
+    """Index of the chamber part: an explicit "Chamber:", else the first part that names an institution."""
+    for i, (part, chamber) in enumerate(parts):
+        if chamber:
+            return i
+    for i, (part, _) in enumerate(parts):
+        if (CENTER_WORDS.search(part) or part.startswith('M/S ')) and not re.match(r'^(House|Road|Flat|Plot)\b', part):
+            return i
+    return None
+
+
+def _split_contact(lines):
+    """Split an entry at its approval number: (name/address lines, approval number, contact text)."""
+    for i, line in enumerate(lines):
+        match = APPROVAL_PATTERN.search(line)
+        if match:
+            before = line[:match.start()].strip()
+            block = lines[:i] + ([before] if before else [])
+            contact = ' '.join([line[match.end():]] + lines[i + 1:])
+            return block, f"A-{match.group(1)}", contact
+    return lines, None, ''
+
+
+def _contacts(text):
+    """Phones, emails, websites and the leftover words (address text after the contact columns)."""
+    # An email broken across lines ("name@g" + "mail.com") is re-joined first
+    text = re.sub(r'(@[\w-]+)\s+([\w-]*\.[\w.]+)', r'\1\2', text)
+    emails = EMAIL_PATTERN.findall(text)
+    text = EMAIL_PATTERN.sub(' ', text)
+    websites = WEBSITE_PATTERN.findall(text)
+    text = WEBSITE_PATTERN.sub(' ', text)
+    phones = PHONE_PATTERN.findall(text)
+    text = PHONE_PATTERN.sub(' ', text)
+    rest = re.sub(r'(?:^|\s)-(?=\s|$)', ' ', text)
+    return phones, emails, websites, ' '.join(rest.split())
+
+
+def _city(address, fallback):
+    for city, pattern in CITY_PATTERNS:
+        if pattern.search(address):
+            return city
+    return fallback or 'Other'
+
+
+def _build_doctor(section_city, specialty, serial, lines):
+    """Build one MedicalCenter record from an entry's lines, or None if it has no approval number."""
+    block, approval, contact = _split_contact(lines)
+    if approval is None:
+        return None
+
+    text = '\n'.join(block)
+    if EYE_PATTERN.search(text):
+        specialty = 'Eye Specialist'
+        text = EYE_PATTERN.sub('', text)
+    block = [line.strip().lstrip(', ') for line in text.split('\n') if line.strip(' ,')]
+
+    # The first line is the doctor. Anything after a comma on it, or from the
+    # word before "Chamber" / "Pathology"... when it runs on, is the chamber.
+    first, _, rest_of_first = block[0].partition(',') if block else ('', '', '')
+    words = first.split()
+    tail = next((i for i, w in enumerate(words) if i >= 3 and NAME_TAIL_WORDS.match(w)), None)
+    if tail is not None:
+        rest_of_first = ' '.join(words[tail - 1:]) + (',' + rest_of_first if rest_of_first else '')
+        words = words[:tail - 1]
+    name = ' '.join(words)
+    if name[:2].lower() == 'dr' and name[2:3] in (' ', '.'):
+        name = 'Dr.' + name[2:].lstrip('.')
+    name = ' '.join(w.capitalize() if w.islower() else w for w in name.split())
+    body = ([rest_of_first.strip()] if rest_of_first.strip() else []) + block[1:]
+
+    contact, *more_chambers = MORE_CHAMBERS.split(contact)
+    phones, emails, websites, leftover = _contacts(contact)
+    parts = _parts(body + ([leftover] if leftover else []))
+    center_index = _center_index(parts)
+    center, address_parts = None, [p for p, _ in parts]
+    if center_index is not None:
+        center = parts[center_index][0]
+        address_parts = [p for p, _ in parts[center_index + 1:]]
+        # "Sumaiya Pharmacy 69/1": a trailing house number belongs to the address
+        match = re.match(r'^(.*[A-Za-z.)])\s+(\d[\w/-]*)$', center)
+        if match:
+            center, address_parts = match.group(1), [match.group(2)] + address_parts
+    for chamber in more_chambers:
+        extra = _parts([chamber])
+        index = _center_index(extra)
+        if index is not None:
+            center = f"{center} / {extra[index][0]}" if center else extra[index][0]
+
+    address = ', '.join(address_parts)
+    address = re.sub(r'(\w)-\s+(?=\w)', r'\1-', address)  # "Block- C"
+    address = re.sub(r'[.,]?\s*Bangladesh$', '', address)
+    address = re.sub(r'\s+', ' ', re.sub(r'\s*,\s*', ', ', address)).strip(' ,.')
+
+    city = _city(address or (center or ''), section_city)
+    mobile = next((p for p in phones if MOBILE_PATTERN.match(p)), None)
+    prefix = 'eye' if specialty == 'Eye Specialist' else ID_PREFIXES.get(section_city, 'oth')
+    return {
+        'id': f"{prefix}-{serial}",
+        'name': name,
+        'centerName': center,
+        'approvalNumber': approval,
+        'address': address,
+        'phone': mobile or (phones[0] if phones else ''),
+        'email': emails[0] if emails else None,
+        'website': websites[0] if websites else None,
+        'city': city,
+        'specialty': specialty,
+        'status': 'Approved',
+        'isCenter': center is not None,
+        'phones': phones,
+        'emails': emails,
+    }
+
+
+def parse_doctors(pdf_path=DEFAULT_PDF, workers=None, cache_dir=CACHE_DIR):
+    """Return (records, extraction stats) for the doctors PDF."""
+    return read_entries(pdf_path, workers=workers, build=_build_doctor, cache_dir=cache_dir)
+
+
+def to_ts_array(doctors):
+    lines = []
+    lines.append("// Auto-generated from the Department of Shipping Authorized Doctors List")
+    lines.append("// Source: Authorized Doctors List.pdf (python parse_doctors.py)")
+    lines.append("import { MedicalCenter } from '../types';")
+    lines.append("")
+    lines.append("export const AUTHORIZED_DOCTORS: MedicalCenter[] = [")
+    for d in doctors:
+        lines.append("  {")
+        lines.append(f"    id: '{d['id']}',")
+        lines.append(f"    name: '{_escape(d['name'])}',")
+        if d['centerName']:
+            lines.append(f"    centerName: '{_escape(d['centerName'])}',")
+        lines.append(f"    approvalNumber: '{d['approvalNumber']}',")
+        lines.append(f"    address: '{_escape(d['address'])}',")
+        lines.append(f"    phone: '{_escape(d['phone'])}',")
+        if d['email']:
+            lines.append(f"    email: '{_escape(d['email'])}',")
+        if d['website']:
+            lines.append(f"    website: '{_escape(d['website'])}',")
+        lines.append(f"    city: '{d['city']}',")
+        lines.append(f"    specialty: '{d['specialty']}',")
+        lines.append(f"    status: '{d['status']}',")
+        lines.append(f"    isCenter: {'true' if d['isCenter'] else 'false'},")
+        lines.append("  },")
+    lines.append("];")
+    lines.append("")
+    return '\n'.join(lines)
+
+
+def _doctor_row(d):
+    return (d['approvalNumber'], d['specialty'], d['name'], d['centerName'], d['address'], d['phone'],
+            d['email'], d['website'], d['city'], d['isCenter'])
+
+
+def _sql_value(value):
+    if value is None:
+        return 'NULL'
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return _sql_literal(value)
+
+
+def _batches(doctors, batch_size):
+    # Repeated (approval, specialty) keys inside a batch collapse to the last occurrence
+    batch = {}
+    for d in doctors:
+        batch[d['approvalNumber'], d['specialty']] = _doctor_row(d)
+        if len(batch) >= batch_size:
+            yield list(batch.values())
+            batch = {}
+    if batch:
+        yield list(batch.values())
+
+
+def write_sql(doctors, out, batch_size=100, include_schema=True):
+    """Stream doctors to ``out`` as batched upserts. Returns the number of rows written."""
+    if include_schema:
+        out.write(SCHEMA_SQL)
+        out.write("\n")
+    columns = ", ".join(DOCTOR_COLUMNS)
+    count = 0
+    for batch in _batches(doctors, batch_size):
+        out.write(f"INSERT INTO public.medical_centers ({columns}) VALUES\n")
+        out.write(",\n".join("(" + ", ".join(_sql_value(v) for v in row) + ")" for row in batch))
+        out.write(f"\n{UPSERT_CONFLICT_SQL};\n\n")
+        count += len(batch)
+    return count
+
+
+def load_doctors(doctors, dsn, batch_size=500):
+    """Upsert doctors directly into Postgres in one transaction (needs psycopg 3)."""
+    try:
+        import psycopg
+    except ImportError:
+        raise RuntimeError('Direct load needs psycopg: pip install "psycopg[binary]"')
+
+    columns = ", ".join(DOCTOR_COLUMNS)
+    placeholders = ", ".join(["%s"] * len(DOCTOR_COLUMNS))
+    count = 0
+    with psycopg.connect(dsn) as conn:
+        with conn.cursor() as cur:
+            cur.execute(SCHEMA_SQL)
+            for batch in _batches(doctors, batch_size):
+                cur.executemany(f"INSERT INTO public.medical_centers ({columns}) VALUES ({placeholders}) "
+                                f"{UPSERT_CONFLICT_SQL}", batch)
+                count += len(batch)
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parse the Authorized Doctors List PDF into SQL / TS / JSON")
+    parser.add_argument('pdf', nargs='?', default=DEFAULT_PDF)
+    parser.add_argument('--ts', default=DEFAULT_TS, help="TypeScript output (empty to skip)")
+    parser.add_argument('--sql', help="Write batched upserts into public.medical_centers here")
+    parser.add_argument('--json', help="Write the parsed records (with every phone / email) here")
+    parser.add_argument('--workers', type=int, default=None, help="Processes for page extraction (default: all cores)")
+    parser.add_argument('--cache-dir', default=CACHE_DIR, help="Per-page text cache (empty to disable)")
+    parser.add_argument('--batch-size', type=int, default=100)
+    parser.add_argument('--dsn', default=os.environ.get('DATABASE_URL'), help="Postgres DSN for --load (default: $DATABASE_URL)")
+    parser.add_argument('--load', action='store_true', help="Apply directly to the database")
+    parser.add_argument('--profile', action='store_true', help="Write cProfile/tracemalloc reports to reports/profiles/ (or set ENABLE_PROFILING=1)")
+    args = parser.parse_args(argv)
+
+    with profile_run('parse_doctors', enabled=profiling_enabled(args.profile)):
+        doctors, stats = parse_doctors(args.pdf, workers=args.workers, cache_dir=args.cache_dir or None)
+    print(f"Parsed {len(doctors)} doctors from {stats['pages']} pages "
+          f"({stats['cached']} cached, {stats.get('text', 0)} text layer, {stats.get('ocr', 0)} OCR)")
+
+    if args.ts:
+        print(f"{args.ts} {'written' if write_if_changed(args.ts, to_ts_array(doctors)) else 'unchanged'}")
+    if args.json:
+        write_if_changed(args.json, json.dumps(doctors, indent=2, ensure_ascii=False) + "\n")
+        print(f"Written to {args.json}")
+    if args.sql:
+        with open(args.sql, 'w', encoding='utf-8') as f:
+            write_sql(doctors, f, batch_size=args.batch_size)
+        print(f"SQL script generated: {args.sql}")
+    if args.load:
+        if not args.dsn:
+            parser.error("--load needs --dsn or DATABASE_URL")
+        print(f"Upserted {load_doctors(doctors, args.dsn, batch_size=args.batch_size)} doctors into public.medical_centers")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+On-demand profiling for the scrapers and parsers.
+
+Off by default. Enable with ``--profile`` on the command line or by setting
+``ENABLE_PROFILING=1``; the wrapped run is then profiled with cProfile, a stack
+sampler and tracemalloc, and the reports land in ``reports/profiles/``:
+
+    <name>-<stamp>.prof        cProfile stats (snakeviz, pstats)
+    <name>-<stamp>.collapsed   sampled stacks for flamegraph.pl / speedscope
+    <name>-<stamp>-cpu.txt     top-N functions by cumulative time
+    <name>-<stamp>-memory.txt  top-N allocation sites at peak and at exit
+
+Usage:
+    from profiling import profile_run
+
+    with profile_run('parse_agents'):
+        parse_agents(path)
+
+Worker processes (``--page-aware`` parsing) are not profiled; the report covers
+the parent process only.
+"""
+
+import os
+import sys
+import time
+import pstats
+import cProfile
+import threading
+import tracemalloc
+from io import StringIO
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+
+# Constants
+PROFILE_ENV = "ENABLE_PROFILING"
+PROFILES_DIR = os.environ.get("PROFILE_DIR", os.path.join("reports", "profiles"))
+PROFILE_TOP_N = int(os.environ.get("PROFILE_TOP_N", "25"))
+SAMPLE_INTERVAL = float(os.environ.get("PROFILE_INTERVAL", "0.005"))  # seconds between stack samples
+TRACE_FRAMES = 16
+SNAPSHOT_MIN_GAP = 1.0  # seconds between peak-memory snapshots
+_THIS_FILE = f"({os.path.basename(__file__)}:"
+
+
+def profiling_enabled(flag=False):
+    """True if the flag is set, ``--profile`` was passed, or ENABLE_PROFILING is truthy."""
+    if flag or '--profile' in sys.argv[1:]:
+        return True
+    return os.environ.get(PROFILE_ENV, '').strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(';', ':')
+
+
+class _Sampler(threading.Thread):
+    """Samples one thread's stack at a fixed interval and snapshots memory at new peaks."""
+
+    def __init__(self, thread_id, interval):
+        super().__init__(name="profile-sampler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.peak_bytes = 0
+        self.peak_snapshot = None
+        self._last_snapshot = 0.0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            if stack and not any(_THIS_FILE in label for label in stack):
+                self.stacks[';'.join(reversed(stack))] += 1
+
+            current, _ = tracemalloc.get_traced_memory()
+            now = time.monotonic()
+            if current > self.peak_bytes * 1.1 and now - self._last_snapshot >= SNAPSHOT_MIN_GAP:
+                self.peak_bytes = current
+                self.peak_snapshot = tracemalloc.take_snapshot()
+                self._last_snapshot = now
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def _top_allocations(snapshot, top_n):
+    snapshot = snapshot.filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    ))
+    lines = []
+    for i, stat in enumerate(snapshot.statistics('traceback')[:top_n], 1):
+        frames = list(reversed(stat.traceback))  # allocation site first
+        lines.append(f"#{i}: {stat.size / 1024:.1f} KiB in {stat.count} blocks  {frames[0].filename}:{frames[0].lineno}")
+        for frame in frames[1:4]:
+            lines.append(f"    called from {frame.filename}:{frame.lineno}")
+    return lines
+
+
+def write_reports(name, profiler, sampler, final_snapshot, peak, wall_s, out_dir=PROFILES_DIR, top_n=PROFILE_TOP_N):
+    """Write the four report files and return their paths."""
+    os.makedirs(out_dir, exist_ok=True)
+    base = os.path.join(out_dir, f"{name}-{datetime.utcnow().strftime('%Y-%m-%d_%H-%M-%S')}")
+    paths = {
+        'prof': f"{base}.prof",
+        'collapsed': f"{base}.collapsed",
+        'cpu': f"{base}-cpu.txt",
+        'memory': f"{base}-memory.txt",
+    }
+
+    profiler.dump_stats(paths['prof'])
+
+    with open(paths['collapsed'], 'w', encoding='utf-8') as f:
+        for stack, count in sorted(sampler.stacks.items()):
+            f.write(f"{stack} {count}\n")
+
+    buffer = StringIO()
+    stats = pstats.Stats(profiler, stream=buffer)
+    stats.sort_stats('cumulative').print_stats(top_n)
+    with open(paths['cpu'], 'w', encoding='utf-8') as f:
+        f.write(f"{name}: {wall_s:.3f}s wall, {sum(sampler.stacks.values())} stack samples\n")
+        f.write(buffer.getvalue())
+
+    with open(paths['memory'], 'w', encoding='utf-8') as f:
+        f.write(f"{name}: peak traced memory {peak / 1024 / 1024:.2f} MiB\n")
+        if sampler.peak_snapshot is not None:
+            f.write(f"\nTop {top_n} allocation sites near peak ({sampler.peak_bytes / 1024 / 1024:.2f} MiB live):\n")
+            f.write("\n".join(_top_allocations(sampler.peak_snapshot, top_n)) + "\n")
+        f.write(f"\nTop {top_n} allocation sites still live at exit:\n")
+        f.write("\n".join(_top_allocations(final_snapshot, top_n)) + "\n")
+
+    return paths
+
+
+@contextmanager
+def profile_run(name, enabled=None, out_dir=PROFILES_DIR, top_n=PROFILE_TOP_N, interval=SAMPLE_INTERVAL):
+    """Profile the enclosed block when profiling is enabled; otherwise a no-op."""
+    if enabled is None:
+        enabled = profiling_enabled()
+    if not enabled:
+        yield
+        return
+
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start(TRACE_FRAMES)
+    sampler = _Sampler(threading.get_ident(), interval)
+    profiler = cProfile.Profile()
+    t0 = time.perf_counter()
+    sampler.start()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        wall_s = time.perf_counter() - t0
+        sampler.stop()
+        _, peak = tracemalloc.get_traced_memory()
+        final_snapshot = tracemalloc.take_snapshot()
+        if started_tracing:
+            tracemalloc.stop()
+        paths = write_reports(name, profiler, sampler, final_snapshot, peak, wall_s, out_dir, top_n)
+        print(f"🔬 Profile written to {paths['prof']} (+ .collapsed, -cpu.txt, -memory.txt)")
+
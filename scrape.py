@@ -1,14 +1,16 @@
-import selenium.webdriver as webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver import Remote
-from selenium.webdriver.chromium.remote_connection import ChromiumRemoteConnection as Connection
 from os import environ
-from bs4 import BeautifulSoup
+
+# selenium and bs4 are imported inside the functions that use them, so
+# importing this module (e.g. from main.py) stays cheap
 
 AUTH = environ.get('AUTH', default='brd-customer-hl_37ebd5f9-zone-ai_scraper:t7l779xs39fd')
 SBR_WEBDRIVER = f'https://{AUTH}@brd.superproxy.io:9515'
 
 def scrape_website(website):
+    from selenium.webdriver import Remote
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chromium.remote_connection import ChromiumRemoteConnection as Connection
+
     print("Launching chrome browser...")
 
     connection = Connection(SBR_WEBDRIVER, 'goog', 'chrome')
@@ -28,6 +30,7 @@ def scrape_website(website):
         driver.quit()
 
 def extract_body_content(html_content):
+    from bs4 import BeautifulSoup
     soup = BeautifulSoup(html_content, 'html.parser')
     body_content = soup.body
     if body_content:
@@ -35,6 +38,7 @@ def extract_body_content(html_content):
     return ""
 
 def clean_body_content(body_content):
+    from bs4 import BeautifulSoup
     soup = BeautifulSoup(body_content, 'html.parser')
 
     for script_or_style in soup(['script', 'style']):
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Gemini Model Benchmark for the Job Parser
+Replays a fixed corpus of archived job postings against each candidate model
+and ranks the models by accuracy, reliability and speed.
+"""
+
+import os
+import re
+import sys
+import json
+import glob
+import time
+import argparse
+from datetime import datetime
+
+import requests
+
+# Token/cost accounting lives at the repository root
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+import llm_usage
+from check_gemini_models import PRIMARY_MODEL, FALLBACK_MODELS, load_cached_catalog
+from job_sinks import read_jobs
+from run_metrics import percentile
+
+# Constants
+API_BASE_URL = "https://generativelanguage.googleapis.com"
+JOBS_DIR = "jobs"
+REPORTS_DIR = "reports"
+SCORED_FIELDS = ['rank', 'salary', 'joining_date']  # read off the posting card
+# Not on a MariAid card: a model that fills these in has made them up
+ABSENT_FIELDS = ['agency', 'mla_number', 'mobile', 'email']
+
+# Same prompt as supabase/functions/_shared/gemini-parser.ts
+PROMPT_TEMPLATE = '''You are an expert at parsing maritime job postings from Telegram/WhatsApp groups into the SHIPPED format.
+
+Extract the following 8 required fields from this job posting text:
+
+1. RANK - The position/role on vessel (e.g., Chief Engineer, Master, 2nd Officer, Able Seaman)
+2. SALARY - Compensation details with currency (e.g., $8000-$9000, USD 5000/month)
+3. JOINING_DATE - Start date or embarkation date (e.g., 15 March 2026, Urgent, ASAP, mid-June)
+4. AGENCY - Recruiting agency or company name
+5. MLA_NUMBER - Manning License Agreement number or reference number (e.g., MLA/2024/12345)
+6. ADDRESS - Agency physical address (street, city, country)
+7. MOBILE - Agency contact phone number with country code (e.g., +65-1234-5678)
+8. EMAIL - Agency email address
+
+Job Posting Text:
+"""
+{text}
+"""
+
+IMPORTANT RULES:
+- Extract EXACTLY what is in the text, don't invent information
+- If a field is clearly missing, return "N/A" for that field
+- For RANK: Look for position titles, officer ranks, ratings
+- For SALARY: Include currency symbol and range if provided
+- For JOINING_DATE: Keep original format (Urgent, ASAP, dates, etc.)
+- For MLA_NUMBER: Look for "MLA", "License", "Ref", "Reference" numbers
+- For ADDRESS: Full physical location of the agency
+- For MOBILE: Phone numbers with + or country codes
+- For EMAIL: Email addresses only (not phone numbers)
+- Preserve all phone number formats exactly as written
+
+Return ONLY a valid JSON object with these exact keys: rank, salary, joining_date, agency, mla_number, address, mobile, email
+
+JSON Response:'''
+
+
+def build_corpus(jobs_dir=JOBS_DIR, limit=20):
+    """Collect unique single-posting texts from the archived snapshots.
+
+    Only per-card postings ("TITLE - Ship | Deadline: ... | Salary: ...")
+    are used, since their expected fields can be read off the text. The
+    corpus is sorted so every run replays the same postings.
+    """
+    seen = {}
+    for path in sorted(glob.glob(os.path.join(jobs_dir, "jobs_[0-9]*.*json"))):
+        for job in read_jobs(path):
+            text = job.get('raw_text') or job.get('raw_content') or ''
+            text = re.sub(r'\s+', ' ', text).replace(' | View Details | Apply Now', '').strip()
+            if 'Deadline:' not in text or text.count('Deadline:') != 1:
+                continue
+            seen.setdefault(text, job.get('title', ''))
+
+    corpus = []
+    for text, title in sorted(seen.items()):
+        salary = re.search(r'Salary:\s*([^|]+)', text)
+        deadline = re.search(r'Deadline:\s*([^|]+)', text)
+        corpus.append({
+            'text': text,
+            'expected': {
+                'rank': title.split(' - ', 1)[0].strip(),
+                'salary': salary.group(1).strip() if salary else 'N/A',
+                'joining_date': deadline.group(1).strip() if deadline else 'N/A',
+            },
+        })
+    return corpus[:limit]
+
+
+def _norm(value):
+    return re.sub(r'[^a-z0-9$]', '', str(value or 'N/A').lower())
+
+
+def score_fields(expected, actual):
+    """Return {field: bool} for the scored fields (containment match)."""
+    result = {}
+    for field in SCORED_FIELDS:
+        want, got = _norm(expected.get(field)), _norm(actual.get(field))
+        result[field] = bool(got) and (want == got or (want != 'na' and (want in got or got in want)))
+    return result
+
+
+def invented_fields(actual):
+    """Fields absent from every card that the model filled in anyway."""
+    return [field for field in ABSENT_FIELDS if _norm(actual.get(field)) not in ('na', '')]
+
+
+def call_model(session, base_url, api_key, model, text, timeout=60):
+    """Run one generateContent call. Returns (parsed_json, usage, latency_s)."""
+    url = f"{base_url}/v1beta/{model}:generateContent"
+    body = {
+        'contents': [{'parts': [{'text': PROMPT_TEMPLATE.format(text=text)}]}],
+        'generationConfig': {
+            'temperature': 0.1,
+            'topK': 1,
+            'topP': 0.95,
+            'maxOutputTokens': 1024,
+            'responseMimeType': 'application/json',
+        },
+    }
+    with llm_usage.usage.call(model, 'gemini', 'job-parser benchmark') as call:
+        started = time.perf_counter()
+        response = session.post(url, params={'key': api_key}, json=body, timeout=timeout)
+        latency = time.perf_counter() - started
+        response.raise_for_status()
+        data = response.json()
+        usage = data.get('usageMetadata', {})
+        call.tokens(prompt=usage.get('promptTokenCount'), completion=usage.get('candidatesTokenCount'),
+                    cached=usage.get('cachedContentTokenCount'))
+        answer = data['candidates'][0]['content']['parts'][0]['text']
+        return json.loads(answer), usage, latency
+
+
+def benchmark_model(session, base_url, api_key, model, corpus, timeout=60):
+    latencies, tokens_per_sec, errors = [], [], []
+    prompt_tokens = completion_tokens = invented = 0
+    field_hits = {f: 0 for f in SCORED_FIELDS}
+
+    for item in corpus:
+        try:
+            parsed, usage, latency = call_model(session, base_url, api_key, model, item['text'], timeout)
+        except Exception as e:
+            errors.append(f"{type(e).__name__}: {e}"[:200])
+            continue
+        latencies.append(latency)
+        output_tokens = usage.get('candidatesTokenCount') or 0
+        prompt_tokens += usage.get('promptTokenCount') or 0
+        completion_tokens += output_tokens
+        if latency > 0 and output_tokens:
+            tokens_per_sec.append(output_tokens / latency)
+        for field, ok in score_fields(item['expected'], parsed).items():
+            field_hits[field] += ok
+        invented += bool(invented_fields(parsed))
+
+    calls = len(corpus)
+    ok_calls = len(latencies)
+    field_accuracy = {f: round(hits / calls, 4) if calls else 0.0 for f, hits in field_hits.items()}
+    price = llm_usage.usage.prices.get(llm_usage._model_key(model))
+    return {
+        'model': model,
+        'calls': calls,
+        'errors': len(errors),
+        'error_rate': round(len(errors) / calls, 4) if calls else 1.0,
+        'p50_latency_ms': round(percentile(latencies, 50) * 1000, 1) if ok_calls else None,
+        'p95_latency_ms': round(percentile(latencies, 95) * 1000, 1) if ok_calls else None,
+        'tokens_per_second': round(sum(tokens_per_sec) / len(tokens_per_sec), 1) if tokens_per_sec else None,
+        'prompt_tokens': prompt_tokens,
+        'completion_tokens': completion_tokens,
+        'cost_usd': round((prompt_tokens * price[0] + completion_tokens * price[1]) / 1_000_000, 6) if price else None,
+        'accuracy': round(sum(field_accuracy.values()) / len(field_accuracy), 4),
+        'invented_rate': round(invented / ok_calls, 4) if ok_calls else None,
+        'field_accuracy': field_accuracy,
+        'sample_errors': errors[:3],
+    }
+
+
+def rank_results(results):
+    """Most accurate first, then fewest invented fields, fewest errors, lowest p95 latency."""
+    return sorted(results, key=lambda r: (
+        -r['accuracy'],
+        r['invented_rate'] if r['invented_rate'] is not None else float('inf'),
+        r['error_rate'],
+        r['p95_latency_ms'] if r['p95_latency_ms'] is not None else float('inf'),
+    ))
+
+
+def to_markdown(report):
+    lines = [
+        "### 🏁 Model Benchmark",
+        "",
+        f"Corpus: {report['corpus_size']} archived postings · {report['timestamp']}",
+        "",
+        "| # | Model | Accuracy | Invented | Error rate | p50 (ms) | p95 (ms) | Tokens/s | Cost (USD) |",
+        "|---|-------|----------|----------|------------|----------|----------|----------|------------|",
+    ]
+    for i, r in enumerate(report['ranking'], 1):
+        lines.append(
+            f"| {i} | `{r['model']}` | {r['accuracy']:.0%} | "
+            f"{format(r['invented_rate'], '.0%') if r['invented_rate'] is not None else '-'} | {r['error_rate']:.0%} | "
+            f"{r['p50_latency_ms'] if r['p50_latency_ms'] is not None else '-'} | "
+            f"{r['p95_latency_ms'] if r['p95_latency_ms'] is not None else '-'} | "
+            f"{r['tokens_per_second'] if r['tokens_per_second'] is not None else '-'} | "
+            f"{format(r['cost_usd'], '.4f') if r.get('cost_usd') is not None else '-'} |"
+        )
+    lines += ["", f"**Recommended model:** `{report['recommended_model']}`" if report['recommended_model']
+              else "**Recommended model:** none (all candidates failed)"]
+    return "\n".join(lines) + "\n"
+
+
+def candidate_models():
+    """Primary + fallbacks, minus models the cached catalog says don't exist."""
+    candidates = [PRIMARY_MODEL] + FALLBACK_MODELS
+    catalog = load_cached_catalog()
+    if catalog:
+        candidates = [m for m in candidates if m in catalog['models']]
+    return candidates
+
+
+def run_benchmark(models, base_url=API_BASE_URL, api_key='', limit=20, reports_dir=REPORTS_DIR, timeout=60,
+                  jobs_dir=JOBS_DIR):
+    corpus = build_corpus(jobs_dir, limit=limit)
+    print(f"📚 Corpus: {len(corpus)} archived postings")
+
+    llm_usage.usage.reset('model-bench')
+    session = requests.Session()
+    results = []
+    for model in models:
+        print(f"⏱️  Benchmarking {model}...")
+        result = benchmark_model(session, base_url, api_key, model, corpus, timeout)
+        print(f"   accuracy {result['accuracy']:.0%}, errors {result['error_rate']:.0%}, "
+              f"p50 {result['p50_latency_ms']} ms, p95 {result['p95_latency_ms']} ms")
+        results.append(result)
+
+    ranking = rank_results(results)
+    usable = [r for r in ranking if r['error_rate'] < 1.0]
+    report = {
+        'timestamp': datetime.utcnow().isoformat(),
+        'corpus_size': len(corpus),
+        'ranking': ranking,
+        'recommended_model': usable[0]['model'] if usable else None,
+    }
+
+    os.makedirs(reports_dir, exist_ok=True)
+    dated = os.path.join(reports_dir, f"gemini-model-bench-{datetime.utcnow().strftime('%Y-%m-%d')}.json")
+    for path in (dated, os.path.join(reports_dir, "latest-model-bench.json")):
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2)
+    with open(os.path.join(reports_dir, "latest-model-bench.md"), 'w') as f:
+        f.write(to_markdown(report))
+    print(f"\n📁 Report saved to: {dated}")
+    llm_usage.usage.write(reports_dir)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Gemini models on archived job postings")
+    parser.add_argument('--models', nargs='*', help="Models to benchmark (default: primary + available fallbacks)")
+    parser.add_argument('--limit', type=int, default=20, help="Number of postings to replay")
+    parser.add_argument('--base-url', default=os.environ.get("GEMINI_BASE_URL", API_BASE_URL),
+                        help="API base URL (point at scripts/gemini_stub_server.py for offline runs)")
+    parser.add_argument('--timeout', type=float, default=60)
+    args = parser.parse_args(argv)
+
+    api_key = os.environ.get("GEMINI_API_KEY", "")
+    if not api_key and args.base_url == API_BASE_URL:
+        print("❌ Error: GEMINI_API_KEY not found in environment.")
+        sys.exit(1)
+
+    report = run_benchmark(args.models or candidate_models(), base_url=args.base_url,
+                           api_key=api_key, limit=args.limit, timeout=args.timeout)
+    sys.exit(0 if report['recommended_model'] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,8 +8,10 @@ Provides recommendations for alternative models.
 import os
 import sys
 import json
+import time
+import argparse
 from datetime import datetime
-from google import genai
+from concurrent.futures import ThreadPoolExecutor, wait
 
 # Configuration
 PRIMARY_MODEL = "models/gemini-2.5-flash"
@@ -20,36 +22,132 @@ FALLBACK_MODELS = [
     "models/gemini-pro"
 ]
 
+# Model catalog cache (models.list result), reused while fresh
+CATALOG_CACHE_FILE = os.path.join("reports", "model-catalog.json")
+CATALOG_TTL_SECONDS = int(os.environ.get("MODEL_CATALOG_TTL", 6 * 3600))
+PROBE_TIMEOUT_SECONDS = float(os.environ.get("MODEL_PROBE_TIMEOUT", 10))
+
+
+def create_client(api_key, timeout=PROBE_TIMEOUT_SECONDS):
+    """Create a genai client whose HTTP calls time out after `timeout` seconds."""
+    from google import genai
+    return genai.Client(api_key=api_key, http_options={'timeout': int(timeout * 1000)})
+
+
 def get_model_info(client, model_name):
-    """Get detailed information about a specific model."""
+    """Get detailed information about a specific model (raises on API errors)."""
+    model = client.models.get(model=model_name)
+    return {
+        "name": model.name,
+        "display_name": getattr(model, 'display_name', None) or 'N/A',
+        "description": getattr(model, 'description', None) or 'N/A',
+        "input_token_limit": getattr(model, 'input_token_limit', None) or 'N/A',
+        "output_token_limit": getattr(model, 'output_token_limit', None) or 'N/A',
+        "supported_generation_methods": getattr(model, 'supported_actions', None)
+            or getattr(model, 'supported_generation_methods', None) or []
+    }
+
+
+def load_cached_catalog(cache_file=CATALOG_CACHE_FILE, ttl=CATALOG_TTL_SECONDS):
+    """Return the cached catalog dict if it is younger than `ttl` seconds, else None."""
+    if not os.path.exists(cache_file):
+        return None
     try:
-        model = client.models.get(model_name)
-        return {
-            "name": model.name,
-            "display_name": getattr(model, 'display_name', 'N/A'),
-            "description": getattr(model, 'description', 'N/A'),
-            "input_token_limit": getattr(model, 'input_token_limit', 'N/A'),
-            "output_token_limit": getattr(model, 'output_token_limit', 'N/A'),
-            "supported_generation_methods": getattr(model, 'supported_generation_methods', [])
-        }
-    except Exception as e:
+        with open(cache_file, 'r') as f:
+            catalog = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if time.time() - catalog.get("fetched_at_epoch", 0) > ttl:
         return None
+    return catalog
 
-def check_gemini_status():
-    """Check Gemini model availability and provide recommendations."""
-    api_key = os.environ.get("GEMINI_API_KEY")
-    if not api_key:
-        print("❌ Error: GEMINI_API_KEY not found in environment.")
-        print("Please set the GEMINI_API_KEY secret in GitHub Settings.")
-        sys.exit(1)
+
+def save_catalog(catalog, cache_file=CATALOG_CACHE_FILE):
+    os.makedirs(os.path.dirname(cache_file) or ".", exist_ok=True)
+    tmp_file = f"{cache_file}.tmp"
+    with open(tmp_file, 'w') as f:
+        json.dump(catalog, f, indent=2)
+    os.replace(tmp_file, cache_file)
+
+
+def get_model_catalog(client, cache_file=CATALOG_CACHE_FILE, ttl=CATALOG_TTL_SECONDS, refresh=False):
+    """List available model names, served from the local cache while it is fresh.
+
+    Returns (catalog, from_cache).
+    """
+    if not refresh:
+        cached = load_cached_catalog(cache_file, ttl)
+        if cached is not None:
+            return cached, True
+
+    names = [m.name for m in client.models.list()]
+    catalog = {
+        "fetched_at": datetime.utcnow().isoformat(),
+        "fetched_at_epoch": time.time(),
+        "ttl_seconds": ttl,
+        "models": names,
+    }
+    return catalog, False
+
+
+def probe_models(client, model_names, timeout=PROBE_TIMEOUT_SECONDS):
+    """Probe models concurrently with `client.models.get`.
+
+    Every probe gets `timeout` seconds; slow or failing probes are reported
+    with their error instead of stalling the rest. Returns {name: result}.
+    """
+    def probe(name):
+        started = time.perf_counter()
+        try:
+            info = get_model_info(client, name)
+            return {"available": True, "info": info, "error": None,
+                    "latency_ms": round((time.perf_counter() - started) * 1000, 1)}
+        except Exception as e:
+            return {"available": False, "info": None, "error": f"{type(e).__name__}: {e}",
+                    "latency_ms": round((time.perf_counter() - started) * 1000, 1)}
+
+    names = list(dict.fromkeys(model_names))
+    pool = ThreadPoolExecutor(max_workers=max(1, len(names)))
+    futures = {name: pool.submit(probe, name) for name in names}
+    wait(futures.values(), timeout=timeout)
+
+    results = {}
+    for name, future in futures.items():
+        if future.done():
+            results[name] = future.result()
+        else:
+            future.cancel()
+            results[name] = {"available": False, "info": None,
+                             "error": f"timeout after {timeout}s", "latency_ms": None}
+    # Don't block on probes that are still hanging past their timeout
+    pool.shutdown(wait=False)
+    return results
+
+
+def check_gemini_status(client=None, refresh_catalog=False):
+    """Check Gemini model availability and provide recommendations.
+
+    Pass a client (or any object with the same `models.list`/`models.get`
+    interface) to run the check without creating a real genai client.
+    """
+    if client is None:
+        api_key = os.environ.get("GEMINI_API_KEY")
+        if not api_key:
+            print("❌ Error: GEMINI_API_KEY not found in environment.")
+            print("Please set the GEMINI_API_KEY secret in GitHub Settings.")
+            sys.exit(1)
 
     try:
-        client = genai.Client(api_key=api_key)
+        if client is None:
+            client = create_client(api_key)
 
-        # Fetch all available models
-        print("🔍 Fetching available Gemini models...")
-        all_models = list(client.models.list())
-        available_model_names = [m.name for m in all_models]
+        # Fetch all available models (or reuse the cached catalog)
+        catalog, from_cache = get_model_catalog(client, refresh=refresh_catalog)
+        available_model_names = catalog["models"]
+        if from_cache:
+            print(f"🗂️  Using cached model catalog from {catalog['fetched_at']} ({CATALOG_CACHE_FILE})")
+        else:
+            print("🔍 Fetching available Gemini models...")
 
         print(f"\n📊 Total models available: {len(available_model_names)}")
         print("=" * 80)
@@ -61,26 +159,29 @@ def check_gemini_status():
         for model in sorted(gemini_models):
             print(f"  • {model}")
 
+        # Probe the primary and every fallback at once
+        probes = probe_models(client, [PRIMARY_MODEL] + FALLBACK_MODELS)
+        primary_available = probes[PRIMARY_MODEL]["available"]
+
         # Check primary model status
         print("\n" + "=" * 80)
         print(f"🎯 PRIMARY MODEL CHECK: {PRIMARY_MODEL}")
         print("=" * 80)
 
-        if PRIMARY_MODEL in available_model_names:
+        if primary_available:
             print(f"✅ SUCCESS: {PRIMARY_MODEL} is ACTIVE and available!")
 
-            # Get detailed info
-            model_info = get_model_info(client, PRIMARY_MODEL)
-            if model_info:
-                print(f"\n📋 Model Details:")
-                print(f"  Display Name: {model_info['display_name']}")
-                print(f"  Description: {model_info['description'][:100]}...")
-                print(f"  Input Token Limit: {model_info['input_token_limit']}")
-                print(f"  Output Token Limit: {model_info['output_token_limit']}")
+            model_info = probes[PRIMARY_MODEL]["info"]
+            print(f"\n📋 Model Details:")
+            print(f"  Display Name: {model_info['display_name']}")
+            print(f"  Description: {str(model_info['description'])[:100]}...")
+            print(f"  Input Token Limit: {model_info['input_token_limit']}")
+            print(f"  Output Token Limit: {model_info['output_token_limit']}")
 
             exit_code = 0
         else:
             print(f"❌ WARNING: {PRIMARY_MODEL} is NOT AVAILABLE!")
+            print(f"   Probe error: {probes[PRIMARY_MODEL]['error']}")
             print("\n🚨 ALERT: Primary model unavailable. Please review alternatives below.")
             exit_code = 1
 
@@ -91,18 +192,18 @@ def check_gemini_status():
 
         available_fallbacks = []
         for fallback in FALLBACK_MODELS:
-            if fallback in available_model_names:
-                print(f"✅ {fallback} - AVAILABLE")
+            if probes[fallback]["available"]:
+                print(f"✅ {fallback} - AVAILABLE ({probes[fallback]['latency_ms']} ms)")
                 available_fallbacks.append(fallback)
             else:
-                print(f"❌ {fallback} - NOT AVAILABLE")
+                print(f"❌ {fallback} - NOT AVAILABLE ({probes[fallback]['error']})")
 
         # Recommendations
         print("\n" + "=" * 80)
         print("💡 RECOMMENDATIONS")
         print("=" * 80)
 
-        if PRIMARY_MODEL not in available_model_names:
+        if not primary_available:
             if available_fallbacks:
                 print(f"\n⚠️  IMMEDIATE ACTION REQUIRED:")
                 print(f"   Primary model '{PRIMARY_MODEL}' is down.")
@@ -117,18 +218,29 @@ def check_gemini_status():
         else:
             print(f"\n✨ All systems operational. No action needed.")
 
+        # Keep the catalog (plus the model to use right now) for later checks
+        # and for model selection. Probes and the recommendation are saved on
+        # every check; the listing keeps its fetch time, so the TTL still
+        # counts from the last models.list call
+        catalog["recommended_model"] = PRIMARY_MODEL if primary_available else (
+            available_fallbacks[0] if available_fallbacks else None)
+        catalog["probes"] = {name: {k: v for k, v in p.items() if k != "info"} for name, p in probes.items()}
+        save_catalog(catalog)
+
         # Save report to file
         report = {
             "timestamp": datetime.utcnow().isoformat(),
             "primary_model": PRIMARY_MODEL,
-            "primary_model_available": PRIMARY_MODEL in available_model_names,
+            "primary_model_available": primary_available,
             "total_models": len(available_model_names),
             "gemini_models": gemini_models,
             "fallback_models": {
                 "configured": FALLBACK_MODELS,
                 "available": available_fallbacks
             },
-            "status": "OK" if exit_code == 0 else "WARNING"
+            "probes": catalog["probes"],
+            "catalog_from_cache": from_cache,
+            "status": "OK" if exit_code == 0 else ("WARNING" if available_fallbacks else "CRITICAL")
         }
 
         # Save to reports directory
@@ -161,5 +273,12 @@ def check_gemini_status():
         print(f"  - Gemini API status: https://status.cloud.google.com/")
         sys.exit(1)
 
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check Gemini model availability and recommend fallbacks")
+    parser.add_argument('--refresh', action='store_true', help="Ignore the cached model catalog")
+    args = parser.parse_args(argv)
+    check_gemini_status(refresh_catalog=args.refresh)
+
+
 if __name__ == "__main__":
-    check_gemini_status()
+    main()
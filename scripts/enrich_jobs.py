@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Agent Enrichment for Scraped Jobs
+Attaches approved manning agent details to job postings by MLA license number
+and flags postings that cite expired, suspended or unknown licenses.
+"""
+
+import os
+import re
+import sys
+import json
+from datetime import datetime, date
+
+from job_numbers import card_text
+
+# The agents parser lives at the repository root
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+# Constants
+AGENTS_OCR_FILE = os.path.join(REPO_ROOT, "agents_ocr.txt")
+LICENSE_PATTERN = re.compile(r'MLA\s*[-–]?\s*(\d{1,4})', re.IGNORECASE)
+MONTHS = {m: i for i, m in enumerate(
+    ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'], 1)}
+
+
+def normalize_license(value):
+    """Normalize OCR/posting variants ('MLA -\\n002', 'mla 2', 'MLA-0002') to 'MLA-002'."""
+    if not value:
+        return None
+    match = LICENSE_PATTERN.search(value)
+    if not match:
+        return None
+    return f"MLA-{int(match.group(1)):03d}"
+
+
+def parse_validity(value):
+    """Parse validity strings like '26 May 2026', '29-05-\\n2026' or '12.08.2027'."""
+    if not value:
+        return None
+    parts = [p for p in re.split(r'[\.\-\s]+', value.strip()) if p]
+    if len(parts) != 3:
+        return None
+    day, month, year = parts
+    try:
+        month_no = int(month) if month.isdigit() else MONTHS.get(month[:3].lower())
+        if not month_no:
+            return None
+        return date(int(year), month_no, int(day))
+    except ValueError:
+        return None
+
+
+class AgentIndex:
+    """In-memory hash index of approved agents keyed by normalized license number."""
+
+    def __init__(self, agents):
+        self._by_license = {}
+        for agent in agents:
+            key = normalize_license(agent.get('licenseNumber', ''))
+            if key:
+                self._by_license[key] = agent
+
+    def __len__(self):
+        return len(self._by_license)
+
+    def get(self, license_number):
+        key = normalize_license(license_number)
+        return self._by_license.get(key) if key else None
+
+    @classmethod
+    def from_ocr(cls, file_path=AGENTS_OCR_FILE, page_aware=False):
+        from generate_agents_ts import parse_agents
+        return cls(parse_agents(file_path, page_aware=page_aware))
+
+
+def license_flag(agent, today=None):
+    """Return None for a valid license, else 'unknown', 'suspended' or 'expired'."""
+    if agent is None:
+        return 'unknown'
+    if agent['status'] == 'Suspended':
+        return 'suspended'
+    if agent['status'] == 'Expired':
+        return 'expired'
+    valid_until = parse_validity(agent.get('validity'))
+    if valid_until and valid_until < (today or datetime.utcnow().date()):
+        return 'expired'
+    return None
+
+
+def enrich_job(job, index, today=None):
+    """Attach agent details to one job in place (O(1) index lookup)."""
+    cited = job.get('mla_number') or ''
+    # Only this posting's card: older snapshots hold the whole listing page
+    license_number = normalize_license(cited) or normalize_license(card_text(job))
+    if not license_number:
+        return job
+
+    agent = index.get(license_number)
+    job['mla_number'] = license_number
+    job['license_flag'] = license_flag(agent, today)
+
+    if agent:
+        job['agent_name'] = agent['name']
+        job['agent_address'] = agent['address']
+        job['agent_email'] = agent['email']
+        job['agent_cities'] = agent.get('cities') or []
+        job['agent_status'] = agent['status']
+        job['agent_validity'] = agent.get('validity') or None
+    return job
+
+
+def enrich_jobs(jobs, index=None):
+    """Enrich jobs in place and print a summary of flagged licenses."""
+    if index is None:
+        if not os.path.exists(AGENTS_OCR_FILE):
+            print(f"⚠️  Skipping agent enrichment ({AGENTS_OCR_FILE} not found)")
+            return jobs
+        index = AgentIndex.from_ocr()
+
+    today = datetime.utcnow().date()
+    flagged = 0
+    for job in jobs:
+        enrich_job(job, index, today)
+        if job.get('license_flag'):
+            flagged += 1
+            print(f"   🚩 {job.get('title', 'Unknown')}: {job['mla_number']} is {job['license_flag']}")
+
+    print(f"🔗 Enriched {len(jobs)} jobs against {len(index)} approved agents ({flagged} flagged)")
+    return jobs
+
+
+if __name__ == "__main__":
+    # Enrich an existing snapshot, e.g. jobs/latest_jobs.json
+    path = sys.argv[1] if len(sys.argv) > 1 else os.path.join("jobs", "latest_jobs.json")
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    jobs = data['jobs'] if isinstance(data, dict) else data
+    enrich_jobs(jobs)
+    print(json.dumps(jobs[:3], indent=2, ensure_ascii=False))
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP Fetch Client
+One pooled requests.Session for the scrapers with:
+
+- keep-alive connection pooling and connect/read timeouts on every call
+- retries with full-jitter exponential backoff (honouring Retry-After)
+- optional hedged requests: a second copy of a slow idempotent request is
+  sent after `hedge_after` seconds and whichever answers first wins
+- a per-host circuit breaker, so a failing endpoint fails fast instead of
+  making every remaining call wait out its timeout
+- per-host latency percentiles (see `host_stats()`)
+
+Usage:
+    from fetch_client import FetchClient
+
+    http = FetchClient(metrics=metrics)
+    response = http.get(URL, timeout=(5, 30))
+    print(http.host_stats())
+"""
+
+import time
+import random
+import threading
+from collections import deque
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from run_metrics import percentile
+
+# Constants
+DEFAULT_TIMEOUT = (5, 30)  # (connect, read) seconds
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+IDEMPOTENT_METHODS = {'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'}
+LATENCY_WINDOW = 500  # samples kept per host
+AUTO_HEDGE_MIN_SAMPLES = 10
+
+
+class CircuitOpenError(requests.RequestException):
+    """Raised without touching the network while a host's breaker is open."""
+
+
+class CircuitBreaker:
+    """Closed -> open after `threshold` consecutive failures; one trial call after `cooldown`."""
+
+    def __init__(self, threshold=5, cooldown=60.0):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.cooldown:
+            return 'half_open'
+        return 'open'
+
+    def allow(self):
+        with self._lock:
+            state = self.state
+            if state == 'closed':
+                return True
+            if state == 'half_open' and not self.trial_in_flight:
+                self.trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.trial_in_flight or self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+            self.trial_in_flight = False
+
+
+class _HostStats:
+    def __init__(self):
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.hedges = 0
+        self.rejected = 0
+
+
+class FetchClient:
+    def __init__(self, timeout=DEFAULT_TIMEOUT, retries=3, backoff_base=0.5, backoff_cap=8.0,
+                 hedge_after=None, breaker_threshold=5, breaker_cooldown=60.0,
+                 pool_size=10, headers=None, metrics=None):
+        """
+        hedge_after: None (off), seconds, or 'auto' to hedge after the host's
+        observed p95 once enough samples exist.
+        metrics: optional RunMetrics; attempts, retries and hedges are counted there.
+        """
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.hedge_after = hedge_after
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+        self.metrics = metrics
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        if headers:
+            self.session.headers.update(headers)
+
+        self._breakers = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def request(self, method, url, hedge_after=None, retry_unsafe=False, **kwargs):
+        """
+        Send a request with retries, optional hedging and the host's breaker.
+
+        Non-idempotent methods (POST) are only retried when the request never
+        reached the server (connect timeout) or the server refused it up front
+        (429/503), unless retry_unsafe=True.
+        """
+        method = method.upper()
+        host = urlsplit(url).netloc
+        breaker, stats = self._host(host)
+        kwargs.setdefault('timeout', self.timeout)
+        idempotent = method in IDEMPOTENT_METHODS or retry_unsafe
+        hedge_delay = self._hedge_delay(stats, hedge_after) if idempotent else None
+
+        attempt = 0
+        while True:
+            if not breaker.allow():
+                stats.rejected += 1
+                self._inc('http_circuit_rejected')
+                raise CircuitOpenError(f"Circuit open for {host}; skipping {method} {url}")
+
+            retry_after = None
+            try:
+                response = self._send(method, url, stats, hedge_delay, kwargs)
+            except requests.RequestException as e:
+                stats.errors += 1
+                breaker.record_failure()
+                retryable = idempotent or isinstance(e, requests.ConnectTimeout)
+                if not retryable or attempt >= self.retries or breaker.state == 'open':
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    breaker.record_success()
+                    return response
+                stats.errors += 1
+                breaker.record_failure()
+                retryable = idempotent or response.status_code in (429, 503)
+                if not retryable or attempt >= self.retries or breaker.state == 'open':
+                    return response
+                retry_after = response.headers.get('Retry-After')
+                response.close()
+
+            attempt += 1
+            stats.retries += 1
+            self._inc('http_retries')
+            time.sleep(self._backoff(attempt, retry_after))
+
+    def host_stats(self):
+        """Per-host request counts, error counts, breaker state and latency percentiles (ms)."""
+        report = {}
+        for host, stats in self._stats.items():
+            latencies = list(stats.latencies)
+            report[host] = {
+                'requests': stats.requests,
+                'errors': stats.errors,
+                'retries': stats.retries,
+                'hedges': stats.hedges,
+                'rejected': stats.rejected,
+                'breaker': self._breakers[host].state,
+                **{f'p{p}_ms': round(percentile(latencies, p) * 1000, 1) if latencies else None
+                   for p in (50, 90, 95, 99)},
+            }
+        return report
+
+    def close(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+        self.session.close()
+
+    def _pool(self):
+        # Created on first hedge, under the lock so concurrent callers share one pool
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="fetch-hedge")
+            return self._executor
+
+    def _host(self, host):
+        with self._lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker(self.breaker_threshold, self.breaker_cooldown)
+                self._stats[host] = _HostStats()
+            return self._breakers[host], self._stats[host]
+
+    def _inc(self, name, value=1):
+        if self.metrics is not None:
+            self.metrics.inc(name, value)
+
+    def _backoff(self, attempt, retry_after=None):
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_cap)
+            except ValueError:
+                pass  # HTTP-date form; fall back to jitter
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+
+    def _hedge_delay(self, stats, hedge_after):
+        hedge_after = hedge_after if hedge_after is not None else self.hedge_after
+        if hedge_after == 'auto':
+            if len(stats.latencies) < AUTO_HEDGE_MIN_SAMPLES:
+                return None
+            return percentile(list(stats.latencies), 95)
+        return hedge_after
+
+    def _attempt(self, method, url, stats, kwargs):
+        stats.requests += 1
+        self._inc('http_requests')
+        t0 = time.perf_counter()
+        response = self.session.request(method, url, **kwargs)
+        elapsed = time.perf_counter() - t0
+        stats.latencies.append(elapsed)
+        if self.metrics is not None:
+            self.metrics.observe('http_seconds', elapsed)
+        return response
+
+    def _send(self, method, url, stats, hedge_delay, kwargs):
+        if not hedge_delay:
+            return self._attempt(method, url, stats, kwargs)
+
+        executor = self._pool()
+        primary = executor.submit(self._attempt, method, url, stats, kwargs)
+        done, _ = wait([primary], timeout=hedge_delay)
+        if done:
+            return primary.result()
+
+        stats.hedges += 1
+        self._inc('http_hedges')
+        hedge = executor.submit(self._attempt, method, url, stats, kwargs)
+        pending = {primary, hedge}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    response = future.result()
+                except requests.RequestException as e:
+                    error = e
+                    continue
+                for loser in pending:
+                    loser.add_done_callback(_close_response)
+                return response
+        raise error
+
+
+def _close_response(future):
+    if not future.exception():
+        future.result().close()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Gemini API Stub Server
+Local stand-in for the generateContent endpoint, used to exercise the model
+benchmark without network access or an API key.
+
+Responses are built from the posting text in the prompt with simple regexes,
+so they are deterministic. Per-model latency, failure rate and noise (the
+share of answers that miss the salary and invent an agency) can be set to
+check that the benchmark scores and ranks models correctly.
+"""
+
+import re
+import sys
+import json
+import time
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Constants
+POSTING_PATTERN = re.compile(r'Job Posting Text:\s*"""\s*(.*?)\s*"""', re.DOTALL)
+PATH_PATTERN = re.compile(r'^/v1beta/(models/[^:]+):generateContent')
+
+
+def fake_extraction(text):
+    """Extract the job parser fields the way a well-behaved model would."""
+    title = text.split('|', 1)[0].strip()
+    salary = re.search(r'Salary:\s*([^|]+)', text)
+    deadline = re.search(r'Deadline:\s*([^|]+)', text)
+    return {
+        'rank': title.split(' - ', 1)[0].strip() or 'N/A',
+        'salary': salary.group(1).strip() if salary else 'N/A',
+        'joining_date': deadline.group(1).strip() if deadline else 'N/A',
+        'agency': 'N/A',
+        'mla_number': 'N/A',
+        'address': 'N/A',
+        'mobile': 'N/A',
+        'email': 'N/A',
+    }
+
+
+def sloppy_extraction(text):
+    """What a careless model returns: the salary is lost and an agency made up."""
+    return {**fake_extraction(text), 'salary': 'N/A', 'agency': 'Global Marine Crew Ltd'}
+
+
+def make_handler(models):
+    """Build a request handler class.
+
+    `models` maps model name -> {"latency": seconds, "error_rate": 0..1,
+    "noise": 0..1}; models not in the map answer 404.
+    """
+    class StubHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            match = PATH_PATTERN.match(self.path)
+            model = match.group(1) if match else None
+            body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+
+            if model not in models:
+                return self._reply(404, {'error': {'code': 404, 'message': f'{model} is not found'}})
+
+            config = models[model]
+            time.sleep(config.get('latency', 0))
+            if random.random() < config.get('error_rate', 0):
+                return self._reply(503, {'error': {'code': 503, 'message': 'The model is overloaded'}})
+
+            prompt = body['contents'][0]['parts'][0]['text']
+            posting = POSTING_PATTERN.search(prompt)
+            extract = sloppy_extraction if random.random() < config.get('noise', 0) else fake_extraction
+            answer = json.dumps(extract(posting.group(1) if posting else prompt))
+            self._reply(200, {
+                'candidates': [{'content': {'parts': [{'text': answer}], 'role': 'model'}}],
+                'usageMetadata': {
+                    'promptTokenCount': len(prompt) // 4,
+                    'candidatesTokenCount': len(answer) // 4,
+                    'totalTokenCount': (len(prompt) + len(answer)) // 4,
+                },
+            })
+
+        def _reply(self, status, payload):
+            data = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubHandler
+
+
+def start_stub_server(models, host='127.0.0.1', port=0):
+    """Start the stub in a background thread. Returns (server, base_url)."""
+    server = ThreadingHTTPServer((host, port), make_handler(models))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    demo_models = {
+        'models/gemini-2.5-flash': {'latency': 0.05},
+        'models/gemini-2.0-flash-exp': {'latency': 0.02, 'error_rate': 0.2},
+        'models/gemini-1.5-flash': {'latency': 0.1, 'noise': 0.3},
+    }
+    server, url = start_stub_server(demo_models, port=port)
+    print(f"🧪 Gemini stub listening on {url} (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
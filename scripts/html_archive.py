@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Raw HTML Archive
+Keeps every fetched listing page, compressed and content-addressed, so past
+runs can be re-extracted when the extractors improve instead of re-crawled.
+
+Pages are stored once per SHA-256 of the raw bytes under
+jobs/html/objects/<aa>/<sha256>.html.<zst|gz> (zstd when `zstandard` is
+installed, gzip otherwise); a page that did not change between runs costs
+one index line. jobs/html/index.ndjson records each fetch:
+{"fetched_at", "url", "sha256", "bytes", "scraper"}.
+
+`reextract` runs the current `find_job_elements` / `extract_job_details` (and
+`job_numbers.normalize_jobs`) over the whole archive in a process pool (each
+distinct page is parsed once),
+writes the records to reports/reextract/jobs_<fetched_at>.ndjson and diffs
+them against the snapshot that run saved (jobs/jobs_<stamp>.ndjson|json).
+
+Usage:
+    from html_archive import archive_page
+
+    archive_page(URL, response.content, scraper='scrape_mariaid_jobs_simple')
+
+CLI:
+    python scripts/html_archive.py reextract [--workers N] [--out reports/reextract]
+    python scripts/html_archive.py stats
+"""
+
+import os
+import re
+import sys
+import glob
+import gzip
+import json
+import hashlib
+import argparse
+import importlib
+from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
+
+from job_numbers import normalize_jobs
+from job_sinks import NDJSONSink, read_jobs, write_jobs
+
+# Constants
+ARCHIVE_DIR = os.environ.get("HTML_ARCHIVE_DIR", os.path.join("jobs", "html"))
+JOBS_DIR = "jobs"
+REEXTRACT_DIR = os.path.join("reports", "reextract")
+DEFAULT_SCRAPER = "scrape_mariaid_jobs_simple"
+STAMP_FORMAT = '%Y-%m-%d_%H-%M-%S'
+SNAPSHOT_RE = re.compile(r'jobs_(\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2})\.(ndjson|json)$')
+SNAPSHOT_WINDOW = timedelta(hours=1)  # a run saves its snapshot this soon after fetching
+ZSTD_LEVEL = 19
+DIFF_VALUE_CHARS = 200
+
+
+def _zstd():
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return zstandard
+
+
+def _compress(data):
+    zstandard = _zstd()
+    if zstandard is not None:
+        return 'zst', zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    return 'gz', gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def _decompress(ext, data):
+    if ext == 'gz':
+        return gzip.decompress(data)
+    zstandard = _zstd()
+    if zstandard is None:
+        raise RuntimeError('This archive page is zstd-compressed: pip install zstandard')
+    return zstandard.ZstdDecompressor().decompress(data)
+
+
+class HTMLArchive:
+    def __init__(self, root=ARCHIVE_DIR):
+        self.root = root
+        self.index_path = os.path.join(root, "index.ndjson")
+
+    def _object_path(self, digest, ext):
+        return os.path.join(self.root, "objects", digest[:2], f"{digest}.html.{ext}")
+
+    def _find(self, digest):
+        for ext in ('zst', 'gz'):
+            path = self._object_path(digest, ext)
+            if os.path.exists(path):
+                return ext, path
+        return None, None
+
+    def put(self, content, url, scraper=None, fetched_at=None):
+        """Store a fetched page (bytes) and log the fetch. Returns (index entry, bytes written)."""
+        digest = hashlib.sha256(content).hexdigest()
+        written = 0
+        if self._find(digest)[1] is None:
+            ext, data = _compress(content)
+            path = self._object_path(digest, ext)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(f"{path}.tmp", 'wb') as f:
+                f.write(data)
+            os.replace(f"{path}.tmp", path)
+            written = len(data)
+        entry = {
+            'fetched_at': fetched_at or datetime.utcnow().strftime(STAMP_FORMAT),
+            'url': url,
+            'sha256': digest,
+            'bytes': len(content),
+            'scraper': scraper,
+        }
+        with open(self.index_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + "\n")
+        return entry, written
+
+    def get(self, digest):
+        ext, path = self._find(digest)
+        if path is None:
+            raise FileNotFoundError(f"{digest} is not in the archive at {self.root}")
+        with open(path, 'rb') as f:
+            return _decompress(ext, f.read())
+
+    def entries(self):
+        if not os.path.exists(self.index_path):
+            return []
+        return read_jobs(self.index_path)
+
+    def stats(self):
+        entries = self.entries()
+        objects = glob.glob(os.path.join(self.root, "objects", "*", "*.html.*"))
+        return {
+            'fetches': len(entries),
+            'pages': len(objects),
+            'raw_bytes': sum(e['bytes'] for e in entries),
+            'stored_bytes': sum(os.path.getsize(p) for p in objects),
+        }
+
+
+def archive_page(url, content, scraper=None, metrics=None, root=ARCHIVE_DIR):
+    """Archive one fetched page. Never fails the scrape: errors are printed and counted."""
+    try:
+        entry, written = HTMLArchive(root).put(content, url, scraper=scraper)
+    except OSError as e:
+        print(f"   ⚠️  Could not archive {url}: {e}")
+        if metrics is not None:
+            metrics.inc('html_archive_errors')
+        return None
+    if metrics is not None:
+        metrics.inc('html_archived_bytes', written)
+    return entry
+
+
+# Re-extraction. Module-level functions so the process pool can pickle them.
+
+def _extract_page(task):
+    """(root, sha256, scraper) -> (sha256, [normalized job dicts], error)"""
+    root, digest, scraper = task
+    try:
+        module = importlib.import_module(scraper)
+        jobs = []
+        for element in module.find_job_elements(HTMLArchive(root).get(digest)):
+            job = module.extract_job_details(element)
+            if job:
+                # JobPosting records, or plain dicts from scrape_mariaid_jobs
+                jobs.append(job.to_dict() if hasattr(job, 'to_dict') else dict(job))
+        normalize_jobs(jobs)  # the typed salary / contract / size fields the scrapers add at ingest
+        return digest, jobs, None
+    except Exception as e:
+        return digest, [], repr(e)
+
+
+def find_snapshot(fetched_at, jobs_dir=JOBS_DIR):
+    """The snapshot the run that fetched at `fetched_at` saved (NDJSON preferred), or None."""
+    fetched = datetime.strptime(fetched_at, STAMP_FORMAT)
+    best = None
+    for path in glob.glob(os.path.join(jobs_dir, "jobs_*.*json")):
+        match = SNAPSHOT_RE.search(os.path.basename(path))
+        if not match:
+            continue
+        stamp = datetime.strptime(match.group(1), STAMP_FORMAT)
+        if fetched <= stamp <= fetched + SNAPSHOT_WINDOW:
+            key = (stamp, match.group(2) != 'ndjson')
+            if best is None or key < best[0]:
+                best = (key, path)
+    return best[1] if best else None
+
+
+def _keyed(jobs):
+    """{(title, n): job} so repeated titles on one page pair up in order."""
+    keyed, seen = {}, {}
+    for job in jobs:
+        title = job.get('title') or ''
+        seen[title] = seen.get(title, 0) + 1
+        keyed[(title, seen[title])] = job
+    return keyed
+
+
+def _short(value):
+    if isinstance(value, str) and len(value) > DIFF_VALUE_CHARS:
+        return value[:DIFF_VALUE_CHARS] + '…'
+    return value
+
+
+def diff_jobs(old_jobs, new_jobs):
+    """Added / removed titles and per-field changes (fields the extractor produces)."""
+    old, new = _keyed(old_jobs), _keyed(new_jobs)
+    changed = []
+    for key in old.keys() & new.keys():
+        fields = {field: [_short(old[key].get(field)), _short(value)]
+                  for field, value in new[key].items() if old[key].get(field) != value}
+        if fields:
+            changed.append({'title': key[0], 'fields': fields})
+    return {
+        'added': sorted(title for title, _ in new.keys() - old.keys()),
+        'removed': sorted(title for title, _ in old.keys() - new.keys()),
+        'changed': sorted(changed, key=lambda c: c['title']),
+    }
+
+
+def reextract(root=ARCHIVE_DIR, out_dir=REEXTRACT_DIR, jobs_dir=JOBS_DIR, scraper=None, workers=None):
+    """Re-run the extractors over every archived fetch; write records and diffs. Returns the summary."""
+    archive = HTMLArchive(root)
+    entries = archive.entries()
+    pages = {(e['sha256'], scraper or e.get('scraper') or DEFAULT_SCRAPER) for e in entries}
+    extracted, errors = {}, {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        tasks = [(root, digest, module) for digest, module in sorted(pages)]
+        for (digest, module), (_, jobs, error) in zip(sorted(pages), pool.map(_extract_page, tasks, chunksize=4)):
+            extracted[digest, module] = jobs
+            if error:
+                errors[digest] = error
+
+    os.makedirs(out_dir, exist_ok=True)
+    runs, field_changes = [], {}
+    for entry in entries:
+        jobs = extracted[entry['sha256'], scraper or entry.get('scraper') or DEFAULT_SCRAPER]
+        write_jobs(jobs, [NDJSONSink(os.path.join(out_dir, f"jobs_{entry['fetched_at']}.ndjson"))])
+        snapshot = find_snapshot(entry['fetched_at'], jobs_dir)
+        run = {'fetched_at': entry['fetched_at'], 'sha256': entry['sha256'], 'jobs': len(jobs),
+               'snapshot': snapshot, 'error': errors.get(entry['sha256'])}
+        if snapshot:
+            run['old_jobs'] = len(read_jobs(snapshot))
+            run['diff'] = diff_jobs(read_jobs(snapshot), jobs)
+            for change in run['diff']['changed']:
+                for field in change['fields']:
+                    field_changes[field] = field_changes.get(field, 0) + 1
+        runs.append(run)
+
+    summary = {
+        'generated_at': datetime.utcnow().isoformat(),
+        'fetches': len(entries),
+        'pages': len(pages),
+        'jobs': sum(r['jobs'] for r in runs),
+        'errors': len(errors),
+        'field_changes': dict(sorted(field_changes.items(), key=lambda kv: -kv[1])),
+        'runs': runs,
+    }
+    with open(os.path.join(out_dir, "diff.json"), 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Raw HTML archive and bulk re-extraction")
+    parser.add_argument('--archive', default=ARCHIVE_DIR)
+    sub = parser.add_subparsers(dest='command', required=True)
+    reextract_cmd = sub.add_parser('reextract', help="Run the current extractors over the whole archive")
+    reextract_cmd.add_argument('--out', default=REEXTRACT_DIR)
+    reextract_cmd.add_argument('--jobs-dir', default=JOBS_DIR, help="Where the original snapshots are")
+    reextract_cmd.add_argument('--scraper', help="Extractor module for every page (default: the one that fetched it)")
+    reextract_cmd.add_argument('--workers', type=int, default=None, help="Processes (default: CPU count)")
+    sub.add_parser('stats', help="Fetches, distinct pages and compressed size")
+    args = parser.parse_args(argv)
+
+    if args.command == 'stats':
+        print(json.dumps(HTMLArchive(args.archive).stats(), indent=2))
+        return
+
+    started = datetime.utcnow()
+    summary = reextract(args.archive, args.out, args.jobs_dir, args.scraper, args.workers)
+    elapsed = (datetime.utcnow() - started).total_seconds()
+    compared = [r for r in summary['runs'] if r.get('diff')]
+    print(f"♻️  Re-extracted {summary['fetches']} fetches ({summary['pages']} distinct pages, "
+          f"{summary['jobs']} jobs) in {elapsed:.1f} s -> {args.out}")
+    print(f"   {len(compared)} runs compared with their snapshot, "
+          f"{sum(len(r['diff']['changed']) for r in compared)} jobs changed, "
+          f"{sum(len(r['diff']['added']) for r in compared)} added, "
+          f"{sum(len(r['diff']['removed']) for r in compared)} removed")
+    for field, count in summary['field_changes'].items():
+        print(f"   {field}: {count}")
+    if summary['errors']:
+        print(f"   ⚠️  {summary['errors']} pages failed to extract (see diff.json)")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
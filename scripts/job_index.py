@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Static Job Search Index
+Writes the jobs of a run as static files the JobBoard can fetch piece by
+piece, plus the index that answers its filters without scanning rows:
+
+    index.json        facets and file list (loaded first)
+      rank / shipType   base64 bitsets over doc ids (LSB first), one per value
+      agency            sorted doc id lists (agencies are many and sparse)
+    salary.bin        range arrays: uint32 n, int32 values[n] ascending,
+    contract.bin      uint32 doc_ids[n] (little-endian). salary = monthly
+                      USD minimum, contract = months (job_numbers.py)
+    terms/<c>.json    title prefix index: sorted [term, [doc ids]] for terms
+                      starting with <c>, so a prefix search fetches one file
+    shard-NNN.json    job rows in `fields` order; doc id i is row i % shardSize
+                      of shard i // shardSize
+
+Doc ids are positions in the job list, newest first, so shard 0 holds the
+most recent postings. `JobIndex` answers the same queries in Python (used by
+the benchmark); services/jobsIndex.ts is the browser side.
+
+Usage:
+    from job_index import write_job_index
+
+    write_job_index(jobs, "public/data/jobs")
+
+CLI:
+    python scripts/job_index.py build [jobs/latest_jobs.json ...] [--out public/data/jobs]
+    python scripts/job_index.py query --rank "Able Seaman" --salary-min 2000 --title ab
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import base64
+import struct
+import bisect
+import argparse
+from array import array
+
+from job_numbers import monthly, normalize_jobs
+from job_posting import JobPosting
+from job_sinks import content_hash, read_jobs
+from job_terms import extract_rank, extract_ship_type
+
+# Constants
+INDEX_DIR = os.environ.get("JOB_INDEX_DIR", os.path.join("public", "data", "jobs"))  # "" disables it in publish_jobs
+SHARD_SIZE = 256
+SHARD_FIELDS = ['id', 'title', 'rank', 'ship_type', 'salary', 'contract', 'positions', 'apply_url',
+                'source', 'mla_number', 'agency', 'scraped_at', 'duplicate_of',
+                'salary_min', 'salary_max', 'salary_currency', 'salary_period',
+                'contract_months', 'contract_extension_months', 'dwt', 'grt', 'teu', 'raw_content']
+FACETS = {'rank': 'rank', 'shipType': 'ship_type'}
+RANGES = ('salary', 'contract')
+RANGE_BLOCK = 512  # range lookups keep a bitset checkpoint every this many sorted values
+WORD_RE = re.compile(r'[a-z0-9]+')
+
+
+def _salary_value(job):
+    """Monthly minimum in USD (or no stated currency) from the normalized salary fields, or None."""
+    if job.get('salary_currency') not in (None, 'USD'):
+        return None
+    return monthly(job.get('salary_min'), job.get('salary_period'))
+
+
+def _bits(ids, total):
+    bits = bytearray((total + 7) // 8)
+    for i in ids:
+        bits[i >> 3] |= 1 << (i & 7)
+    return bits
+
+
+def _bitmap(ids, total):
+    return base64.b64encode(bytes(_bits(ids, total))).decode('ascii')
+
+
+def _mask(ids, total):
+    """Doc ids as an int bitset (bit i = doc id i)."""
+    return int.from_bytes(_bits(ids, total), 'little')
+
+
+def _range_bytes(pairs):
+    """Binary range file for [(value, doc id)]: count, sorted values, then their doc ids."""
+    pairs = sorted(pairs)
+    values = array('i', (v for v, _ in pairs))
+    ids = array('I', (i for _, i in pairs))
+    if sys.byteorder != 'little':
+        values.byteswap()
+        ids.byteswap()
+    return struct.pack('<I', len(pairs)) + values.tobytes() + ids.tobytes()
+
+
+def _write_if_changed(path, content):
+    """Write bytes or text to path unless it already holds exactly that. Returns True if written."""
+    data = content.encode('utf-8') if isinstance(content, str) else content
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return False
+    with open(f"{path}.tmp", 'wb') as f:
+        f.write(data)
+    os.replace(f"{path}.tmp", path)
+    return True
+
+
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+def fill_terms(jobs):
+    """Set rank and ship type the way the simple scraper does on records saved without them."""
+    for job in jobs:
+        if not job.get('rank'):
+            job['rank'] = extract_rank(job.get('title') or '')
+        if not job.get('ship_type'):
+            job['ship_type'] = extract_ship_type(job.get('raw_content') or job.get('raw_text') or job.get('title') or '')
+
+
+def order_jobs(jobs):
+    """Newest first, one entry per content hash (the latest copy wins)."""
+    latest = {}
+    for job in jobs:
+        key = job.get('id') or content_hash(job)
+        if key not in latest or (job.get('scraped_at') or '') >= (latest[key].get('scraped_at') or ''):
+            latest[key] = job
+    return sorted(latest.items(), key=lambda kv: kv[1].get('scraped_at') or '', reverse=True)
+
+
+def build_index(jobs, shard_size=SHARD_SIZE):
+    """Index over [(id, job)] in doc id order. Returns (index dict, {range: pairs}, {char: terms})."""
+    total = len(jobs)
+    facets = {name: {} for name in FACETS}
+    agencies, terms = {}, {}
+    ranges = {name: [] for name in RANGES}
+    for doc_id, (_, job) in enumerate(jobs):
+        for name, field in FACETS.items():
+            value = job.get(field)
+            if value:
+                facets[name].setdefault(value, []).append(doc_id)
+        agency = job.get('agency') or job.get('agent_name')
+        if agency:
+            agencies.setdefault(agency, []).append(doc_id)
+        salary, months = _salary_value(job), job.get('contract_months')
+        if salary is not None:
+            ranges['salary'].append((salary, doc_id))
+        if months is not None:
+            ranges['contract'].append((months, doc_id))
+        for word in set(WORD_RE.findall((job.get('title') or '').lower())):
+            terms.setdefault(word, []).append(doc_id)
+
+    term_shards = {}
+    for term in sorted(terms):
+        term_shards.setdefault(term[0], []).append([term, terms[term]])
+    index = {
+        'version': 1,
+        'total': total,
+        'shardSize': shard_size,
+        'fields': SHARD_FIELDS,
+        **{name: {value: _bitmap(ids, total) for value, ids in sorted(values.items())}
+           for name, values in facets.items()},
+        'agency': dict(sorted(agencies.items())),
+        'ranges': {name: {'file': f"{name}.bin", 'count': len(pairs)} for name, pairs in ranges.items()},
+        'terms': {c: {'file': f"terms/{c}.json", 'count': len(entries)} for c, entries in term_shards.items()},
+    }
+    return index, ranges, term_shards
+
+
+def write_job_index(jobs, out_dir=INDEX_DIR, shard_size=SHARD_SIZE):
+    """Write shards, range files, term files and index.json; unchanged files are left alone.
+
+    Returns a report with the build time and file sizes.
+    """
+    started = time.perf_counter()
+    ordered = order_jobs(JobPosting.from_dict(job).to_dict() for job in jobs)
+    index, ranges, term_shards = build_index(ordered, shard_size)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    os.makedirs(os.path.join(out_dir, "terms"), exist_ok=True)
+    files = {}
+    shards = []
+    for n, start in enumerate(range(0, len(ordered), shard_size)):
+        rows = [[key if field == 'id' else job.get(field) for field in SHARD_FIELDS]
+                for key, job in ordered[start:start + shard_size]]
+        name = f"shard-{n:03d}.json"
+        files[name] = _dumps(rows)
+        shards.append({'file': name, 'count': len(rows), 'bytes': len(files[name].encode('utf-8'))})
+    for name, pairs in ranges.items():
+        files[f"{name}.bin"] = _range_bytes(pairs)
+    for c, entries in term_shards.items():
+        files[f"terms/{c}.json"] = _dumps(entries)
+    index['shards'] = shards
+    files['index.json'] = _dumps(index)
+
+    written = sum(_write_if_changed(os.path.join(out_dir, name), content) for name, content in files.items())
+
+    # Drop shards and term files left over from a larger previous index
+    for sub, prefix in (('', 'shard-'), ('terms', '')):
+        directory = os.path.join(out_dir, sub)
+        for name in os.listdir(directory):
+            rel = f"{sub}/{name}" if sub else name
+            if name.startswith(prefix) and name.endswith('.json') and rel not in files:
+                os.remove(os.path.join(directory, name))
+
+    return {
+        'jobs': len(ordered),
+        'index_build_ms': round(build_ms, 3),
+        'index_bytes': len(files['index.json'].encode('utf-8')),
+        'files': len(files),
+        'written': written,
+        'bytes': sum(len(c.encode('utf-8') if isinstance(c, str) else c) for c in files.values()),
+    }
+
+
+def _read_range(path):
+    with open(path, 'rb') as f:
+        data = f.read()
+    n = struct.unpack_from('<I', data)[0]
+    values, ids = array('i'), array('I')
+    values.frombytes(data[4:4 + 4 * n])
+    ids.frombytes(data[4 + 4 * n:4 + 8 * n])
+    if sys.byteorder != 'little':
+        values.byteswap()
+        ids.byteswap()
+    return values, ids
+
+
+class JobIndex:
+    """Reads an index directory and answers filter queries with doc ids (ascending)."""
+
+    def __init__(self, directory=INDEX_DIR):
+        self.directory = directory
+        with open(os.path.join(directory, "index.json"), 'r', encoding='utf-8') as f:
+            self.index = json.load(f)
+        self.total = self.index['total']
+        self._bitmaps = {}
+        self._ranges = {}
+        self._terms = {}
+        self._prefixes = {}
+
+    def _facet(self, name, value):
+        key = (name, value)
+        if key not in self._bitmaps:
+            encoded = self.index[name].get(value)
+            self._bitmaps[key] = int.from_bytes(base64.b64decode(encoded), 'little') if encoded else 0
+        return self._bitmaps[key]
+
+    def _range(self, name):
+        """(values, ids, checkpoints); checkpoints[k] is the bitset of ids[:k * RANGE_BLOCK]."""
+        if name not in self._ranges:
+            values, ids = _read_range(os.path.join(self.directory, self.index['ranges'][name]['file']))
+            checkpoints = [0]
+            for start in range(0, len(ids), RANGE_BLOCK):
+                checkpoints.append(checkpoints[-1] | _mask(ids[start:start + RANGE_BLOCK], self.total))
+            self._ranges[name] = (values, ids, checkpoints)
+        return self._ranges[name]
+
+    def _sorted_prefix_mask(self, name, end):
+        """Bitset of the docs holding the `end` smallest values."""
+        _, ids, checkpoints = self._range(name)
+        block = end // RANGE_BLOCK
+        return checkpoints[block] | _mask(ids[block * RANGE_BLOCK:end], self.total)
+
+    def _term_entries(self, c):
+        if c not in self._terms:
+            info = self.index['terms'].get(c)
+            entries = []
+            if info:
+                with open(os.path.join(self.directory, info['file']), 'r', encoding='utf-8') as f:
+                    entries = json.load(f)
+            self._terms[c] = ([e[0] for e in entries], [e[1] for e in entries])
+        return self._terms[c]
+
+    def _prefix_mask(self, prefix):
+        if prefix in self._prefixes:
+            return self._prefixes[prefix]
+        keys, postings = self._term_entries(prefix[0])
+        bits = bytearray((self.total + 7) // 8)
+        for i in range(bisect.bisect_left(keys, prefix), len(keys)):
+            if not keys[i].startswith(prefix):
+                break
+            for doc_id in postings[i]:
+                bits[doc_id >> 3] |= 1 << (doc_id & 7)
+        self._prefixes[prefix] = int.from_bytes(bits, 'little')
+        return self._prefixes[prefix]
+
+    def _range_mask(self, name, low, high):
+        values = self._range(name)[0]
+        start = bisect.bisect_left(values, low) if low is not None else 0
+        end = bisect.bisect_right(values, high) if high is not None else len(values)
+        if end <= start:
+            return 0  # low > high, or nothing in between
+        # Everything below `end` minus everything below `start`: at most two
+        # partial blocks are walked, whatever the width of the range
+        return self._sorted_prefix_mask(name, end) ^ self._sorted_prefix_mask(name, start)
+
+    def query_mask(self, rank=None, ship_type=None, agency=None, title=None,
+                   salary_min=None, salary_max=None, contract_min=None, contract_max=None):
+        """Bitset (int, bit i = doc id i) of the jobs matching every given filter."""
+        mask = (1 << self.total) - 1
+        if rank:
+            mask &= self._facet('rank', rank)
+        if ship_type:
+            mask &= self._facet('shipType', ship_type)
+        if agency:
+            mask &= _mask(self.index['agency'].get(agency, []), self.total)
+        for word in WORD_RE.findall((title or '').lower()):
+            if not mask:
+                break
+            mask &= self._prefix_mask(word)
+        if mask and (salary_min is not None or salary_max is not None):
+            mask &= self._range_mask('salary', salary_min, salary_max)
+        if mask and (contract_min is not None or contract_max is not None):
+            mask &= self._range_mask('contract', contract_min, contract_max)
+        return mask
+
+    def query(self, limit=None, **filters):
+        """Matching doc ids, ascending (newest job first); the first `limit` only if given."""
+        bits = bin(self.query_mask(**filters))[:1:-1]
+        ids, i = [], bits.find('1')
+        while i != -1 and (limit is None or len(ids) < limit):
+            ids.append(i)
+            i = bits.find('1', i + 1)
+        return ids
+
+    def count(self, **filters):
+        return bin(self.query_mask(**filters)).count('1')
+
+    def rows(self, ids):
+        """Job dicts for doc ids, reading only the shards they live in."""
+        size, fields, shards = self.index['shardSize'], self.index['fields'], {}
+        out = []
+        for doc_id in ids:
+            n = doc_id // size
+            if n not in shards:
+                with open(os.path.join(self.directory, self.index['shards'][n]['file']), 'r', encoding='utf-8') as f:
+                    shards[n] = json.load(f)
+            out.append({field: value for field, value in zip(fields, shards[n][doc_id % size]) if value is not None})
+        return out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Static job search index for the JobBoard")
+    sub = parser.add_subparsers(dest='command', required=True)
+    build_cmd = sub.add_parser('build', help="Index jobs from saved snapshots")
+    build_cmd.add_argument('files', nargs='*', default=[os.path.join("jobs", "latest_jobs.json")])
+    build_cmd.add_argument('--out', default=INDEX_DIR)
+    build_cmd.add_argument('--shard-size', type=int, default=SHARD_SIZE)
+    query_cmd = sub.add_parser('query', help="Run a filter query against a built index")
+    query_cmd.add_argument('--dir', default=INDEX_DIR)
+    query_cmd.add_argument('--rank')
+    query_cmd.add_argument('--ship-type')
+    query_cmd.add_argument('--agency')
+    query_cmd.add_argument('--title', help="Title words, each matched as a prefix")
+    query_cmd.add_argument('--salary-min', type=int)
+    query_cmd.add_argument('--salary-max', type=int)
+    query_cmd.add_argument('--contract-min', type=int)
+    query_cmd.add_argument('--contract-max', type=int)
+    query_cmd.add_argument('--limit', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        jobs = [job for path in args.files for job in read_jobs(path)]
+        normalize_jobs(jobs)  # snapshots saved before the numeric fields existed
+        fill_terms(jobs)  # scrape_mariaid_jobs.py saves no rank or ship type
+        report = write_job_index(jobs, args.out, args.shard_size)
+        print(f"🗂️  Indexed {report['jobs']} jobs in {report['index_build_ms']} ms -> {args.out} "
+              f"({report['files']} files, {report['bytes']} bytes, {report['written']} changed)")
+        return
+
+    index = JobIndex(args.dir)
+    started = time.perf_counter()
+    ids = index.query(rank=args.rank, ship_type=args.ship_type, agency=args.agency, title=args.title,
+                      salary_min=args.salary_min, salary_max=args.salary_max,
+                      contract_min=args.contract_min, contract_max=args.contract_max)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    print(f"🔎 {len(ids)} of {index.total} jobs in {elapsed_ms:.3f} ms")
+    for job in index.rows(ids[:args.limit]):
+        print(f"   {job.get('title')} | {job.get('rank')} | {job.get('salary') or '-'} | {job.get('contract') or '-'}")
+
+
+if __name__ == "__main__":
+    main()
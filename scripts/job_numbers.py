@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Numeric Job Attributes
+Turns the free-text salary, contract and vessel size of a posting into typed
+numbers at ingest, so range filters ("salary >= 3000", "DWT over 100k") run
+against indexed columns instead of parsing strings row by row.
+
+    salary    "$3500 - $4200", "USD 120/day", "Negotiable"
+              -> salary_min, salary_max, salary_currency, salary_period
+    contract  "8M (+1)", "6 months +/- 1"
+              -> contract_months, contract_extension_months
+    size      "DWT/GRT/TEU: 105940/57220", "160247/--"
+              -> dwt, grt, teu
+
+`normalize_jobs` works a column at a time: salary and contract strings repeat
+across a run (a handful of distinct values for hundreds of postings), so each
+distinct string is parsed once and the result is assigned to every job that
+carries it. The vessel size is read from the posting's own card in
+`raw_content` (the "DWT/GRT/TEU:" label after its title).
+
+Usage:
+    from job_numbers import normalize_jobs
+
+    normalize_jobs(jobs)   # sets job['salary_min'], ['contract_months'], ['dwt'], ...
+
+CLI:
+    python scripts/job_numbers.py stats [jobs/jobs_<stamp>.json ...]   # coverage over snapshots
+    python scripts/job_numbers.py parse "$3500 - $4200"
+"""
+
+import os
+import re
+import glob
+import json
+import argparse
+
+from job_sinks import read_jobs
+
+NUMERIC_FIELDS = (
+    'salary_min', 'salary_max', 'salary_currency', 'salary_period',
+    'contract_months', 'contract_extension_months', 'dwt', 'grt', 'teu',
+)
+SIZE_FIELDS = ('dwt', 'grt', 'teu')
+SIZE_ALIASES = {'gt': 'grt'}
+
+CURRENCIES = (
+    (re.compile(r'\$|\bUSD\b|\bUS\s*dollars?\b', re.IGNORECASE), 'USD'),
+    (re.compile(r'€|\bEUR\b|\beuros?\b', re.IGNORECASE), 'EUR'),
+    (re.compile(r'£|\bGBP\b', re.IGNORECASE), 'GBP'),
+    (re.compile(r'৳|\bBDT\b|\bTk\.?(?=\s|\d|$)|\btaka\b', re.IGNORECASE), 'BDT'),
+)
+PERIODS = (
+    (re.compile(r'/\s*(?:day|d)\b|\bper\s+day\b|\bdaily\b|\ba\s+day\b', re.IGNORECASE), 'day'),
+    (re.compile(r'/\s*(?:week|wk)\b|\bper\s+week\b|\bweekly\b', re.IGNORECASE), 'week'),
+    (re.compile(r'/\s*(?:year|yr|annum)\b|\bper\s+(?:year|annum)\b|\bp\.?a\.?\b|\bannual(?:ly)?\b', re.IGNORECASE), 'year'),
+)
+DEFAULT_PERIOD = 'month'  # crew wages are quoted per month unless the posting says otherwise
+MIN_BARE_AMOUNT = 100  # amounts without a currency below this are not read as wages
+
+AMOUNT = r'(\d[\d,]*(?:\.\d+)?)\s*([kK])?'
+SALARY_RANGE_RE = re.compile(AMOUNT + r'(?:\s*(?:-|–|to)\s*(?:[$€£৳]|USD|EUR|GBP|BDT)?\s*' + AMOUNT + r')?')
+CONTRACT_RE = re.compile(
+    r'(\d{1,2})\s*(?:M\b|MONTHS?\b|MOS?\b)\s*(?:\(\s*[+±]\s*(\d{1,2})\s*(?:M\w*)?\s*\)|(?:\+/-|[+±])\s*(\d{1,2}))?',
+    re.IGNORECASE)
+SIZE_LABEL_RE = re.compile(r'((?:DWT|GRT|GT|TEU)(?:\s*/\s*(?:DWT|GRT|GT|TEU))*)\s*:\s*([\d,.\s/-]+)', re.IGNORECASE)
+SALARY_LABEL_RE = re.compile(r'Salary\s*:\s*([^|]+)', re.IGNORECASE)
+CARD_END = ' | Apply Now'
+
+
+def _amount(digits, thousands):
+    value = float(digits.replace(',', ''))
+    return int(round(value * 1000 if thousands else value))
+
+
+def parse_salary(text):
+    """(min, max, currency, period) for a salary string, or None if it has no amount ("Negotiable")."""
+    if not text:
+        return None
+    match = SALARY_RANGE_RE.search(text)
+    if not match:
+        return None
+    low = _amount(match.group(1), match.group(2))
+    high = _amount(match.group(3), match.group(4) or match.group(2)) if match.group(3) else low
+    if high < low:
+        low, high = high, low
+    currency = next((code for pattern, code in CURRENCIES if pattern.search(text)), None)
+    if currency is None and high < MIN_BARE_AMOUNT:
+        return None  # "8M (+1)", "2 positions": a bare small number is not a wage
+    period = next((name for pattern, name in PERIODS if pattern.search(text)), DEFAULT_PERIOD)
+    return low, high, currency, period
+
+
+def parse_contract(text):
+    """(months, extension months) for "8M (+1)" / "6 months +/- 1" / "4M", or None."""
+    match = CONTRACT_RE.search(text or '')
+    if not match:
+        return None
+    extension = match.group(2) or match.group(3)
+    return int(match.group(1)), int(extension) if extension else 0
+
+
+def parse_size(text):
+    """{'dwt', 'grt', 'teu'} from a "DWT/GRT/TEU: 105940/57220" label; missing values ("--") are None."""
+    match = SIZE_LABEL_RE.search(text or '')
+    if not match:
+        return None
+    labels = [SIZE_ALIASES.get(label, label) for label in (l.strip().lower() for l in match.group(1).split('/'))]
+    size = {}
+    for label, value in zip(labels, match.group(2).split('/')):
+        digits = re.sub(r'[^\d]', '', value.split('.')[0])
+        if label in SIZE_FIELDS and digits:
+            size[label] = int(digits)
+    return size or None
+
+
+def monthly(value, period):
+    """A salary amount per month; the same integer arithmetic as the *_monthly columns in migration 006."""
+    if value is None:
+        return None
+    if period == 'day':
+        return value * 30
+    if period == 'week':
+        return value * 52 // 12
+    if period == 'year':
+        return value // 12
+    return value
+
+
+def card_text(job):
+    """The part of raw_content that belongs to this posting's card.
+
+    Newer snapshots hold one card per job; older ones hold the whole listing
+    page, so the card is taken from the job's title up to its "Apply Now".
+    """
+    raw = job.get('raw_content') or job.get('raw_text') or ''
+    title = job.get('title')
+    start = raw.find(title) if title else -1
+    if start < 0:
+        return raw
+    end = raw.find(CARD_END, start)
+    return raw[start:end if end >= 0 else len(raw)]
+
+
+def _salary_label(card):
+    # The card label keeps the whole range ("$3500 - $4200"); the scraped
+    # salary field is the fallback for postings without one
+    match = SALARY_LABEL_RE.search(card)
+    return match.group(1).strip() if match else None
+
+
+def normalize_job(job):
+    """Set the numeric fields on one job (dict or JobPosting). Returns the job."""
+    normalize_jobs([job])
+    return job
+
+
+def normalize_jobs(jobs, metrics=None):
+    """Set the numeric fields on every job, parsing each distinct string once. Returns the count with a salary."""
+    cards = [card_text(job) for job in jobs]
+    card_fields = {card: (_salary_label(card), parse_size(card)) for card in set(cards)}
+    salary_texts = [card_fields[card][0] or job.get('salary') for job, card in zip(jobs, cards)]
+    contract_texts = [job.get('contract') for job in jobs]
+    salaries = {text: parse_salary(text) for text in set(salary_texts)}
+    contracts = {text: parse_contract(text) for text in set(contract_texts)}
+
+    with_salary = 0
+    for job, card, salary_text, contract_text in zip(jobs, cards, salary_texts, contract_texts):
+        salary = salaries[salary_text]
+        if salary:
+            job['salary_min'], job['salary_max'], job['salary_currency'], job['salary_period'] = salary
+            with_salary += 1
+        contract = contracts[contract_text]
+        if contract:
+            job['contract_months'], job['contract_extension_months'] = contract
+        size = card_fields[card][1]
+        if size:
+            for field, value in size.items():
+                job[field] = value
+
+    if metrics is not None:
+        metrics.inc('jobs_with_salary', with_salary)
+    return with_salary
+
+
+def coverage(jobs):
+    """Share of jobs with each numeric field set."""
+    total = len(jobs) or 1
+    return {field: round(sum(job.get(field) is not None for job in jobs) / total, 3) for field in NUMERIC_FIELDS}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Normalize salary, contract and vessel size into numbers")
+    sub = parser.add_subparsers(dest='command', required=True)
+    stats_cmd = sub.add_parser('stats', help="Normalize archived snapshots and report field coverage")
+    stats_cmd.add_argument('paths', nargs='*')
+    parse_cmd = sub.add_parser('parse', help="Parse one salary / contract / size string")
+    parse_cmd.add_argument('text')
+    args = parser.parse_args(argv)
+
+    if args.command == 'parse':
+        print(json.dumps({'salary': parse_salary(args.text), 'contract': parse_contract(args.text),
+                          'size': parse_size(args.text)}, indent=2))
+        return
+
+    paths = args.paths or glob.glob(os.path.join("jobs", "jobs_[0-9]*.*json"))
+    jobs = [job for path in sorted(paths) for job in read_jobs(path)]
+    normalize_jobs(jobs)
+    print(f"🔢 Normalized {len(jobs)} jobs from {len(paths)} snapshots")
+    print(json.dumps(coverage(jobs), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+JobPosting Record
+A compact, slotted record for scraped jobs, shared by the scrapers, the
+enrichment step and the output sinks.
+
+- Fixed fields (`FIELDS`) in `__slots__`, so no per-record dict.
+- Categorical values (rank, ship type, source, agency, statuses) are interned,
+  so thousands of postings share one string per distinct value.
+- The posting text is held once in `raw_content`; `raw_text` and the
+  `description` in parsed_content are the same object, not copies.
+- `duplicate_of` / `similarity` are set by near_dup.py when the posting
+  repeats one already indexed, and carried into parsed_content.
+- `salary_min` ... `teu` are the typed salary, contract and vessel size set
+  by job_numbers.py, written to their own `job_postings` columns.
+- `to_row()` / `to_parsed_content()` encode straight to the `job_postings`
+  row and its `parsed_content` JSONB shape.
+
+It also answers `get()`, `[]` and `in` with dict keys (including the legacy
+`raw_text` / `shipType` spellings), so code written against job dicts keeps
+working.
+
+Usage:
+    from job_posting import JobPosting
+
+    job = JobPosting.from_dict({'title': 'AB - Crude Oil', 'raw_text': text})
+    job['rank'] = 'AB'
+    row = job.to_row()
+"""
+
+import sys
+
+FIELDS = (
+    'title', 'rank', 'ship_type', 'salary', 'contract', 'positions', 'apply_url',
+    'source', 'mla_number', 'agency',
+    'agent_name', 'agent_address', 'agent_email', 'agent_cities', 'agent_status',
+    'agent_validity', 'license_flag',
+    'raw_content', 'scraped_at',
+    'duplicate_of', 'similarity',
+    'salary_min', 'salary_max', 'salary_currency', 'salary_period',
+    'contract_months', 'contract_extension_months', 'dwt', 'grt', 'teu',
+)
+INTERNED_FIELDS = frozenset({
+    'rank', 'ship_type', 'source', 'mla_number', 'agency', 'agent_status', 'license_flag',
+    'salary_currency', 'salary_period',
+})
+ALIASES = {
+    'raw_text': 'raw_content',
+    'shipType': 'ship_type',
+    'description': 'raw_content',
+}
+DEFAULT_JOINING_DATE = 'ASAP'
+_FIELD_SET = frozenset(FIELDS)
+_PLAIN_FIELDS = tuple(f for f in FIELDS if f not in INTERNED_FIELDS and f != 'agent_cities')
+
+
+def _normalize(field, value):
+    if value is None:
+        return None
+    if field in INTERNED_FIELDS and type(value) is str:
+        return sys.intern(value)
+    if field == 'agent_cities':
+        return tuple(sys.intern(c) for c in value)
+    return value
+
+
+class JobPosting:
+    __slots__ = FIELDS + ('extra',)
+
+    def __init__(self, **fields):
+        for field in FIELDS:
+            setattr(self, field, None)
+        self.extra = None
+        for key, value in fields.items():
+            self[key] = value
+
+    @classmethod
+    def from_dict(cls, data):
+        if isinstance(data, cls):
+            return data
+        job = cls.__new__(cls)
+        job.extra = None
+        get = data.get
+        matched = 0
+        for field in _PLAIN_FIELDS:
+            value = get(field)
+            setattr(job, field, value)
+            matched += value is not None or field in data
+        for field in INTERNED_FIELDS:
+            value = get(field)
+            setattr(job, field, sys.intern(value) if type(value) is str else value)
+            matched += value is not None or field in data
+        cities = get('agent_cities')
+        job.agent_cities = tuple(sys.intern(c) for c in cities) if cities is not None else None
+        matched += 'agent_cities' in data
+        if matched < len(data):
+            # Legacy spellings (raw_text, shipType) and unknown keys
+            for key, value in data.items():
+                if key not in _FIELD_SET:
+                    job[key] = value
+        return job
+
+    @property
+    def raw_text(self):
+        return self.raw_content
+
+    def __setitem__(self, key, value):
+        field = ALIASES.get(key, key)
+        if field in FIELDS:
+            setattr(self, field, _normalize(field, value))
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __getitem__(self, key):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def get(self, key, default=None):
+        field = ALIASES.get(key, key)
+        if field in FIELDS:
+            value = getattr(self, field)
+        else:
+            value = self.extra.get(key) if self.extra else None
+        return default if value is None else value
+
+    def __repr__(self):
+        return f"JobPosting(title={self.title!r}, rank={self.rank!r}, mla_number={self.mla_number!r})"
+
+    def to_dict(self):
+        """Plain dict for JSON output (None fields omitted)."""
+        data = {}
+        for field in FIELDS:
+            value = getattr(self, field)
+            if value is not None:
+                data[field] = list(value) if field == 'agent_cities' else value
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def to_parsed_content(self):
+        """The parsed_content JSONB shape the job board reads."""
+        salary, agency, contact = self.salary, self.agency, self.apply_url or ''
+        return {
+            'rank': self.rank,
+            'shipType': self.ship_type or 'Other',
+            'salary': salary,
+            'wage': salary,
+            'joining_date': DEFAULT_JOINING_DATE,
+            'joiningDate': DEFAULT_JOINING_DATE,
+            'description': self.raw_content or '',
+            'company': agency,
+            'companyName': agency,
+            'mla_number': self.mla_number,
+            'contact': contact,
+            'contactInfo': contact,
+            'agentName': self.agent_name,
+            'agentStatus': self.agent_status,
+            'licenseValidity': self.agent_validity,
+            'licenseFlag': self.license_flag,
+            'duplicateOf': self.duplicate_of,
+            'similarity': self.similarity,
+        }
+
+    def to_row(self):
+        """A job_postings row (status 'parsed', since the scraper already extracted the fields)."""
+        return {
+            'raw_content': self.raw_content or '',
+            'source': self.source or 'MariAid',
+            'status': 'parsed',
+            'rank': self.rank or 'Other',
+            'salary': self.salary,
+            'joining_date': DEFAULT_JOINING_DATE,
+            'mla_number': self.mla_number,
+            'agency': self.agency,
+            'agency_address': self.agent_address,
+            'agency_email': self.agent_email,
+            'salary_min': self.salary_min,
+            'salary_max': self.salary_max,
+            'salary_currency': self.salary_currency,
+            'salary_period': self.salary_period,
+            'contract_months': self.contract_months,
+            'contract_extension_months': self.contract_extension_months,
+            'dwt': self.dwt,
+            'grt': self.grt,
+            'teu': self.teu,
+            'parsed_content': self.to_parsed_content(),
+        }
@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+Job Output Sinks
+Writes scraped jobs to several outputs in one pass. Each record is handed to
+every sink as it streams through `write_jobs`, so nothing is serialized twice
+and no sink needs the whole list up front.
+
+Sinks:
+- JSONSnapshotSink  latest_jobs.json ({"scraped_at", "jobs", "total_jobs"})
+- NDJSONSink        one JSON object per line
+- CSVSink           fixed JOB_FIELDS columns, gzip-compressed by default
+- ParquetSink       fixed schema, needs pyarrow
+- SupabaseBatchSink batched inserts into job_postings via PostgREST
+
+File sinks write to `<path>.tmp` and rename into place when the run finishes,
+so readers never see a half-written file. Every sink finishes its temp file
+before any of them is renamed: if one fails, all temp files are removed and
+the previous outputs are left untouched.
+
+Usage:
+    from job_sinks import write_jobs, local_sinks
+
+    stats = write_jobs(jobs, local_sinks("jobs", timestamp, "jobs/latest_jobs.json"))
+"""
+
+import io
+import os
+import csv
+import gzip
+import json
+import time
+import hashlib
+import importlib.util
+from datetime import datetime
+
+from job_posting import FIELDS
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Fixed output schema (CSV columns / Parquet fields) shared with JobPosting.
+# Keys outside it are kept in JSON/NDJSON output only.
+JOB_FIELDS = list(FIELDS)
+INT_FIELDS = {'positions', 'salary_min', 'salary_max', 'contract_months', 'contract_extension_months',
+              'dwt', 'grt', 'teu'}
+FLOAT_FIELDS = {'similarity'}
+LIST_FIELDS = {'agent_cities'}
+
+
+def _dumps(record, pretty=False):
+    """Serialize one record to UTF-8 JSON bytes (orjson when installed)."""
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_INDENT_2 if pretty else 0)
+    if pretty:
+        return json.dumps(record, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _as_dict(job):
+    """JobPosting records expose to_dict(); plain dicts pass through."""
+    to_dict = getattr(job, 'to_dict', None)
+    return to_dict() if to_dict else job
+
+
+def content_hash(job):
+    """Stable id for a posting, used to dedupe inserts (stored as source_id)."""
+    text = job.get('raw_content') or job.get('raw_text') or ''
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+class Sink:
+    name = 'sink'
+
+    def open(self):
+        pass
+
+    def write(self, job):
+        raise NotImplementedError
+
+    def finish(self):
+        """Flush everything still buffered. Returns the number of bytes written (0 if not a file)."""
+        return 0
+
+    def commit(self):
+        """Publish what finish() wrote."""
+        pass
+
+    def close(self):
+        size = self.finish()
+        self.commit()
+        return size
+
+    def abort(self):
+        pass
+
+
+class _FileSink(Sink):
+    """Writes to <path>.tmp and renames over <path> on commit()."""
+
+    def __init__(self, path):
+        self.path = path
+        self.tmp_path = f"{path}.tmp"
+        self._f = None
+
+    def open(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self._f = open(self.tmp_path, 'wb')
+
+    def finish(self):
+        self._f.close()
+        return os.path.getsize(self.tmp_path)
+
+    def commit(self):
+        os.replace(self.tmp_path, self.path)
+
+    def abort(self):
+        if self._f is not None:
+            self._f.close()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+
+class NDJSONSink(_FileSink):
+    name = 'ndjson'
+
+    def write(self, job):
+        self._f.write(_dumps(_as_dict(job)) + b'\n')
+
+
+class JSONSnapshotSink(_FileSink):
+    """The latest_jobs.json layout, streamed: records first, total at the end."""
+    name = 'json'
+
+    def open(self):
+        super().open()
+        self._count = 0
+        self._f.write(b'{\n  "scraped_at": ' + _dumps(datetime.utcnow().isoformat()) + b',\n  "jobs": [')
+
+    def write(self, job):
+        body = _dumps(_as_dict(job), pretty=True).replace(b'\n', b'\n    ')
+        self._f.write((b',\n    ' if self._count else b'\n    ') + body)
+        self._count += 1
+
+    def finish(self):
+        self._f.write((b'\n  ]' if self._count else b']') + f',\n  "total_jobs": {self._count}\n}}'.encode())
+        return super().finish()
+
+
+class CSVSink(_FileSink):
+    name = 'csv'
+
+    def __init__(self, path, fields=JOB_FIELDS, compress=True):
+        super().__init__(path)
+        self.fields = fields
+        self.compress = compress
+
+    def open(self):
+        super().open()
+        raw = gzip.GzipFile(fileobj=self._f, mode='wb', compresslevel=6, mtime=0) if self.compress else self._f
+        self._gz = raw if self.compress else None
+        self._text = io.TextIOWrapper(raw, encoding='utf-8', newline='')
+        self._writer = csv.writer(self._text)
+        self._writer.writerow(self.fields)
+
+    def write(self, job):
+        row = []
+        for field in self.fields:
+            value = job.get(field)
+            if value is None:
+                row.append('')
+            elif field in LIST_FIELDS:
+                row.append('; '.join(value))
+            else:
+                row.append(value)
+        self._writer.writerow(row)
+
+    def finish(self):
+        self._text.flush()
+        self._text.detach()
+        if self._gz is not None:
+            self._gz.close()
+        return super().finish()
+
+
+class ParquetSink(_FileSink):
+    """Columnar output with a fixed schema, written in row groups as records arrive."""
+    name = 'parquet'
+
+    def __init__(self, path, fields=JOB_FIELDS, row_group_size=1000):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError('Parquet output needs pyarrow: pip install pyarrow')
+        super().__init__(path)
+        self._pa, self._pq = pa, pq
+        self.fields = fields
+        self.row_group_size = row_group_size
+        self.schema = pa.schema([
+            (f, pa.int32() if f in INT_FIELDS else pa.float32() if f in FLOAT_FIELDS
+             else pa.list_(pa.string()) if f in LIST_FIELDS else pa.string())
+            for f in fields
+        ])
+
+    def open(self):
+        super().open()
+        self._writer = self._pq.ParquetWriter(self._f, self.schema, compression='zstd')
+        self._columns = {f: [] for f in self.fields}
+        self._rows = 0
+
+    def write(self, job):
+        for field in self.fields:
+            self._columns[field].append(job.get(field))
+        self._rows += 1
+        if self._rows >= self.row_group_size:
+            self._flush()
+
+    def _flush(self):
+        if self._rows:
+            self._writer.write_table(self._pa.table(self._columns, schema=self.schema))
+            self._columns = {f: [] for f in self.fields}
+            self._rows = 0
+
+    def finish(self):
+        self._flush()
+        self._writer.close()
+        return super().finish()
+
+
+def parquet_available():
+    return importlib.util.find_spec('pyarrow') is not None
+
+
+class SupabaseBatchSink(Sink):
+    """
+    Inserts jobs into job_postings in batches through PostgREST.
+
+    Rows are keyed by a content hash stored in `source_id`; each batch does one
+    lookup for hashes that already exist and one bulk insert for the rest.
+    """
+    name = 'supabase'
+
+    def __init__(self, http, supabase_url, supabase_key, to_row=None, batch_size=50, timeout=(5, 30), metrics=None):
+        self.http = http
+        self.endpoint = f"{supabase_url}/rest/v1/job_postings"
+        self.headers = {
+            'apikey': supabase_key,
+            'Authorization': f'Bearer {supabase_key}',
+            'Content-Type': 'application/json',
+        }
+        self.to_row = to_row or (lambda job: job.to_row())  # JobPosting records encode themselves
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self.metrics = metrics
+        self.uploaded = 0
+        self.skipped = 0
+        self.failed = 0
+        self._batch = []
+
+    def _inc(self, name, value):
+        if self.metrics is not None and value:
+            self.metrics.inc(name, value)
+
+    def write(self, job):
+        self._batch.append(job)
+        if len(self._batch) >= self.batch_size:
+            self._flush()
+
+    def _flush(self):
+        batch, self._batch = self._batch, []
+        if not batch:
+            return
+        rows = {}
+        for job in batch:
+            row = self.to_row(job)
+            row['source_id'] = content_hash(job)
+            rows.setdefault(row['source_id'], row)
+
+        try:
+            response = self.http.get(
+                self.endpoint,
+                params={'select': 'source_id', 'source_id': f"in.({','.join(rows)})"},
+                headers=self.headers, timeout=self.timeout,
+            )
+            response.raise_for_status()
+            existing = {r['source_id'] for r in response.json()}
+            new_rows = [row for key, row in rows.items() if key not in existing]
+            self.skipped += len(batch) - len(new_rows)
+            self._inc('uploads_skipped', len(batch) - len(new_rows))
+            if new_rows:
+                response = self.http.post(
+                    self.endpoint, data=_dumps(new_rows),
+                    headers={**self.headers, 'Prefer': 'return=minimal'}, timeout=self.timeout,
+                )
+                response.raise_for_status()
+                self.uploaded += len(new_rows)
+                self._inc('uploads_ok', len(new_rows))
+                print(f"   ✅ Uploaded batch of {len(new_rows)} ({len(batch) - len(new_rows)} already present)")
+            else:
+                print(f"   ⏭️  Skipped batch of {len(batch)} (all already present)")
+        except Exception as e:
+            self.failed += len(batch)
+            self._inc('upload_errors', len(batch))
+            print(f"   ❌ Batch of {len(batch)} failed: {e}")
+
+    def finish(self):
+        self._flush()
+        return 0
+
+    def abort(self):
+        self._batch = []
+
+
+def local_sinks(jobs_dir, timestamp, latest_file, csv_file=True, parquet=None):
+    """latest_jobs.json plus timestamped NDJSON, gzip CSV and (with pyarrow) Parquet snapshots."""
+    base = os.path.join(jobs_dir, f"jobs_{timestamp}")
+    sinks = [JSONSnapshotSink(latest_file), NDJSONSink(f"{base}.ndjson")]
+    if csv_file:
+        sinks.append(CSVSink(f"{base}.csv.gz"))
+    if parquet if parquet is not None else parquet_available():
+        sinks.append(ParquetSink(f"{base}.parquet"))
+    return sinks
+
+
+def read_jobs(path):
+    """Read jobs back from a JSON snapshot (latest_jobs.json), a JSON list or NDJSON file."""
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.endswith('.ndjson'):
+            return [json.loads(line) for line in f if line.strip()]
+        data = json.load(f)
+    return data['jobs'] if isinstance(data, dict) else data
+
+
+def write_jobs(jobs, sinks):
+    """
+    Stream jobs (any iterable) into every sink in one pass.
+
+    Returns {sink_name: {'path', 'records', 'bytes', 'seconds'}}. Nothing is
+    renamed into place until every sink has finished; on error all sinks are
+    aborted and the exception is re-raised.
+    """
+    timings = {sink: 0.0 for sink in sinks}
+    for sink in sinks:
+        t0 = time.perf_counter()
+        sink.open()
+        timings[sink] += time.perf_counter() - t0
+
+    count = 0
+    try:
+        for job in jobs:
+            for sink in sinks:
+                t0 = time.perf_counter()
+                sink.write(job)
+                timings[sink] += time.perf_counter() - t0
+            count += 1
+        sizes = {}
+        for sink in sinks:
+            t0 = time.perf_counter()
+            sizes[sink] = sink.finish()
+            timings[sink] += time.perf_counter() - t0
+        stats = {}
+        for sink in sinks:
+            t0 = time.perf_counter()
+            sink.commit()
+            timings[sink] += time.perf_counter() - t0
+            stats[sink.name] = {
+                'path': getattr(sink, 'path', None),
+                'records': count,
+                'bytes': sizes[sink],
+                'seconds': round(timings[sink], 6),
+            }
+        return stats
+    except BaseException:
+        for sink in sinks:
+            sink.abort()
+        raise
+
+
+def report_sinks(stats, metrics=None):
+    """Print where each file sink wrote; sizes go to the run metrics when given."""
+    for sink in stats.values():
+        if sink['path']:
+            print(f"💾 Saved to {sink['path']} ({sink['bytes']:,} bytes, {sink['seconds'] * 1000:.1f} ms)")
+            if metrics is not None:
+                metrics.inc('bytes_written', sink['bytes'])
+    if metrics is not None:
+        metrics.set_info('sinks', stats)
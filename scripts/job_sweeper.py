@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Job Staleness Sweeper
+Expires job_postings rows whose vacancy is no longer listed at the source.
+
+After a scrape the content hashes (`source_id`) of every job still listed are
+sent in one call to the `sweep_stale_jobs` database function
+(supabase/migrations/005_job_staleness_sweeper.sql). It takes the set
+difference against the source's active rows and updates them in one batched
+statement: rows seen again reset `missed_runs`, missing rows increment it and
+expire once it reaches MAX_MISSED_RUNS.
+
+Usage:
+    from job_sweeper import sweep_stale_jobs
+
+    sweep_stale_jobs(http, SUPABASE_URL, SUPABASE_KEY, jobs, metrics=metrics)
+"""
+
+import os
+
+from job_sinks import content_hash
+
+# Constants
+SOURCE = "MariAid"
+MAX_MISSED_RUNS = int(os.environ.get("STALE_AFTER_RUNS", "3"))
+
+
+def sweep_params(jobs, source=SOURCE, max_missed=MAX_MISSED_RUNS):
+    """Arguments for the sweep_stale_jobs RPC."""
+    return {
+        'p_source': source,
+        'p_seen_ids': sorted({content_hash(job) for job in jobs}),
+        'p_max_missed': max_missed,
+    }
+
+
+def report_sweep(result, metrics=None):
+    """Print and record the RPC's {active, seen, missed, expired} counts (an empty result is a zero sweep)."""
+    if isinstance(result, list):
+        result = result[0] if result else None
+    if not result:
+        result = {'active': 0, 'seen': 0, 'missed': 0, 'expired': 0}
+    print(f"🧹 Swept {result['active']} active rows against {result['seen']} listed jobs: "
+          f"{result['missed']} missing, {result['expired']} expired")
+    if metrics is not None:
+        metrics.inc('jobs_missing', result['missed'])
+        metrics.inc('jobs_expired', result['expired'])
+        metrics.set_info('sweep', result)
+    return result
+
+
+def sweep_stale_jobs(http, supabase_url, supabase_key, jobs, source=SOURCE, max_missed=MAX_MISSED_RUNS,
+                     timeout=(5, 30), metrics=None):
+    """
+    Call sweep_stale_jobs through PostgREST. Returns the counts, or None if the
+    sweep was skipped (no jobs) or failed; a failed sweep never fails the run.
+    """
+    if not jobs:
+        print("⚠️  Skipping staleness sweep (no jobs scraped)")
+        return None
+    try:
+        response = http.post(
+            f"{supabase_url}/rest/v1/rpc/sweep_stale_jobs",
+            json=sweep_params(jobs, source, max_missed),
+            headers={
+                'apikey': supabase_key,
+                'Authorization': f'Bearer {supabase_key}',
+                'Content-Type': 'application/json',
+            },
+            timeout=timeout,
+        )
+        response.raise_for_status()
+        return report_sweep(response.json(), metrics)
+    except Exception as e:
+        if metrics is not None:
+            metrics.inc('sweep_errors')
+        print(f"❌ Staleness sweep failed: {e}")
+        return None
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Job Terms
+Rank and ship type as the scrapers spell them ('Able Seaman', 'Oil Tanker'),
+read from a posting's title or text. Shared by the scrapers, near-duplicate
+detection and the static job index, so every consumer agrees on one spelling
+whichever scraper produced the record.
+
+Usage:
+    from job_terms import extract_rank, extract_ship_type
+
+    extract_rank('AB - Crude Oil Tanker')   # 'Able Seaman'
+    extract_ship_type(raw_content)          # 'Oil Tanker'
+"""
+
+
+def extract_rank(title):
+    """Extract rank from job title"""
+    title_upper = title.upper()
+
+    # Common maritime ranks
+    rank_mapping = {
+        'MASTER': 'Master',
+        'CAPTAIN': 'Master',
+        'CHIEF OFFICER': 'Chief Officer',
+        'C/O': 'Chief Officer',
+        '2ND OFFICER': '2nd Officer',
+        '2/O': '2nd Officer',
+        '3RD OFFICER': '3rd Officer',
+        '3/O': '3rd Officer',
+        'CHIEF ENGINEER': 'Chief Engineer',
+        'C/E': 'Chief Engineer',
+        '2ND ENGINEER': '2nd Engineer',
+        '2/E': '2nd Engineer',
+        '3RD ENGINEER': '3rd Engineer',
+        '3/E': '3rd Engineer',
+        'ELECTRO TECHNICAL OFFICER': 'Electro Technical Officer',
+        'ETO': 'Electro Technical Officer',
+        'BOSUN': 'Bosun',
+        'AB': 'Able Seaman',
+        'ABLE SEAMAN': 'Able Seaman',
+        'OILER': 'Oiler',
+        'FITTER': 'Fitter',
+        'COOK': 'Cook',
+        'STEWARD': 'Steward',
+        # Spellings on the MariAid cards
+        'SECOND OFF': '2nd Officer',
+        'THIRD OFF': '3rd Officer',
+        'SECOND ENG': '2nd Engineer',
+        'THIRD ENG': '3rd Engineer',
+        '4TH ENGINEER': '4th Engineer',
+        '4/E': '4th Engineer',
+    }
+
+    for pattern, rank in rank_mapping.items():
+        if pattern in title_upper:
+            return rank
+
+    return 'Other'
+
+
+def extract_ship_type(text):
+    """Extract ship type from text"""
+    text_upper = text.upper()
+
+    if any(word in text_upper for word in ['TANKER', 'VLCC', 'AFRAMAX', 'SUEZMAX', 'CRUDE OIL', 'OIL/PRODUCT']):
+        return 'Oil Tanker'
+    elif 'BULK' in text_upper or 'BULKER' in text_upper:
+        return 'Bulk Carrier'
+    elif 'CONTAINER' in text_upper:
+        return 'Container'
+    elif 'LNG' in text_upper:
+        return 'LNG Carrier'
+    elif 'LPG' in text_upper:
+        return 'LPG Carrier'
+    elif 'CHEMICAL' in text_upper or 'OIL/CHEM' in text_upper:
+        return 'Chemical Tanker'
+    elif 'RO-RO' in text_upper or 'RORO' in text_upper:
+        return 'RoRo'
+
+    return 'Other'
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate Job Detection
+MinHash signatures over normalized posting text, indexed with LSH in a SQLite
+file so lookups stay sub-linear and the index survives between runs.
+
+A posting is a near-duplicate when its estimated Jaccard similarity (word
+3-gram shingles) with an indexed posting is at least THRESHOLD and the two do
+not name different ranks (cards for several ranks on one vessel differ by a
+single word). Ranks are compared in one spelling (`canonical_rank`), so the
+title prefix "AB - Crude Oil" and the rank 'Able Seaman' set by another
+scraper name the same rank. Reposts with small edits, the same vacancy from several
+agencies, or the same text arriving via Telegram and the website all map to
+the first posting seen (`duplicate_of` holds its content hash).
+
+Usage:
+    from near_dup import NearDupIndex, mark_near_duplicates
+
+    with NearDupIndex() as index:
+        mark_near_duplicates(jobs, index)   # sets job['duplicate_of'] / ['similarity']
+
+CLI:
+    python scripts/near_dup.py build jobs/jobs_*.json jobs/jobs_*.ndjson
+    python scripts/near_dup.py backfill        # existing job_postings rows (all sources)
+    python scripts/near_dup.py query "AB - Crude Oil | Salary: $1200 ..."
+    python scripts/near_dup.py stats
+"""
+
+import os
+import re
+import sys
+import json
+import glob
+import zlib
+import random
+import sqlite3
+import hashlib
+import argparse
+from array import array
+from datetime import datetime
+
+from job_sinks import content_hash, read_jobs
+from job_terms import extract_rank
+
+# Constants
+INDEX_FILE = os.environ.get("NEAR_DUP_INDEX", os.path.join(".cache", "near_dup.sqlite"))
+THRESHOLD = 0.8
+NUM_PERM = 128
+BANDS = 16  # 16 bands x 8 rows: candidate pairs start around Jaccard 0.7
+SHINGLE_SIZE = 3
+SEED = 1
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+BOILERPLATE = re.compile(r'\b(view details|apply now|careers at sea|home|careers)\b')
+NON_WORD = re.compile(r'[^a-z0-9$]+')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS postings (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    source TEXT,
+    title TEXT,
+    rank TEXT,
+    first_seen TEXT NOT NULL,
+    duplicate_of TEXT,
+    signature BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS lsh (bucket INTEGER NOT NULL, posting_id INTEGER NOT NULL);
+CREATE INDEX IF NOT EXISTS lsh_bucket ON lsh (bucket);
+"""
+
+
+def normalize(text):
+    text = BOILERPLATE.sub(' ', (text or '').lower())
+    return NON_WORD.sub(' ', text).split()
+
+
+def shingles(text, k=SHINGLE_SIZE):
+    """Stable 32-bit hashes of the word k-grams (the whole text if shorter than k)."""
+    words = normalize(text)
+    if len(words) < k:
+        grams = [' '.join(words)] if words else []
+    else:
+        grams = [' '.join(words[i:i + k]) for i in range(len(words) - k + 1)]
+    return {zlib.crc32(g.encode('utf-8')) for g in grams}
+
+
+class MinHasher:
+    def __init__(self, num_perm=NUM_PERM, seed=SEED):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self.perms = [(rng.randrange(1, MERSENNE_PRIME), rng.randrange(0, MERSENNE_PRIME)) for _ in range(num_perm)]
+
+    def signature(self, text):
+        hashes = shingles(text)
+        if not hashes:
+            return array('Q', [MAX_HASH] * self.num_perm)
+        p = MERSENNE_PRIME
+        return array('Q', [min([(a * x + b) % p for x in hashes]) & MAX_HASH for a, b in self.perms])
+
+
+def similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity: the share of matching MinHash slots."""
+    return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / len(sig_a)
+
+
+class NearDupIndex:
+    """Persistent MinHash/LSH index. Usable as a context manager (commits on exit)."""
+
+    def __init__(self, path=INDEX_FILE, threshold=THRESHOLD, num_perm=NUM_PERM, bands=BANDS):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.path = path
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.hasher = MinHasher(num_perm)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._check_params({'num_perm': str(num_perm), 'bands': str(bands), 'seed': str(SEED),
+                            'shingle_size': str(SHINGLE_SIZE)})
+
+    def _check_params(self, params):
+        stored = dict(self.conn.execute("SELECT key, value FROM meta"))
+        if not stored:
+            self.conn.executemany("INSERT INTO meta (key, value) VALUES (?, ?)", params.items())
+            self.conn.commit()
+        elif stored != params:
+            raise ValueError(f"{self.path} was built with {stored}, not {params}; rebuild the index")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(commit=exc_type is None)
+
+    def close(self, commit=True):
+        if commit:
+            self.conn.commit()
+        self.conn.close()
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM postings").fetchone()[0]
+
+    def _buckets(self, signature):
+        """One signed 64-bit bucket id per band (the band number is part of the hash)."""
+        buckets = []
+        for band in range(self.bands):
+            chunk = signature[band * self.rows:(band + 1) * self.rows].tobytes()
+            digest = hashlib.blake2b(band.to_bytes(2, 'little') + chunk, digest_size=8).digest()
+            buckets.append(int.from_bytes(digest, 'little', signed=True))
+        return buckets
+
+    def get(self, key):
+        row = self.conn.execute("SELECT key, duplicate_of FROM postings WHERE key = ?", (key,)).fetchone()
+        return {'key': row[0], 'duplicate_of': row[1]} if row else None
+
+    def query(self, text=None, signature=None, buckets=None, rank=None):
+        """Indexed postings similar to the text, best first: [(key, similarity), ...]."""
+        if signature is None:
+            signature = self.hasher.signature(text)
+        if signature.count(MAX_HASH) == len(signature):
+            return []  # no words left after normalizing; nothing to compare
+        buckets = buckets or self._buckets(signature)
+        placeholders = ','.join('?' * len(buckets))
+        rows = self.conn.execute(
+            "SELECT p.key, p.duplicate_of, p.rank, p.signature FROM postings p WHERE p.id IN "
+            f"(SELECT DISTINCT posting_id FROM lsh WHERE bucket IN ({placeholders}))", buckets
+        ).fetchall()
+        matches = []
+        rank = canonical_rank(rank)
+        for key, duplicate_of, other_rank, blob in rows:
+            other_rank = canonical_rank(other_rank)  # rows indexed before ranks were canonical
+            if rank and other_rank and rank != other_rank:
+                continue
+            score = similarity(signature, array('Q', blob))
+            if score >= self.threshold:
+                matches.append((duplicate_of or key, score))
+        matches.sort(key=lambda m: -m[1])
+        return matches
+
+    def add(self, key, text, source=None, title=None, rank=None, duplicate_of=None, signature=None, buckets=None):
+        if signature is None:
+            signature = self.hasher.signature(text)
+        buckets = buckets or self._buckets(signature)
+        cur = self.conn.execute(
+            "INSERT OR IGNORE INTO postings (key, source, title, rank, first_seen, duplicate_of, signature) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key, source, title, rank, datetime.utcnow().isoformat(), duplicate_of, signature.tobytes()),
+        )
+        if cur.rowcount:
+            self.conn.executemany("INSERT INTO lsh (bucket, posting_id) VALUES (?, ?)",
+                                  [(b, cur.lastrowid) for b in buckets])
+        return cur.rowcount == 1
+
+    def check_and_add(self, key, text, source=None, title=None, rank=None):
+        """
+        Look a posting up and index it. Returns (duplicate_of, similarity):
+        (None, None) for a new posting, the original's key for a near-duplicate.
+        A key that is already indexed keeps the verdict it got the first time.
+        """
+        seen = self.get(key)
+        if seen:
+            return seen['duplicate_of'], (1.0 if seen['duplicate_of'] else None)
+        rank = canonical_rank(rank)
+        signature = self.hasher.signature(text)
+        buckets = self._buckets(signature)
+        matches = self.query(signature=signature, buckets=buckets, rank=rank)
+        duplicate_of, score = matches[0] if matches else (None, None)
+        self.add(key, text, source, title, rank, duplicate_of, signature, buckets)
+        return duplicate_of, score
+
+    def stats(self):
+        total, dups = self.conn.execute(
+            "SELECT COUNT(*), COUNT(duplicate_of) FROM postings").fetchone()
+        by_source = dict(self.conn.execute(
+            "SELECT COALESCE(source, '?'), COUNT(*) FROM postings GROUP BY source"))
+        return {'postings': total, 'near_duplicates': dups, 'by_source': by_source,
+                'bytes': os.path.getsize(self.path)}
+
+
+def _text(job):
+    return job.get('raw_content') or job.get('raw_text') or job.get('title') or ''
+
+
+def canonical_rank(rank):
+    """One spelling per rank: 'AB', 'Able Seaman' -> 'able seaman'; unmapped ranks ('THIRD ENG') are casefolded."""
+    if not rank or not rank.strip():
+        return None
+    known = extract_rank(rank)
+    rank = (known if known != 'Other' else rank.strip()).casefold()
+    return None if rank == 'other' else rank
+
+
+def _rank(job):
+    """The rank named by the title prefix ("AB - Crude Oil"), else the job's rank field."""
+    title = job.get('title') or ''
+    return canonical_rank(title.split(' - ')[0] if ' - ' in title else None) or canonical_rank(job.get('rank'))
+
+
+def mark_near_duplicates(jobs, index, metrics=None):
+    """Set duplicate_of/similarity on jobs that repeat an indexed posting. Returns the count."""
+    marked = 0
+    for job in jobs:
+        duplicate_of, score = index.check_and_add(content_hash(job), _text(job), job.get('source'), job.get('title'), _rank(job))
+        if duplicate_of:
+            job['duplicate_of'] = duplicate_of
+            job['similarity'] = round(score, 3)
+            marked += 1
+            print(f"   🔁 {job.get('title', 'Unknown')}: near-duplicate ({score:.0%}) of {duplicate_of[:10]}")
+    index.conn.commit()
+    if metrics is not None:
+        metrics.inc('near_duplicates', marked)
+    print(f"🔎 Checked {len(jobs)} jobs against {len(index)} indexed postings ({marked} near-duplicates)")
+    return marked
+
+
+def build(index, paths):
+    """Index archived snapshots, oldest first, so the earliest posting is the original."""
+    added = 0
+    for path in sorted(paths):
+        for job in read_jobs(path):
+            index.check_and_add(content_hash(job), _text(job), job.get('source'), job.get('title'), _rank(job))
+            added += 1
+        index.conn.commit()
+    return added
+
+
+def backfill_supabase(index, http, supabase_url, supabase_key, page_size=1000):
+    """Index existing job_postings rows from every source (Telegram, WhatsApp, scrapers...)."""
+    headers = {'apikey': supabase_key, 'Authorization': f'Bearer {supabase_key}'}
+    offset = added = 0
+    while True:
+        response = http.get(
+            f"{supabase_url}/rest/v1/job_postings",
+            params={'select': 'raw_content,source,rank,created_at', 'order': 'created_at.asc',
+                    'offset': offset, 'limit': page_size},
+            headers=headers,
+        )
+        response.raise_for_status()
+        rows = response.json()
+        for row in rows:
+            index.check_and_add(content_hash(row), row.get('raw_content') or '', row.get('source'), None, _rank(row))
+        index.conn.commit()
+        added += len(rows)
+        offset += page_size
+        if len(rows) < page_size:
+            return added
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Near-duplicate job index (MinHash/LSH)")
+    parser.add_argument('--index', default=INDEX_FILE)
+    parser.add_argument('--threshold', type=float, default=THRESHOLD)
+    sub = parser.add_subparsers(dest='command', required=True)
+    build_cmd = sub.add_parser('build', help="Index archived jobs_*.json / *.ndjson snapshots")
+    build_cmd.add_argument('paths', nargs='*')
+    sub.add_parser('backfill', help="Index existing job_postings rows via SUPABASE_URL/SUPABASE_SERVICE_KEY")
+    query_cmd = sub.add_parser('query', help="Show indexed postings similar to a text")
+    query_cmd.add_argument('text')
+    sub.add_parser('stats')
+    args = parser.parse_args()
+
+    with NearDupIndex(args.index, threshold=args.threshold) as index:
+        if args.command == 'build':
+            paths = args.paths or glob.glob(os.path.join("jobs", "jobs_*.json")) + glob.glob(os.path.join("jobs", "jobs_*.ndjson"))
+            print(f"Indexed {build(index, paths)} postings from {len(paths)} files")
+        elif args.command == 'backfill':
+            from fetch_client import FetchClient
+            url, key = os.environ.get("SUPABASE_URL"), os.environ.get("SUPABASE_SERVICE_KEY")
+            if not url or not key:
+                sys.exit("SUPABASE_URL and SUPABASE_SERVICE_KEY must be set")
+            print(f"Indexed {backfill_supabase(index, FetchClient(), url, key)} job_postings rows")
+        elif args.command == 'query':
+            for key, score in index.query(args.text):
+                print(f"{score:.2f}  {key}")
+        print(json.dumps(index.stats(), indent=2))
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Scrape Run Metrics
+Small instrumentation layer for the scrapers: stage timers, counters and
+histograms collected during one run and written out as JSON plus an
+OpenMetrics textfile (for node_exporter's textfile collector or artifacts).
+
+Usage in a scraper:
+    from run_metrics import metrics
+
+    with metrics.stage('fetch'):
+        response = requests.get(URL)
+    metrics.inc('bytes_fetched', len(response.content))
+
+    @metrics.timed('extract_job_details')
+    def extract_job_details(element): ...
+
+    metrics.write()  # at the end of main()
+
+Render a workflow summary from the JSON:
+    python scripts/run_metrics.py summary reports/metrics/latest-scrape-metrics.json
+"""
+
+import os
+import sys
+import json
+import time
+import bisect
+import functools
+from contextlib import contextmanager
+from datetime import datetime
+
+# Constants
+METRICS_DIR = os.path.join("reports", "metrics")
+METRICS_PREFIX = "scrape"
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60)
+
+
+def percentile(values, pct):
+    """Linear-interpolated percentile of a list of numbers (None if empty)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100
+    lo, hi = int(k), min(int(k) + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+class Histogram:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def to_dict(self):
+        cumulative, running = {}, 0
+        for le, c in zip(list(self.buckets) + ['+Inf'], self.counts):
+            running += c
+            cumulative[str(le)] = running
+        return {'count': self.count, 'sum': round(self.sum, 6), 'buckets': cumulative}
+
+
+class RunMetrics:
+    """Metrics for one scrape run. A module-level instance is shared by the scripts."""
+
+    def __init__(self, run_name=None):
+        self.reset(run_name)
+
+    def reset(self, run_name=None):
+        self.run_name = run_name or os.path.splitext(os.path.basename(sys.argv[0]))[0] or 'scrape'
+        self.started_at = datetime.utcnow()
+        self._t0 = time.perf_counter()
+        self.stages = {}
+        self.counters = {}
+        self.histograms = {}
+        self.info = {}
+
+    @contextmanager
+    def stage(self, name):
+        """Time a block; durations accumulate per stage and feed a histogram."""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - t0
+            stage = self.stages.setdefault(name, {'seconds': 0.0, 'calls': 0})
+            stage['seconds'] += elapsed
+            stage['calls'] += 1
+            self.observe(f"{name}_seconds", elapsed)
+
+    def timed(self, name):
+        """Decorator form of stage()."""
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.stage(name):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def inc(self, name, value=1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name, value, buckets=DEFAULT_BUCKETS):
+        if name not in self.histograms:
+            self.histograms[name] = Histogram(buckets)
+        self.histograms[name].observe(value)
+
+    def set_info(self, key, value):
+        self.info[key] = value
+
+    def to_dict(self):
+        return {
+            'run': self.run_name,
+            'started_at': self.started_at.isoformat(),
+            'duration_seconds': round(time.perf_counter() - self._t0, 6),
+            'stages': {k: {'seconds': round(v['seconds'], 6), 'calls': v['calls']} for k, v in self.stages.items()},
+            'counters': dict(self.counters),
+            'histograms': {k: h.to_dict() for k, h in self.histograms.items()},
+            'info': self.info,
+        }
+
+    def to_openmetrics(self, data=None):
+        data = data or self.to_dict()
+        label = f'run="{data["run"]}"'
+        p = METRICS_PREFIX
+        lines = [
+            f"# TYPE {p}_run_duration_seconds gauge",
+            f"{p}_run_duration_seconds{{{label}}} {data['duration_seconds']}",
+            f"# TYPE {p}_run_timestamp_seconds gauge",
+            f"{p}_run_timestamp_seconds{{{label}}} {self.started_at.timestamp():.3f}",
+            f"# TYPE {p}_stage_seconds counter",
+        ]
+        for stage, v in data['stages'].items():
+            lines.append(f'{p}_stage_seconds_total{{{label},stage="{stage}"}} {v["seconds"]}')
+        lines.append(f"# TYPE {p}_stage_calls counter")
+        for stage, v in data['stages'].items():
+            lines.append(f'{p}_stage_calls_total{{{label},stage="{stage}"}} {v["calls"]}')
+        for name, value in sorted(data['counters'].items()):
+            lines.append(f"# TYPE {p}_{name} counter")
+            lines.append(f"{p}_{name}_total{{{label}}} {value}")
+        for name, h in sorted(data['histograms'].items()):
+            lines.append(f"# TYPE {p}_{name} histogram")
+            for le, c in h['buckets'].items():
+                lines.append(f'{p}_{name}_bucket{{{label},le="{le}"}} {c}')
+            lines.append(f"{p}_{name}_sum{{{label}}} {h['sum']}")
+            lines.append(f"{p}_{name}_count{{{label}}} {h['count']}")
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def write(self, metrics_dir=METRICS_DIR, basename="latest-scrape-metrics"):
+        """Write <basename>.json and <basename>.prom atomically. Returns the JSON path."""
+        os.makedirs(metrics_dir, exist_ok=True)
+        data = self.to_dict()
+        json_path = os.path.join(metrics_dir, f"{basename}.json")
+        for path, content in ((json_path, json.dumps(data, indent=2)),
+                              (os.path.join(metrics_dir, f"{basename}.prom"), self.to_openmetrics(data))):
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        print(f"📈 Metrics saved to {json_path}")
+        return json_path
+
+
+def to_markdown(data):
+    """Markdown summary of a metrics JSON file, for $GITHUB_STEP_SUMMARY."""
+    c = data['counters']
+    lines = [
+        f"**Run:** `{data['run']}` · **Started:** {data['started_at']} UTC · "
+        f"**Duration:** {data['duration_seconds']:.2f}s",
+        "",
+        f"✅ **Jobs kept:** {c.get('jobs_kept', 0)} of {c.get('elements_considered', 0)} elements considered",
+        "",
+        "| Stage | Time (s) | Calls |",
+        "|-------|----------|-------|",
+    ]
+    for stage, v in sorted(data['stages'].items(), key=lambda kv: -kv[1]['seconds']):
+        lines.append(f"| {stage} | {v['seconds']:.3f} | {v['calls']} |")
+    lines += ["", "| Counter | Value |", "|---------|-------|"]
+    for name, value in sorted(c.items()):
+        lines.append(f"| {name} | {value} |")
+    hosts = data.get('info', {}).get('http_hosts') or {}
+    if hosts:
+        lines += ["", "| Host | Requests | Errors | Retries | Hedges | p50 ms | p95 ms | p99 ms | Breaker |",
+                  "|------|----------|--------|---------|--------|--------|--------|--------|---------|"]
+        for host, h in sorted(hosts.items()):
+            lines.append(f"| {host} | {h['requests']} | {h['errors']} | {h['retries']} | {h['hedges']} | "
+                         f"{h['p50_ms']} | {h['p95_ms']} | {h['p99_ms']} | {h['breaker']} |")
+    titles = data.get('info', {}).get('job_titles') or []
+    if titles:
+        lines += ["", "### 📋 Latest Jobs", "```"] + [f"• {t}" for t in titles[:10]] + ["```"]
+    return "\n".join(lines) + "\n"
+
+
+# Shared instance used by the scraper scripts
+metrics = RunMetrics()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 2 and sys.argv[1] == "summary":
+        path = sys.argv[2] if len(sys.argv) > 2 else os.path.join(METRICS_DIR, "latest-scrape-metrics.json")
+        if not os.path.exists(path):
+            print("⚠️ No metrics file found")
+            sys.exit(0)
+        with open(path, 'r', encoding='utf-8') as f:
+            print(to_markdown(json.load(f)))
+    else:
+        print(__doc__)
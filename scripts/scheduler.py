@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Adaptive Scrape Scheduler
+A long-running process that polls each job source on its own interval instead
+of fixed cron runs. Scraper modules are imported once, so their pooled HTTP
+sessions and parsers stay warm between polls.
+
+Each poll only fetches and extracts the listing (`scrape_jobs`). The full
+pipeline (`publish_jobs`: enrich, near-dup, save, upload, sweep) runs only
+when the set of job content hashes differs from the previous poll.
+
+The interval adapts to how often the source changes. From the last
+HISTORY_WINDOW polls the change rate is estimated as
+
+    rate = -ln((unchanged + 0.5) / (polls + 0.5)) / mean_interval
+
+(the Cho & Garcia-Molina estimator for a Poisson process observed at
+intervals), and the next poll is due when a change is likely
+(-ln(1 - CHANGE_PROBABILITY) / rate), clamped to the source's bounds and
+jittered by +/-JITTER. A source with no history is seeded from the archived
+jobs/jobs_<stamp>.json / .ndjson snapshots. Failed polls back off exponentially from the
+minimum interval. Due sources are polled one at a time: the scrapers all
+report into the process-wide run_metrics.metrics (their @metrics.timed
+stages and FetchClient counters are bound to it at import).
+
+Usage:
+    python scripts/scheduler.py                 # run until SIGINT/SIGTERM
+    python scripts/scheduler.py --plan          # show learned rates and intervals
+    python scripts/scheduler.py --once          # poll every source once and exit
+"""
+
+import os
+import re
+import json
+import glob
+import math
+import time
+import random
+import signal
+import argparse
+import importlib
+import threading
+from datetime import datetime
+
+from job_sinks import content_hash, read_jobs
+from run_metrics import metrics
+
+# Constants
+STATE_FILE = os.path.join("reports", "scheduler", "state.json")
+HISTORY_WINDOW = 30  # polls used to estimate the change rate
+CHANGE_PROBABILITY = 0.5  # poll when a change is this likely since the last poll
+JITTER = 0.1
+
+# name -> scraper module and interval bounds (seconds). The module provides
+# scrape_jobs() -> jobs and publish_jobs(jobs).
+SOURCES = {
+    'mariaid': {
+        'module': 'scrape_mariaid_jobs_simple',
+        'min_interval': 10 * 60,
+        'max_interval': 24 * 3600,
+        'archive': os.path.join("jobs", "jobs_[0-9]*.*json"),  # .json (older runs) and .ndjson
+    },
+}
+SNAPSHOT_TIME_RE = re.compile(r'jobs_(\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2})')
+
+
+def estimate_rate(observations):
+    """Changes per second from [(interval_s, changed), ...], or None without history."""
+    if not observations:
+        return None
+    polls = len(observations)
+    unchanged = sum(1 for _, changed in observations if not changed)
+    mean_interval = sum(interval for interval, _ in observations) / polls
+    if mean_interval <= 0:
+        return None
+    return -math.log((unchanged + 0.5) / (polls + 0.5)) / mean_interval
+
+
+def next_interval(rate, min_interval, max_interval, jitter=JITTER, rng=random):
+    """Seconds until the next poll for a source changing at `rate` per second."""
+    if rate is None or rate <= 0:
+        interval = max_interval if rate is not None else min_interval
+    else:
+        interval = -math.log(1 - CHANGE_PROBABILITY) / rate
+    interval = min(max(interval, min_interval), max_interval)
+    return interval * rng.uniform(1 - jitter, 1 + jitter)
+
+
+def archive_observations(pattern):
+    """(interval_s, changed) pairs between consecutive archived snapshots, plus the last id set."""
+    snapshots = []
+    for path in glob.glob(pattern):
+        match = SNAPSHOT_TIME_RE.search(os.path.basename(path))
+        if match:
+            stamp = datetime.strptime(match.group(1), '%Y-%m-%d_%H-%M-%S')
+            snapshots.append((stamp, path))
+    observations, previous = [], None
+    for stamp, path in sorted(snapshots):
+        ids = {content_hash(job) for job in read_jobs(path)}
+        if previous is not None:
+            observations.append(((stamp - previous[0]).total_seconds(), ids != previous[1]))
+        previous = (stamp, ids)
+    return observations[-HISTORY_WINDOW:], (sorted(previous[1]) if previous else None)
+
+
+class Source:
+    def __init__(self, name, module, min_interval, max_interval, archive=None, state=None):
+        self.name = name
+        self.module_name = module
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.archive = archive
+        self._module = None
+        state = state or {}
+        self.observations = [tuple(o) for o in state.get('observations', [])]
+        self.ids = set(state['ids']) if state.get('ids') is not None else None
+        self.last_poll = state.get('last_poll')
+        self.next_poll = state.get('next_poll', 0)
+        self.failures = state.get('failures', 0)
+        if not self.observations and archive:
+            self.observations, ids = archive_observations(archive)
+            if self.ids is None and ids is not None:
+                self.ids = set(ids)
+
+    @property
+    def module(self):
+        if self._module is None:
+            self._module = importlib.import_module(self.module_name)  # stays loaded: warm sessions
+        return self._module
+
+    @property
+    def rate(self):
+        return estimate_rate(self.observations)
+
+    def schedule(self, now):
+        if self.failures:
+            interval = min(self.max_interval, self.min_interval * 2 ** (self.failures - 1))
+        else:
+            interval = next_interval(self.rate, self.min_interval, self.max_interval)
+        self.next_poll = now + interval
+        return interval
+
+    def poll(self):
+        """Scrape the listing; publish only if it changed. Returns 'changed' or 'unchanged'."""
+        now = time.time()
+        metrics.reset(f"scheduler_{self.name}")
+        jobs = self.module.scrape_jobs()
+        if not jobs:
+            raise RuntimeError("no jobs scraped")
+        ids = {content_hash(job) for job in jobs}
+        changed = ids != self.ids
+        if self.last_poll is not None:
+            self.observations.append((now - self.last_poll, changed))
+            self.observations = self.observations[-HISTORY_WINDOW:]
+        if changed:
+            metrics.set_info('job_titles', [job.get('title') for job in jobs])
+            self.module.publish_jobs(jobs)
+        metrics.set_info('http_hosts', self.module.http.host_stats())
+        metrics.write()
+        self.ids, self.last_poll, self.failures = ids, now, 0
+        return 'changed' if changed else 'unchanged'
+
+    def to_state(self):
+        return {
+            'observations': self.observations,
+            'ids': sorted(self.ids) if self.ids is not None else None,
+            'last_poll': self.last_poll,
+            'next_poll': self.next_poll,
+            'failures': self.failures,
+        }
+
+
+def load_state(path=STATE_FILE):
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {}
+
+
+def save_state(sources, path=STATE_FILE):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({s.name: s.to_state() for s in sources}, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _fmt(seconds):
+    return f"{seconds / 3600:.1f} h" if seconds >= 3600 else f"{seconds / 60:.1f} min"
+
+
+class Scheduler:
+    def __init__(self, sources, state_file=STATE_FILE):
+        self.sources = sources
+        self.state_file = state_file
+        self.stop = threading.Event()
+
+    def shutdown(self):
+        """Stop after the poll in progress (if any)."""
+        self.stop.set()
+
+    def _run(self, source):
+        started = time.time()
+        try:
+            result = source.poll()
+        except (Exception, SystemExit) as e:  # scrapers may sys.exit()
+            source.failures += 1
+            result = f"failed ({e!r})"
+        interval = source.schedule(time.time())
+        print(f"⏰ {source.name}: {result} in {time.time() - started:.1f} s; next poll in {_fmt(interval)}")
+        save_state(self.sources, self.state_file)
+
+    def run(self, once=False):
+        """Poll due sources one at a time until stopped (or each source once with once=True)."""
+        if once:
+            for source in self.sources:
+                self._run(source)
+            return
+        while not self.stop.is_set():
+            for source in sorted(self.sources, key=lambda s: s.next_poll):
+                if self.stop.is_set() or source.next_poll > time.time():
+                    break
+                self._run(source)
+            due = min((s.next_poll for s in self.sources), default=time.time() + 60)
+            self.stop.wait(min(max(due - time.time(), 0.5), 60))
+
+
+def build_sources(state):
+    return [Source(name, state=state.get(name), **config) for name, config in SOURCES.items()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Poll job sources on adaptive intervals")
+    parser.add_argument('--state', default=STATE_FILE)
+    parser.add_argument('--plan', action='store_true', help="Print learned change rates and intervals, then exit")
+    parser.add_argument('--once', action='store_true', help="Poll every source once and exit")
+    args = parser.parse_args(argv)
+
+    sources = build_sources(load_state(args.state))
+    for source in sources:
+        rate = source.rate
+        print(f"📈 {source.name}: {len(source.observations)} observations, "
+              f"{'no' if rate is None else f'{rate * 3600:.3f}'} changes/hour, "
+              f"interval {_fmt(next_interval(rate, source.min_interval, source.max_interval, jitter=0))} "
+              f"(bounds {_fmt(source.min_interval)} - {_fmt(source.max_interval)})")
+    if args.plan:
+        return
+
+    scheduler = Scheduler(sources, state_file=args.state)
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: scheduler.shutdown())
+    print(f"🚀 Scheduler started ({len(sources)} sources, polled one at a time)")
+    scheduler.run(once=args.once)
+    print("👋 Scheduler stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,18 +7,53 @@ Scrapes maritime job listings from mariaid.com/careers-at-sea
 import requests
 from bs4 import BeautifulSoup
 import json
-import csv
 from datetime import datetime
 import os
 import sys
 
+from enrich_jobs import enrich_jobs
+from fetch_client import FetchClient
+from html_archive import ARCHIVE_DIR, archive_page
+from job_numbers import normalize_jobs
+from job_posting import JobPosting
+from job_sinks import local_sinks, write_jobs, report_sinks
+from near_dup import NearDupIndex, mark_near_duplicates
+from run_metrics import metrics
+
+# profiling.py lives at the repository root
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+from profiling import profile_run
+
 # Constants
 URL = "https://mariaid.com/careers-at-sea"
+PAGE_TIMEOUT = (5, 30)  # (connect, read) seconds
+PAGE_HEDGE_AFTER = 10  # send a second request if the page is this slow
 JOBS_DIR = "jobs"
 LATEST_FILE = os.path.join(JOBS_DIR, "latest_jobs.json")
 HISTORY_FILE = os.path.join(JOBS_DIR, "jobs_history.json")
 
 
+# Shared pooled HTTP client (retries, hedging, per-host circuit breaker)
+http = FetchClient(hedge_after='auto', metrics=metrics)
+
+
+def find_job_elements(html):
+    """Parse a listing page and return the elements that look like job cards"""
+    soup = BeautifulSoup(html, 'html.parser')
+
+    # Find all job cards/listings
+    # Adjust selectors based on actual HTML structure
+    job_elements = soup.find_all(['div', 'article', 'section'], class_=lambda x: x and ('job' in x.lower() or 'career' in x.lower() or 'position' in x.lower()))
+
+    # If no specific job class found, try finding by common patterns
+    if not job_elements:
+        # Look for repeated structures with job titles
+        job_elements = soup.find_all('h4')
+    return job_elements
+
+
 def scrape_jobs():
     """Scrape job listings from MariAid careers page"""
     print(f"🔍 Scraping jobs from {URL}...")
@@ -27,21 +62,17 @@ def scrape_jobs():
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
-        response = requests.get(URL, headers=headers, timeout=30)
-        response.raise_for_status()
-
-        soup = BeautifulSoup(response.content, 'html.parser')
+        with metrics.stage('fetch'):
+            response = http.get(URL, headers=headers, timeout=PAGE_TIMEOUT, hedge_after=PAGE_HEDGE_AFTER)
+            response.raise_for_status()
+        metrics.inc('bytes_fetched', len(response.content))
+        archive_page(URL, response.content, scraper='scrape_mariaid_jobs', metrics=metrics, root=ARCHIVE_DIR)
+
+        with metrics.stage('parse_html'):
+            job_elements = find_job_elements(response.content)
         jobs = []
 
-        # Find all job cards/listings
-        # Adjust selectors based on actual HTML structure
-        job_elements = soup.find_all(['div', 'article', 'section'], class_=lambda x: x and ('job' in x.lower() or 'career' in x.lower() or 'position' in x.lower()))
-
-        # If no specific job class found, try finding by common patterns
-        if not job_elements:
-            # Look for repeated structures with job titles
-            job_elements = soup.find_all('h4')
-
+        metrics.inc('elements_considered', len(job_elements))
         for idx, element in enumerate(job_elements):
             try:
                 # Extract job details
@@ -49,17 +80,21 @@ def scrape_jobs():
                 if job_data:
                     jobs.append(job_data)
             except Exception as e:
+                metrics.inc('extract_errors')
                 print(f"⚠️  Error parsing job {idx + 1}: {e}")
                 continue
+        metrics.inc('jobs_kept', len(jobs))
 
         print(f"✅ Found {len(jobs)} job listings")
         return jobs
 
     except requests.RequestException as e:
+        metrics.inc('fetch_errors')
         print(f"❌ Error fetching page: {e}")
-        sys.exit(1)
+        return []
 
 
+@metrics.timed('extract_job_details')
 def extract_job_details(element):
     """Extract job details from HTML element"""
     job = {}
@@ -98,7 +133,7 @@ def extract_job_details(element):
     # Extract salary if present
     if '$' in text_content:
         import re
-        salary_match = re.search(r'\$[\d,]+-?\$?[\d,]*', text_content)
+        salary_match = re.search(r'\$[\d,]+(?:\s*-\s*\$?[\d,]+)?', text_content)
         if salary_match:
             job['salary'] = salary_match.group(0)
 
@@ -115,50 +150,20 @@ def extract_job_details(element):
         if not job['apply_url'].startswith('http'):
             job['apply_url'] = f"https://mariaid.com{job['apply_url']}"
 
-    return job
+    return JobPosting.from_dict(job)
 
 
+@metrics.timed('save_jobs')
 def save_jobs(jobs):
-    """Save jobs to JSON and CSV files"""
+    """Save jobs to latest JSON plus timestamped NDJSON/CSV(/Parquet) in one pass"""
     timestamp = datetime.utcnow().strftime('%Y-%m-%d_%H-%M-%S')
-
-    # Ensure jobs directory exists
-    os.makedirs(JOBS_DIR, exist_ok=True)
-
-    # Save latest jobs as JSON
-    with open(LATEST_FILE, 'w', encoding='utf-8') as f:
-        json.dump({
-            'scraped_at': datetime.utcnow().isoformat(),
-            'total_jobs': len(jobs),
-            'jobs': jobs
-        }, f, indent=2, ensure_ascii=False)
-    print(f"💾 Saved to {LATEST_FILE}")
-
-    # Save timestamped JSON
-    timestamped_file = os.path.join(JOBS_DIR, f"jobs_{timestamp}.json")
-    with open(timestamped_file, 'w', encoding='utf-8') as f:
-        json.dump(jobs, f, indent=2, ensure_ascii=False)
-    print(f"💾 Saved to {timestamped_file}")
-
-    # Save as CSV
-    csv_file = os.path.join(JOBS_DIR, f"jobs_{timestamp}.csv")
-    if jobs:
-        # Collect all unique keys from all jobs
-        all_keys = set()
-        for job in jobs:
-            all_keys.update(job.keys())
-        all_keys = sorted(list(all_keys))
-
-        with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=all_keys, extrasaction='ignore')
-            writer.writeheader()
-            writer.writerows(jobs)
-        print(f"💾 Saved to {csv_file}")
+    report_sinks(write_jobs(jobs, local_sinks(JOBS_DIR, timestamp, LATEST_FILE)), metrics)
 
     # Update history
     update_history(jobs)
 
 
+@metrics.timed('update_history')
 def update_history(new_jobs):
     """Update jobs history and detect changes"""
     history = []
@@ -171,7 +176,7 @@ def update_history(new_jobs):
     history.append({
         'date': datetime.utcnow().isoformat(),
         'job_count': len(new_jobs),
-        'jobs': new_jobs
+        'jobs': [job.to_dict() for job in new_jobs]
     })
 
     # Keep only last 30 days
@@ -200,15 +205,34 @@ def main():
     print("MariAid Maritime Jobs Scraper")
     print("=" * 60)
 
+    metrics.reset('scrape_mariaid_jobs')
     jobs = scrape_jobs()
+    metrics.set_info('job_titles', [job.get('title') for job in jobs])
 
     if jobs:
+        # Typed salary / contract / vessel size fields
+        with metrics.stage('normalize'):
+            normalize_jobs(jobs, metrics)
+
+        # Attach approved agent details by MLA license
+        with metrics.stage('enrich'):
+            enrich_jobs(jobs)
+
+        # Flag reposts of postings already seen (any source, any earlier run)
+        with metrics.stage('near_dup'), NearDupIndex() as index:
+            mark_near_duplicates(jobs, index, metrics)
+
         save_jobs(jobs)
+        metrics.set_info('http_hosts', http.host_stats())
+        metrics.write()
         print(f"\n✅ Successfully scraped {len(jobs)} jobs!")
     else:
+        metrics.set_info('http_hosts', http.host_stats())
+        metrics.write()
         print("\n⚠️  No jobs found. Please check the scraper logic.")
         sys.exit(1)
 
 
 if __name__ == "__main__":
-    main()
+    with profile_run('scrape_mariaid_jobs'):
+        main()
@@ -6,18 +6,64 @@ Scrapes maritime job listings from mariaid.com/careers-at-sea and uploads via RE
 
 import requests
 from bs4 import BeautifulSoup
-import json
 import os
 import sys
 from datetime import datetime
 
+from enrich_jobs import enrich_jobs
+from fetch_client import FetchClient
+from html_archive import ARCHIVE_DIR, archive_page
+from job_index import INDEX_DIR, write_job_index
+from job_numbers import normalize_jobs
+from job_posting import JobPosting
+from job_sinks import SupabaseBatchSink, local_sinks, write_jobs, report_sinks
+from job_terms import extract_rank, extract_ship_type
+from job_sweeper import sweep_stale_jobs
+from near_dup import NearDupIndex, mark_near_duplicates
+from run_metrics import metrics
+
+# profiling.py lives at the repository root
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+from profiling import profile_run
+
 # Constants
 URL = "https://mariaid.com/careers-at-sea"
+PAGE_TIMEOUT = (5, 30)  # (connect, read) seconds
+PAGE_HEDGE_AFTER = 10  # send a second request if the page is this slow
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
 JOBS_DIR = "jobs"
 
 # Supabase credentials
 SUPABASE_URL = os.environ.get("SUPABASE_URL", "https://zlgfadgwlwreezwegpkx.supabase.co")
 SUPABASE_KEY = os.environ.get("SUPABASE_SERVICE_KEY", "sb_publishable_WLb8f8ArmmJm931BFjD0gQ_PjRuovGR")
+SUPABASE_TIMEOUT = (5, 15)
+SUPABASE_BATCH_SIZE = 50
+
+
+# Shared pooled HTTP client (retries, hedging, per-host circuit breaker)
+http = FetchClient(hedge_after='auto', metrics=metrics)
+
+
+def find_job_elements(html):
+    """Parse a listing page and return the elements that look like job cards"""
+    soup = BeautifulSoup(html, 'html.parser')
+
+    # Find all job cards/listings
+    # Try multiple selectors to find job listings
+    job_elements = soup.find_all(['div', 'article', 'section'],
+        class_=lambda x: x and ('job' in x.lower() or 'career' in x.lower() or 'position' in x.lower()))
+
+    # If no specific job class found, try finding by common patterns
+    if not job_elements:
+        # Look for repeated structures with job titles
+        job_elements = soup.find_all('h4')
+        if not job_elements:
+            job_elements = soup.find_all('h3')
+    return job_elements
 
 
 def scrape_jobs():
@@ -25,28 +71,18 @@ def scrape_jobs():
     print(f"🔍 Scraping jobs from {URL}...")
 
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(URL, headers=headers, timeout=30)
-        response.raise_for_status()
-
-        soup = BeautifulSoup(response.content, 'html.parser')
+        with metrics.stage('fetch'):
+            response = http.get(URL, headers=HEADERS, timeout=PAGE_TIMEOUT, hedge_after=PAGE_HEDGE_AFTER)
+            response.raise_for_status()
+        metrics.inc('bytes_fetched', len(response.content))
+        archive_page(URL, response.content, scraper='scrape_mariaid_jobs_simple', metrics=metrics, root=ARCHIVE_DIR)
+
+        with metrics.stage('parse_html'):
+            job_elements = find_job_elements(response.content)
         jobs = []
 
-        # Find all job cards/listings
-        # Try multiple selectors to find job listings
-        job_elements = soup.find_all(['div', 'article', 'section'],
-            class_=lambda x: x and ('job' in x.lower() or 'career' in x.lower() or 'position' in x.lower()))
-
-        # If no specific job class found, try finding by common patterns
-        if not job_elements:
-            # Look for repeated structures with job titles
-            job_elements = soup.find_all('h4')
-            if not job_elements:
-                job_elements = soup.find_all('h3')
-
         print(f"📋 Found {len(job_elements)} potential job elements")
+        metrics.inc('elements_considered', len(job_elements))
 
         for idx, element in enumerate(job_elements):
             try:
@@ -55,17 +91,21 @@ def scrape_jobs():
                     jobs.append(job_data)
                     print(f"   ✓ Job {idx + 1}: {job_data.get('title', 'Unknown')}")
             except Exception as e:
+                metrics.inc('extract_errors')
                 print(f"   ⚠️  Error parsing job {idx + 1}: {e}")
                 continue
+        metrics.inc('jobs_kept', len(jobs))
 
         print(f"\n✅ Successfully extracted {len(jobs)} valid job listings")
         return jobs
 
     except requests.RequestException as e:
+        metrics.inc('fetch_errors')
         print(f"❌ Error fetching page: {e}")
         return []
 
 
+@metrics.timed('extract_job_details')
 def extract_job_details(element):
     """Extract job details from HTML element"""
     job = {}
@@ -99,7 +139,7 @@ def extract_job_details(element):
         job['positions'] = int(positions_match.group(1))
 
     # Extract salary
-    salary_match = re.search(r'\$[\d,]+-?\$?[\d,]*', text_content)
+    salary_match = re.search(r'\$[\d,]+(?:\s*-\s*\$?[\d,]+)?', text_content)
     if salary_match:
         job['salary'] = salary_match.group(0)
 
@@ -125,159 +165,71 @@ def extract_job_details(element):
     job['mla_number'] = 'MLA-114'  # MariAid's MLA number
     job['agency'] = 'MariAid Limited'
 
-    return job
-
-
-def extract_rank(title):
-    """Extract rank from job title"""
-    title_upper = title.upper()
-
-    # Common maritime ranks
-    rank_mapping = {
-        'MASTER': 'Master',
-        'CAPTAIN': 'Master',
-        'CHIEF OFFICER': 'Chief Officer',
-        'C/O': 'Chief Officer',
-        '2ND OFFICER': '2nd Officer',
-        '2/O': '2nd Officer',
-        '3RD OFFICER': '3rd Officer',
-        '3/O': '3rd Officer',
-        'CHIEF ENGINEER': 'Chief Engineer',
-        'C/E': 'Chief Engineer',
-        '2ND ENGINEER': '2nd Engineer',
-        '2/E': '2nd Engineer',
-        '3RD ENGINEER': '3rd Engineer',
-        '3/E': '3rd Engineer',
-        'ELECTRO TECHNICAL OFFICER': 'Electro Technical Officer',
-        'ETO': 'Electro Technical Officer',
-        'BOSUN': 'Bosun',
-        'AB': 'Able Seaman',
-        'ABLE SEAMAN': 'Able Seaman',
-        'OILER': 'Oiler',
-        'FITTER': 'Fitter',
-        'COOK': 'Cook',
-        'STEWARD': 'Steward',
-    }
-
-    for pattern, rank in rank_mapping.items():
-        if pattern in title_upper:
-            return rank
-
-    return 'Other'
-
-
-def extract_ship_type(text):
-    """Extract ship type from text"""
-    text_upper = text.upper()
-
-    if any(word in text_upper for word in ['TANKER', 'VLCC', 'AFRAMAX', 'SUEZMAX']):
-        return 'Oil Tanker'
-    elif 'BULK' in text_upper or 'BULKER' in text_upper:
-        return 'Bulk Carrier'
-    elif 'CONTAINER' in text_upper:
-        return 'Container'
-    elif 'LNG' in text_upper:
-        return 'LNG Carrier'
-    elif 'LPG' in text_upper:
-        return 'LPG Carrier'
-    elif 'CHEMICAL' in text_upper:
-        return 'Chemical Tanker'
-    elif 'RO-RO' in text_upper or 'RORO' in text_upper:
-        return 'RoRo'
-
-    return 'Other'
+    return JobPosting.from_dict(job)
 
 
-def upload_to_supabase_rest(jobs):
-    """Upload scraped jobs to Supabase using REST API"""
+def supabase_sink():
+    """Batched job_postings uploader, or None when credentials are not set"""
     if not SUPABASE_URL or not SUPABASE_KEY:
         print("⚠️  Skipping database upload (credentials not set)")
+        return None
+    return SupabaseBatchSink(http, SUPABASE_URL, SUPABASE_KEY,
+                             batch_size=SUPABASE_BATCH_SIZE, timeout=SUPABASE_TIMEOUT, metrics=metrics)
+
+
+@metrics.timed('upload')
+def upload_to_supabase_rest(jobs):
+    """Upload scraped jobs to Supabase using REST API (batched, deduped by content hash)"""
+    sink = supabase_sink()
+    if sink is None:
         return 0
 
     print(f"\n📤 Uploading {len(jobs)} jobs to Supabase via REST API...")
+    write_jobs(jobs, [sink])
+    print(f"\n✅ Successfully uploaded {sink.uploaded} new jobs to database!")
+    return sink.uploaded
 
-    uploaded = 0
-    headers = {
-        'apikey': SUPABASE_KEY,
-        'Authorization': f'Bearer {SUPABASE_KEY}',
-        'Content-Type': 'application/json',
-        'Prefer': 'return=representation'
-    }
-
-    for job in jobs:
-        try:
-            # Prepare job data for Supabase
-            job_data = {
-                'raw_content': job.get('raw_content', ''),
-                'source': job.get('source', 'MariAid'),
-                'status': 'parsed',  # Mark as parsed since we extracted data
-                'rank': job.get('rank', 'Other'),
-                'salary': job.get('salary'),
-                'joining_date': 'ASAP',  # Default joining date
-                'mla_number': job.get('mla_number'),
-                'agency': job.get('agency'),
-                'parsed_content': {
-                    'rank': job.get('rank'),
-                    'shipType': job.get('ship_type', 'Other'),
-                    'salary': job.get('salary'),
-                    'wage': job.get('salary'),
-                    'joining_date': 'ASAP',
-                    'joiningDate': 'ASAP',
-                    'description': job.get('raw_content', ''),
-                    'company': job.get('agency'),
-                    'companyName': job.get('agency'),
-                    'mla_number': job.get('mla_number'),
-                    'contact': job.get('apply_url', ''),
-                    'contactInfo': job.get('apply_url', ''),
-                }
-            }
-
-            # Check if job already exists (avoid duplicates by raw_content)
-            check_url = f"{SUPABASE_URL}/rest/v1/job_postings?raw_content=eq.{requests.utils.quote(job.get('raw_content', '')[:100])}&select=id&limit=1"
-            check_response = requests.get(check_url, headers=headers)
-
-            if check_response.ok and check_response.json():
-                print(f"   ⏭️  Skipped (duplicate): {job.get('title')}")
-                continue
 
-            # Insert job
-            insert_url = f"{SUPABASE_URL}/rest/v1/job_postings"
-            response = requests.post(insert_url, headers=headers, json=job_data)
+@metrics.timed('save_jobs')
+def save_jobs_locally(jobs, extra_sinks=()):
+    """Save jobs to latest JSON plus timestamped NDJSON/CSV(/Parquet) in one pass"""
+    timestamp = datetime.utcnow().strftime('%Y-%m-%d_%H-%M-%S')
+    sinks = local_sinks(JOBS_DIR, timestamp, os.path.join(JOBS_DIR, "latest_jobs.json")) + list(extra_sinks)
+    report_sinks(write_jobs(jobs, sinks), metrics)
 
-            if response.ok:
-                uploaded += 1
-                print(f"   ✅ Uploaded: {job.get('title')}")
-            else:
-                print(f"   ❌ Failed ({response.status_code}): {job.get('title')} - {response.text[:100]}")
 
-        except Exception as e:
-            print(f"   ❌ Error uploading job: {e}")
-            continue
+def publish_jobs(jobs):
+    """Normalize, enrich, flag near-duplicates, save locally, index and upload scraped jobs. Returns the number uploaded."""
+    # Typed salary / contract / vessel size columns for range filters
+    with metrics.stage('normalize'):
+        normalize_jobs(jobs, metrics)
 
-    print(f"\n✅ Successfully uploaded {uploaded} new jobs to database!")
-    return uploaded
+    # Attach approved agent details by MLA license
+    with metrics.stage('enrich'):
+        enrich_jobs(jobs)
 
+    # Flag reposts of postings already seen (any source, any earlier run)
+    with metrics.stage('near_dup'), NearDupIndex() as index:
+        mark_near_duplicates(jobs, index, metrics)
 
-def save_jobs_locally(jobs):
-    """Save jobs to local JSON files for backup"""
-    timestamp = datetime.utcnow().strftime('%Y-%m-%d_%H-%M-%S')
-    os.makedirs(JOBS_DIR, exist_ok=True)
+    # Save locally and upload to Supabase in one pass over the jobs
+    uploader = supabase_sink()
+    if uploader:
+        print(f"\n📤 Uploading {len(jobs)} jobs to Supabase via REST API...")
+    save_jobs_locally(jobs, extra_sinks=[uploader] if uploader else [])
 
-    # Save latest jobs
-    latest_file = os.path.join(JOBS_DIR, "latest_jobs.json")
-    with open(latest_file, 'w', encoding='utf-8') as f:
-        json.dump({
-            'scraped_at': datetime.utcnow().isoformat(),
-            'total_jobs': len(jobs),
-            'jobs': jobs
-        }, f, indent=2, ensure_ascii=False)
-    print(f"💾 Saved to {latest_file}")
+    # Static search index the JobBoard filters against without a database query
+    if INDEX_DIR:
+        with metrics.stage('job_index'):
+            report = write_job_index(jobs, INDEX_DIR)
+        metrics.set_info('job_index', report)
+        print(f"🗂️  Search index: {report['jobs']} jobs, {report['written']} of {report['files']} files changed -> {INDEX_DIR}")
 
-    # Save timestamped backup
-    timestamped_file = os.path.join(JOBS_DIR, f"jobs_{timestamp}.json")
-    with open(timestamped_file, 'w', encoding='utf-8') as f:
-        json.dump(jobs, f, indent=2, ensure_ascii=False)
-    print(f"💾 Saved to {timestamped_file}")
+    # Expire rows whose vacancy has been missing from the site for several runs
+    if uploader:
+        with metrics.stage('sweep'):
+            sweep_stale_jobs(http, SUPABASE_URL, SUPABASE_KEY, jobs, timeout=SUPABASE_TIMEOUT, metrics=metrics)
+    return uploader.uploaded if uploader else 0
 
 
 def main():
@@ -287,19 +239,22 @@ def main():
     print("=" * 60)
 
     # Scrape jobs
+    metrics.reset('scrape_mariaid_jobs_simple')
     jobs = scrape_jobs()
+    metrics.set_info('job_titles', [f"{job.get('title')} - {job.get('rank', 'Unknown rank')}" for job in jobs])
 
     if jobs:
-        # Save locally
-        save_jobs_locally(jobs)
-
-        # Upload to Supabase
-        uploaded = upload_to_supabase_rest(jobs)
+        uploaded = publish_jobs(jobs)
+        metrics.set_info('http_hosts', http.host_stats())
+        metrics.write()
         print(f"\n🎉 Scraper completed: {len(jobs)} scraped, {uploaded} uploaded to database")
     else:
+        metrics.set_info('http_hosts', http.host_stats())
+        metrics.write()
         print("\n⚠️  No jobs found. Please check the website structure.")
         sys.exit(1)
 
 
 if __name__ == "__main__":
-    main()
+    with profile_run('scrape_mariaid_jobs_simple'):
+        main()
@@ -6,14 +6,31 @@ Scrapes maritime job listings from mariaid.com/careers-at-sea and uploads to Sup
 
 import requests
 from bs4 import BeautifulSoup
-import json
 import os
 import sys
 from datetime import datetime
-from supabase import create_client, Client
+
+from enrich_jobs import enrich_jobs
+from fetch_client import FetchClient
+from html_archive import ARCHIVE_DIR, archive_page
+from job_numbers import normalize_jobs
+from job_posting import JobPosting
+from job_sinks import content_hash, local_sinks, write_jobs, report_sinks
+from job_terms import extract_rank, extract_ship_type
+from job_sweeper import report_sweep, sweep_params
+from near_dup import NearDupIndex, mark_near_duplicates
+from run_metrics import metrics
+
+# profiling.py lives at the repository root
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+from profiling import profile_run
 
 # Constants
 URL = "https://mariaid.com/careers-at-sea"
+PAGE_TIMEOUT = (5, 30)  # (connect, read) seconds
+PAGE_HEDGE_AFTER = 10  # send a second request if the page is this slow
 JOBS_DIR = "jobs"
 
 # Supabase credentials (from environment variables)
@@ -21,16 +38,39 @@ SUPABASE_URL = os.environ.get("SUPABASE_URL")
 SUPABASE_KEY = os.environ.get("SUPABASE_SERVICE_KEY")
 
 
-def get_supabase_client() -> Client:
-    """Initialize Supabase client"""
+# Shared pooled HTTP client (retries, hedging, per-host circuit breaker)
+http = FetchClient(hedge_after='auto', metrics=metrics)
+
+
+def get_supabase_client():
+    """Initialize Supabase client (supabase is only imported when credentials are set)"""
     if not SUPABASE_URL or not SUPABASE_KEY:
         print("⚠️  Warning: SUPABASE_URL or SUPABASE_SERVICE_KEY not set")
         print("Jobs will only be saved to JSON files, not uploaded to database")
         return None
 
+    from supabase import create_client
     return create_client(SUPABASE_URL, SUPABASE_KEY)
 
 
+def find_job_elements(html):
+    """Parse a listing page and return the elements that look like job cards"""
+    soup = BeautifulSoup(html, 'html.parser')
+
+    # Find all job cards/listings
+    # Try multiple selectors to find job listings
+    job_elements = soup.find_all(['div', 'article', 'section'],
+        class_=lambda x: x and ('job' in x.lower() or 'career' in x.lower() or 'position' in x.lower()))
+
+    # If no specific job class found, try finding by common patterns
+    if not job_elements:
+        # Look for repeated structures with job titles
+        job_elements = soup.find_all('h4')
+        if not job_elements:
+            job_elements = soup.find_all('h3')
+    return job_elements
+
+
 def scrape_jobs():
     """Scrape job listings from MariAid careers page"""
     print(f"🔍 Scraping jobs from {URL}...")
@@ -39,25 +79,18 @@ def scrape_jobs():
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
-        response = requests.get(URL, headers=headers, timeout=30)
-        response.raise_for_status()
-
-        soup = BeautifulSoup(response.content, 'html.parser')
+        with metrics.stage('fetch'):
+            response = http.get(URL, headers=headers, timeout=PAGE_TIMEOUT, hedge_after=PAGE_HEDGE_AFTER)
+            response.raise_for_status()
+        metrics.inc('bytes_fetched', len(response.content))
+        archive_page(URL, response.content, scraper='scrape_mariaid_jobs_v2', metrics=metrics, root=ARCHIVE_DIR)
+
+        with metrics.stage('parse_html'):
+            job_elements = find_job_elements(response.content)
         jobs = []
 
-        # Find all job cards/listings
-        # Try multiple selectors to find job listings
-        job_elements = soup.find_all(['div', 'article', 'section'],
-            class_=lambda x: x and ('job' in x.lower() or 'career' in x.lower() or 'position' in x.lower()))
-
-        # If no specific job class found, try finding by common patterns
-        if not job_elements:
-            # Look for repeated structures with job titles
-            job_elements = soup.find_all('h4')
-            if not job_elements:
-                job_elements = soup.find_all('h3')
-
         print(f"📋 Found {len(job_elements)} potential job elements")
+        metrics.inc('elements_considered', len(job_elements))
 
         for idx, element in enumerate(job_elements):
             try:
@@ -66,17 +99,21 @@ def scrape_jobs():
                     jobs.append(job_data)
                     print(f"   ✓ Job {idx + 1}: {job_data.get('title', 'Unknown')}")
             except Exception as e:
+                metrics.inc('extract_errors')
                 print(f"   ⚠️  Error parsing job {idx + 1}: {e}")
                 continue
+        metrics.inc('jobs_kept', len(jobs))
 
         print(f"\n✅ Successfully extracted {len(jobs)} valid job listings")
         return jobs
 
     except requests.RequestException as e:
+        metrics.inc('fetch_errors')
         print(f"❌ Error fetching page: {e}")
         return []
 
 
+@metrics.timed('extract_job_details')
 def extract_job_details(element):
     """Extract job details from HTML element"""
     job = {}
@@ -110,7 +147,7 @@ def extract_job_details(element):
         job['positions'] = int(positions_match.group(1))
 
     # Extract salary
-    salary_match = re.search(r'\$[\d,]+-?\$?[\d,]*', text_content)
+    salary_match = re.search(r'\$[\d,]+(?:\s*-\s*\$?[\d,]+)?', text_content)
     if salary_match:
         job['salary'] = salary_match.group(0)
 
@@ -136,69 +173,10 @@ def extract_job_details(element):
     job['mla_number'] = 'MLA-114'  # MariAid's MLA number
     job['agency'] = 'MariAid Limited'
 
-    return job
-
-
-def extract_rank(title):
-    """Extract rank from job title"""
-    title_upper = title.upper()
-
-    # Common maritime ranks
-    rank_mapping = {
-        'MASTER': 'Master',
-        'CAPTAIN': 'Master',
-        'CHIEF OFFICER': 'Chief Officer',
-        'C/O': 'Chief Officer',
-        '2ND OFFICER': '2nd Officer',
-        '2/O': '2nd Officer',
-        '3RD OFFICER': '3rd Officer',
-        '3/O': '3rd Officer',
-        'CHIEF ENGINEER': 'Chief Engineer',
-        'C/E': 'Chief Engineer',
-        '2ND ENGINEER': '2nd Engineer',
-        '2/E': '2nd Engineer',
-        '3RD ENGINEER': '3rd Engineer',
-        '3/E': '3rd Engineer',
-        'ELECTRO TECHNICAL OFFICER': 'Electro Technical Officer',
-        'ETO': 'Electro Technical Officer',
-        'BOSUN': 'Bosun',
-        'AB': 'Able Seaman',
-        'ABLE SEAMAN': 'Able Seaman',
-        'OILER': 'Oiler',
-        'FITTER': 'Fitter',
-        'COOK': 'Cook',
-        'STEWARD': 'Steward',
-    }
-
-    for pattern, rank in rank_mapping.items():
-        if pattern in title_upper:
-            return rank
-
-    return 'Other'
-
-
-def extract_ship_type(text):
-    """Extract ship type from text"""
-    text_upper = text.upper()
-
-    if any(word in text_upper for word in ['TANKER', 'VLCC', 'AFRAMAX', 'SUEZMAX']):
-        return 'Oil Tanker'
-    elif 'BULK' in text_upper or 'BULKER' in text_upper:
-        return 'Bulk Carrier'
-    elif 'CONTAINER' in text_upper:
-        return 'Container'
-    elif 'LNG' in text_upper:
-        return 'LNG Carrier'
-    elif 'LPG' in text_upper:
-        return 'LPG Carrier'
-    elif 'CHEMICAL' in text_upper:
-        return 'Chemical Tanker'
-    elif 'RO-RO' in text_upper or 'RORO' in text_upper:
-        return 'RoRo'
-
-    return 'Other'
+    return JobPosting.from_dict(job)
 
 
+@metrics.timed('upload')
 def upload_to_supabase(jobs, supabase_client):
     """Upload scraped jobs to Supabase database"""
     if not supabase_client:
@@ -210,50 +188,34 @@ def upload_to_supabase(jobs, supabase_client):
     uploaded = 0
     for job in jobs:
         try:
-            # Prepare job data for Supabase
-            job_data = {
-                'raw_content': job.get('raw_content', ''),
-                'source': job.get('source', 'MariAid'),
-                'status': 'parsed',  # Mark as parsed since we extracted data
-                'rank': job.get('rank', 'Other'),
-                'salary': job.get('salary'),
-                'joining_date': 'ASAP',  # Default joining date
-                'mla_number': job.get('mla_number'),
-                'agency': job.get('agency'),
-                'parsed_content': {
-                    'rank': job.get('rank'),
-                    'shipType': job.get('ship_type', 'Other'),
-                    'salary': job.get('salary'),
-                    'wage': job.get('salary'),
-                    'joining_date': 'ASAP',
-                    'joiningDate': 'ASAP',
-                    'description': job.get('raw_content', ''),
-                    'company': job.get('agency'),
-                    'companyName': job.get('agency'),
-                    'mla_number': job.get('mla_number'),
-                    'contact': job.get('apply_url', ''),
-                    'contactInfo': job.get('apply_url', ''),
-                }
-            }
+            # job_postings row with its parsed_content
+            job_data = job.to_row()
+            job_data['source_id'] = content_hash(job)
 
             # Check if job already exists (by title hash to avoid duplicates)
             title_hash = hash(job.get('title', ''))
+            metrics.inc('http_requests')
             existing = supabase_client.table('job_postings').select('id').eq('raw_content', job.get('raw_content', '')).limit(1).execute()
 
             if existing.data:
+                metrics.inc('uploads_skipped')
                 print(f"   ⏭️  Skipped (duplicate): {job.get('title')}")
                 continue
 
             # Insert job
+            metrics.inc('http_requests')
             result = supabase_client.table('job_postings').insert(job_data).execute()
 
             if result.data:
+                metrics.inc('uploads_ok')
                 uploaded += 1
                 print(f"   ✅ Uploaded: {job.get('title')}")
             else:
+                metrics.inc('upload_errors')
                 print(f"   ❌ Failed to upload: {job.get('title')}")
 
         except Exception as e:
+            metrics.inc('upload_errors')
             print(f"   ❌ Error uploading job: {e}")
             continue
 
@@ -261,26 +223,25 @@ def upload_to_supabase(jobs, supabase_client):
     return uploaded
 
 
-def save_jobs_locally(jobs):
-    """Save jobs to local JSON files for backup"""
-    timestamp = datetime.utcnow().strftime('%Y-%m-%d_%H-%M-%S')
-    os.makedirs(JOBS_DIR, exist_ok=True)
+@metrics.timed('sweep')
+def sweep_stale_jobs(jobs, supabase_client):
+    """Expire rows whose vacancy has been missing from the site for several runs"""
+    try:
+        metrics.inc('http_requests')
+        result = supabase_client.rpc('sweep_stale_jobs', sweep_params(jobs)).execute()
+        return report_sweep(result.data, metrics)
+    except Exception as e:
+        metrics.inc('sweep_errors')
+        print(f"❌ Staleness sweep failed: {e}")
+        return None
 
-    # Save latest jobs
-    latest_file = os.path.join(JOBS_DIR, "latest_jobs.json")
-    with open(latest_file, 'w', encoding='utf-8') as f:
-        json.dump({
-            'scraped_at': datetime.utcnow().isoformat(),
-            'total_jobs': len(jobs),
-            'jobs': jobs
-        }, f, indent=2, ensure_ascii=False)
-    print(f"💾 Saved to {latest_file}")
 
-    # Save timestamped backup
-    timestamped_file = os.path.join(JOBS_DIR, f"jobs_{timestamp}.json")
-    with open(timestamped_file, 'w', encoding='utf-8') as f:
-        json.dump(jobs, f, indent=2, ensure_ascii=False)
-    print(f"💾 Saved to {timestamped_file}")
+@metrics.timed('save_jobs')
+def save_jobs_locally(jobs):
+    """Save jobs to latest JSON plus timestamped NDJSON/CSV(/Parquet) in one pass"""
+    timestamp = datetime.utcnow().strftime('%Y-%m-%d_%H-%M-%S')
+    sinks = local_sinks(JOBS_DIR, timestamp, os.path.join(JOBS_DIR, "latest_jobs.json"))
+    report_sinks(write_jobs(jobs, sinks), metrics)
 
 
 def main():
@@ -293,22 +254,42 @@ def main():
     supabase = get_supabase_client()
 
     # Scrape jobs
+    metrics.reset('scrape_mariaid_jobs_v2')
     jobs = scrape_jobs()
+    metrics.set_info('job_titles', [f"{job.get('title')} - {job.get('rank', 'Unknown rank')}" for job in jobs])
 
     if jobs:
+        # Typed salary / contract / vessel size columns for range filters
+        with metrics.stage('normalize'):
+            normalize_jobs(jobs, metrics)
+
+        # Attach approved agent details by MLA license
+        with metrics.stage('enrich'):
+            enrich_jobs(jobs)
+
+        # Flag reposts of postings already seen (any source, any earlier run)
+        with metrics.stage('near_dup'), NearDupIndex() as index:
+            mark_near_duplicates(jobs, index, metrics)
+
         # Save locally
         save_jobs_locally(jobs)
 
         # Upload to Supabase
         if supabase:
             uploaded = upload_to_supabase(jobs, supabase)
+            sweep_stale_jobs(jobs, supabase)
             print(f"\n🎉 Scraper completed: {len(jobs)} scraped, {uploaded} uploaded to database")
         else:
             print(f"\n✅ Scraper completed: {len(jobs)} jobs saved locally")
+        metrics.set_info('http_hosts', http.host_stats())
+        metrics.write()
     else:
+        metrics.set_info('http_hosts', http.host_stats())
+        metrics.write()
         print("\n⚠️  No jobs found. Please check the website structure.")
         sys.exit(1)
 
 
 if __name__ == "__main__":
-    main()
+    with profile_run('scrape_mariaid_jobs_v2'):
+        main()
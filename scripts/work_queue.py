@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+"""
+Scrape Work Queue
+Splits scraping into fetch and parse tasks that any number of worker
+processes, on one or more machines, pull from a shared broker.
+
+- A producer enqueues `fetch` tasks (one per listing URL) under a batch id.
+- A worker leases a task for a visibility timeout. `fetch` downloads the page
+  and enqueues a `parse` task; `parse` runs the scraper's own extraction
+  (`find_job_elements` -> `extract_job_details`, which uses `extract_rank` /
+  `extract_ship_type`) and stores each job under (batch, content hash).
+- A task whose worker dies is leased again once its visibility timeout
+  passes (at-least-once delivery). Failed tasks retry with backoff and go to
+  `dead` after MAX_ATTEMPTS. Follow-up tasks and results are keyed, so
+  running a task twice never duplicates anything.
+- `publish` hands a finished batch to the scraper's `publish_jobs` (enrich,
+  near-dup, save, upload, sweep).
+
+Brokers are chosen by URL: `sqlite:///path` (built in, fine for one machine
+or several processes) or `postgresql://...` (needs psycopg; use it when
+workers run on several machines).
+
+Usage:
+    python scripts/work_queue.py enqueue [URL ...]
+    python scripts/work_queue.py worker --processes 4 --exit-when-empty
+    python scripts/work_queue.py stats
+    python scripts/work_queue.py publish
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import socket
+import sqlite3
+import argparse
+import importlib
+import multiprocessing
+from datetime import datetime
+
+from html_archive import archive_page
+from job_sinks import content_hash
+
+# Constants
+BROKER_URL = os.environ.get("WORK_QUEUE_URL", "sqlite:///" + os.path.join(".cache", "work_queue.sqlite"))
+DEFAULT_SCRAPER = "scrape_mariaid_jobs_simple"
+VISIBILITY_TIMEOUT = 120  # seconds a leased task is hidden from other workers
+MAX_ATTEMPTS = 5
+RETRY_BASE = 5  # seconds; doubled per attempt
+IDLE_SLEEP = 1.0
+PENDING_STATUSES = ('queued', 'leased')
+
+
+class Task:
+    __slots__ = ('id', 'batch', 'kind', 'payload', 'attempts', 'lease_token')
+
+    def __init__(self, id, batch, kind, payload, attempts, lease_token):
+        self.id = id
+        self.batch = batch
+        self.kind = kind
+        self.payload = payload
+        self.attempts = attempts
+        self.lease_token = lease_token
+
+    def __repr__(self):
+        return f"Task({self.id}, {self.kind!r}, batch={self.batch!r}, attempts={self.attempts})"
+
+
+class Broker:
+    """
+    Queue interface. Tasks are 'queued' -> 'leased' -> 'done' (or back to
+    'queued' on failure / lease expiry, 'dead' after max_attempts). A leased
+    task's `available_at` is its lease expiry.
+    """
+
+    def enqueue(self, batch, kind, payload, key=None, delay=0):
+        """Add a task; a second task with the same (batch, key) is ignored. Returns True if added."""
+        raise NotImplementedError
+
+    def lease(self, owner, visibility_timeout=VISIBILITY_TIMEOUT):
+        """Claim the next ready task (or one whose lease expired), or None."""
+        raise NotImplementedError
+
+    def ack(self, task):
+        """Mark done. False if the lease was lost (another worker owns the task now)."""
+        raise NotImplementedError
+
+    def fail(self, task, error, max_attempts=MAX_ATTEMPTS):
+        """Requeue with backoff, or mark dead after max_attempts."""
+        raise NotImplementedError
+
+    def extend(self, task, visibility_timeout=VISIBILITY_TIMEOUT):
+        """Push the lease expiry out for a long-running task."""
+        raise NotImplementedError
+
+    def put_result(self, batch, key, data):
+        """Store a result once per (batch, key). Returns True if it was new."""
+        raise NotImplementedError
+
+    def results(self, batch):
+        raise NotImplementedError
+
+    def latest_batch(self):
+        raise NotImplementedError
+
+    def stats(self, batch=None):
+        """{status: count} for the batch (all batches if None), plus 'results'."""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    batch TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    key TEXT,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at REAL NOT NULL,
+    lease_token TEXT,
+    lease_owner TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    finished_at REAL,
+    UNIQUE (batch, key)
+);
+CREATE INDEX IF NOT EXISTS tasks_ready ON tasks (available_at) WHERE status IN ('queued', 'leased');
+CREATE TABLE IF NOT EXISTS results (
+    batch TEXT NOT NULL,
+    key TEXT NOT NULL,
+    task_id INTEGER,
+    data TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (batch, key)
+);
+"""
+
+
+class SQLiteBroker(Broker):
+    """Built-in broker: one SQLite file (WAL). Every state change is a single statement."""
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None)  # autocommit
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SQLITE_SCHEMA)
+
+    def enqueue(self, batch, kind, payload, key=None, delay=0):
+        now = time.time()
+        cur = self.conn.execute(
+            "INSERT OR IGNORE INTO tasks (batch, kind, key, payload, available_at, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (batch, kind, key, json.dumps(payload), now + delay, now),
+        )
+        return cur.rowcount == 1
+
+    def lease(self, owner, visibility_timeout=VISIBILITY_TIMEOUT):
+        now, token = time.time(), uuid.uuid4().hex
+        row = self.conn.execute(
+            "UPDATE tasks SET status = 'leased', attempts = attempts + 1, lease_token = ?, lease_owner = ?, "
+            "available_at = ? WHERE id = (SELECT id FROM tasks WHERE status IN ('queued', 'leased') "
+            "AND available_at <= ? ORDER BY available_at, id LIMIT 1) "
+            "RETURNING id, batch, kind, payload, attempts",
+            (token, owner, now + visibility_timeout, now),
+        ).fetchone()
+        if row is None:
+            return None
+        return Task(row[0], row[1], row[2], json.loads(row[3]), row[4], token)
+
+    def ack(self, task):
+        cur = self.conn.execute(
+            "UPDATE tasks SET status = 'done', finished_at = ?, lease_token = NULL, error = NULL "
+            "WHERE id = ? AND lease_token = ?", (time.time(), task.id, task.lease_token))
+        return cur.rowcount == 1
+
+    def fail(self, task, error, max_attempts=MAX_ATTEMPTS):
+        dead = task.attempts >= max_attempts
+        cur = self.conn.execute(
+            "UPDATE tasks SET status = ?, available_at = ?, error = ?, lease_token = NULL, finished_at = ? "
+            "WHERE id = ? AND lease_token = ?",
+            ('dead' if dead else 'queued', time.time() + RETRY_BASE * 2 ** (task.attempts - 1), error,
+             time.time() if dead else None, task.id, task.lease_token))
+        return cur.rowcount == 1
+
+    def extend(self, task, visibility_timeout=VISIBILITY_TIMEOUT):
+        cur = self.conn.execute("UPDATE tasks SET available_at = ? WHERE id = ? AND lease_token = ?",
+                                (time.time() + visibility_timeout, task.id, task.lease_token))
+        return cur.rowcount == 1
+
+    def put_result(self, batch, key, data, task_id=None):
+        cur = self.conn.execute(
+            "INSERT OR IGNORE INTO results (batch, key, task_id, data, created_at) VALUES (?, ?, ?, ?, ?)",
+            (batch, key, task_id, json.dumps(data, ensure_ascii=False), time.time()))
+        return cur.rowcount == 1
+
+    def results(self, batch):
+        rows = self.conn.execute("SELECT data FROM results WHERE batch = ? ORDER BY created_at, key", (batch,))
+        return [json.loads(data) for (data,) in rows]
+
+    def latest_batch(self):
+        row = self.conn.execute("SELECT batch FROM tasks ORDER BY created_at DESC, id DESC LIMIT 1").fetchone()
+        return row[0] if row else None
+
+    def stats(self, batch=None):
+        where, params = ("WHERE batch = ?", (batch,)) if batch else ("", ())
+        counts = dict(self.conn.execute(f"SELECT status, COUNT(*) FROM tasks {where} GROUP BY status", params))
+        counts['results'] = self.conn.execute(f"SELECT COUNT(*) FROM results {where}", params).fetchone()[0]
+        return counts
+
+    def close(self):
+        self.conn.close()
+
+
+POSTGRES_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scrape_tasks (
+    id BIGSERIAL PRIMARY KEY,
+    batch TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    key TEXT,
+    payload JSONB NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    lease_token TEXT,
+    lease_owner TEXT,
+    error TEXT,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    finished_at TIMESTAMPTZ,
+    UNIQUE (batch, key)
+);
+CREATE INDEX IF NOT EXISTS scrape_tasks_ready ON scrape_tasks (available_at) WHERE status IN ('queued', 'leased');
+CREATE TABLE IF NOT EXISTS scrape_results (
+    batch TEXT NOT NULL,
+    key TEXT NOT NULL,
+    task_id BIGINT,
+    data JSONB NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (batch, key)
+);
+"""
+
+
+class PostgresBroker(Broker):
+    """Broker for workers on several machines. Leases use FOR UPDATE SKIP LOCKED."""
+
+    def __init__(self, dsn):
+        try:
+            import psycopg
+        except ImportError:
+            raise RuntimeError('The Postgres broker needs psycopg: pip install "psycopg[binary]"')
+        self.conn = psycopg.connect(dsn, autocommit=True)
+        self.conn.execute(POSTGRES_SCHEMA)
+
+    def enqueue(self, batch, kind, payload, key=None, delay=0):
+        cur = self.conn.execute(
+            "INSERT INTO scrape_tasks (batch, kind, key, payload, available_at) "
+            "VALUES (%s, %s, %s, %s, NOW() + make_interval(secs => %s)) ON CONFLICT DO NOTHING",
+            (batch, kind, key, json.dumps(payload), delay))
+        return cur.rowcount == 1
+
+    def lease(self, owner, visibility_timeout=VISIBILITY_TIMEOUT):
+        token = uuid.uuid4().hex
+        row = self.conn.execute(
+            "UPDATE scrape_tasks SET status = 'leased', attempts = attempts + 1, lease_token = %s, "
+            "lease_owner = %s, available_at = NOW() + make_interval(secs => %s) "
+            "WHERE id = (SELECT id FROM scrape_tasks WHERE status IN ('queued', 'leased') "
+            "AND available_at <= NOW() ORDER BY available_at, id LIMIT 1 FOR UPDATE SKIP LOCKED) "
+            "RETURNING id, batch, kind, payload, attempts",
+            (token, owner, visibility_timeout)).fetchone()
+        if row is None:
+            return None
+        return Task(row[0], row[1], row[2], row[3], row[4], token)
+
+    def ack(self, task):
+        cur = self.conn.execute(
+            "UPDATE scrape_tasks SET status = 'done', finished_at = NOW(), lease_token = NULL, error = NULL "
+            "WHERE id = %s AND lease_token = %s", (task.id, task.lease_token))
+        return cur.rowcount == 1
+
+    def fail(self, task, error, max_attempts=MAX_ATTEMPTS):
+        dead = task.attempts >= max_attempts
+        cur = self.conn.execute(
+            "UPDATE scrape_tasks SET status = %s, error = %s, lease_token = NULL, "
+            "available_at = NOW() + make_interval(secs => %s), "
+            "finished_at = CASE WHEN %s THEN NOW() END WHERE id = %s AND lease_token = %s",
+            ('dead' if dead else 'queued', error, RETRY_BASE * 2 ** (task.attempts - 1), dead,
+             task.id, task.lease_token))
+        return cur.rowcount == 1
+
+    def extend(self, task, visibility_timeout=VISIBILITY_TIMEOUT):
+        cur = self.conn.execute(
+            "UPDATE scrape_tasks SET available_at = NOW() + make_interval(secs => %s) "
+            "WHERE id = %s AND lease_token = %s", (visibility_timeout, task.id, task.lease_token))
+        return cur.rowcount == 1
+
+    def put_result(self, batch, key, data, task_id=None):
+        cur = self.conn.execute(
+            "INSERT INTO scrape_results (batch, key, task_id, data) VALUES (%s, %s, %s, %s) "
+            "ON CONFLICT DO NOTHING", (batch, key, task_id, json.dumps(data, ensure_ascii=False)))
+        return cur.rowcount == 1
+
+    def results(self, batch):
+        rows = self.conn.execute(
+            "SELECT data FROM scrape_results WHERE batch = %s ORDER BY created_at, key", (batch,))
+        return [data for (data,) in rows]
+
+    def latest_batch(self):
+        row = self.conn.execute("SELECT batch FROM scrape_tasks ORDER BY created_at DESC, id DESC LIMIT 1").fetchone()
+        return row[0] if row else None
+
+    def stats(self, batch=None):
+        where, params = ("WHERE batch = %s", (batch,)) if batch else ("", ())
+        counts = dict(self.conn.execute(f"SELECT status, COUNT(*) FROM scrape_tasks {where} GROUP BY status", params))
+        counts['results'] = self.conn.execute(f"SELECT COUNT(*) FROM scrape_results {where}", params).fetchone()[0]
+        return counts
+
+    def close(self):
+        self.conn.close()
+
+
+BROKERS = {
+    'sqlite': lambda url: SQLiteBroker(url[len('sqlite:///'):]),
+    'postgres': PostgresBroker,
+    'postgresql': PostgresBroker,
+}
+
+
+def open_broker(url=BROKER_URL):
+    """Broker for a URL: sqlite:///path, postgresql://... (a bare path means SQLite)."""
+    scheme = url.split('://', 1)[0] if '://' in url else 'sqlite'
+    if scheme not in BROKERS:
+        raise ValueError(f"Unknown broker scheme {scheme!r} (known: {', '.join(sorted(BROKERS))})")
+    return BROKERS[scheme](url if '://' in url else f"sqlite:///{url}")
+
+
+# Task handlers: handler(task, broker) -> None. They must be idempotent.
+
+def _scraper(task):
+    return importlib.import_module(task.payload.get('scraper', DEFAULT_SCRAPER))
+
+
+def handle_fetch(task, broker):
+    scraper = _scraper(task)
+    url = task.payload['url']
+    response = scraper.http.get(url, headers=scraper.HEADERS, timeout=scraper.PAGE_TIMEOUT,
+                                hedge_after=scraper.PAGE_HEDGE_AFTER)
+    response.raise_for_status()
+    archive_page(url, response.content, scraper=scraper.__name__)
+    broker.enqueue(task.batch, 'parse', {**task.payload, 'html': response.text}, key=f"parse:{url}")
+
+
+def handle_parse(task, broker):
+    scraper = _scraper(task)
+    for element in scraper.find_job_elements(task.payload['html']):
+        job = scraper.extract_job_details(element)
+        if job:
+            broker.put_result(task.batch, content_hash(job), job.to_dict(), task_id=task.id)
+
+
+HANDLERS = {
+    'fetch': handle_fetch,
+    'parse': handle_parse,
+}
+
+
+def run_worker(broker_url=BROKER_URL, visibility_timeout=VISIBILITY_TIMEOUT, exit_when_empty=False):
+    """Lease, handle and ack tasks until stopped (or until nothing is pending with exit_when_empty)."""
+    owner = f"{socket.gethostname()}:{os.getpid()}"
+    broker = open_broker(broker_url)
+    handled = 0
+    try:
+        while True:
+            task = broker.lease(owner, visibility_timeout)
+            if task is None:
+                if exit_when_empty and not any(broker.stats().get(s) for s in PENDING_STATUSES):
+                    break
+                time.sleep(IDLE_SLEEP)
+                continue
+            try:
+                HANDLERS[task.kind](task, broker)
+            except Exception as e:
+                broker.fail(task, repr(e))
+                print(f"   ⚠️  [{owner}] {task} failed: {e}")
+                continue
+            if not broker.ack(task):
+                print(f"   ⏱️  [{owner}] lease on {task} expired before ack; result kept (idempotent)")
+            handled += 1
+    except KeyboardInterrupt:
+        pass
+    finally:
+        broker.close()
+    print(f"👷 [{owner}] handled {handled} tasks")
+    return handled
+
+
+def enqueue_listing(broker, urls, batch=None, scraper=DEFAULT_SCRAPER):
+    batch = batch or datetime.utcnow().strftime('%Y-%m-%d_%H-%M-%S')
+    added = sum(broker.enqueue(batch, 'fetch', {'url': url, 'scraper': scraper}, key=f"fetch:{url}") for url in urls)
+    print(f"📥 Batch {batch}: enqueued {added} fetch tasks ({len(urls) - added} already queued)")
+    return batch
+
+
+def publish_batch(broker, batch, force=False):
+    """Run the scraper's publish_jobs on a finished batch. Returns the number of jobs."""
+    from job_posting import JobPosting
+
+    stats = broker.stats(batch)
+    pending = sum(stats.get(s, 0) for s in PENDING_STATUSES)
+    if (pending or stats.get('dead')) and not force:
+        sys.exit(f"❌ Batch {batch} is not complete ({pending} pending, {stats.get('dead', 0)} dead); use --force")
+    jobs = [JobPosting.from_dict(job) for job in broker.results(batch)]
+    if not jobs:
+        sys.exit(f"❌ Batch {batch} has no results")
+    print(f"📦 Publishing {len(jobs)} jobs from batch {batch}")
+    importlib.import_module(DEFAULT_SCRAPER).publish_jobs(jobs)
+    return len(jobs)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Distributed scrape work queue")
+    parser.add_argument('--broker', default=BROKER_URL, help="sqlite:///path or postgresql://... (default: $WORK_QUEUE_URL)")
+    sub = parser.add_subparsers(dest='command', required=True)
+    enqueue_cmd = sub.add_parser('enqueue', help="Enqueue fetch tasks for listing pages")
+    enqueue_cmd.add_argument('urls', nargs='*')
+    enqueue_cmd.add_argument('--batch')
+    worker_cmd = sub.add_parser('worker', help="Run worker processes")
+    worker_cmd.add_argument('--processes', type=int, default=1)
+    worker_cmd.add_argument('--visibility-timeout', type=float, default=VISIBILITY_TIMEOUT)
+    worker_cmd.add_argument('--exit-when-empty', action='store_true')
+    stats_cmd = sub.add_parser('stats', help="Task counts by status")
+    stats_cmd.add_argument('--batch')
+    publish_cmd = sub.add_parser('publish', help="Enrich, save and upload a finished batch")
+    publish_cmd.add_argument('--batch', help="Default: the latest batch")
+    publish_cmd.add_argument('--force', action='store_true', help="Publish even if tasks are pending or dead")
+    args = parser.parse_args(argv)
+
+    if args.command == 'worker':
+        worker_args = (args.broker, args.visibility_timeout, args.exit_when_empty)
+        if args.processes == 1:
+            run_worker(*worker_args)
+            return
+        processes = [multiprocessing.Process(target=run_worker, args=worker_args) for _ in range(args.processes)]
+        for p in processes:
+            p.start()
+        for p in processes:
+            p.join()
+        return
+
+    broker = open_broker(args.broker)
+    try:
+        if args.command == 'enqueue':
+            enqueue_listing(broker, args.urls or [importlib.import_module(DEFAULT_SCRAPER).URL], args.batch)
+        elif args.command == 'stats':
+            print(json.dumps(broker.stats(args.batch), indent=2))
+        elif args.command == 'publish':
+            batch = args.batch or broker.latest_batch()
+            if not batch:
+                sys.exit("❌ No batches in the queue")
+            publish_batch(broker, batch, args.force)
+    finally:
+        broker.close()
+
+
+if __name__ == "__main__":
+    main()
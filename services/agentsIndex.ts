@@ -0,0 +1,155 @@
+import { ManningAgent } from '../types';
+
+// Lazily loaded agents dataset written by `generate_agents_ts.py --shards-dir public/data/agents`.
+// index.json holds the search index; agent rows live in shard-NNN.json files
+// that are only fetched when a result from that shard is needed.
+
+const DEFAULT_BASE_URL = '/data/agents';
+
+interface ShardInfo {
+  file: string;
+  count: number;
+  bytes: number;
+}
+
+export interface AgentIndex {
+  version: number;
+  total: number;
+  shardSize: number;
+  fields: string[];
+  terms: [string, number[]][]; // sorted by term
+  licenses: Record<string, number>;
+  cities: Record<string, string>; // base64 bitsets over doc ids
+  statuses: Record<string, string>;
+  shards: ShardInfo[];
+}
+
+export interface AgentQuery {
+  query?: string;
+  city?: string; // 'All' or undefined = no filter
+  status?: ManningAgent['status'];
+}
+
+const searchKey = (s: string) => s.toLowerCase().replace(/[^a-z0-9]/g, '');
+
+// Keyed by base URL (and shard), so two datasets never share entries
+const indexCache = new Map<string, Promise<AgentIndex>>();
+const shardCache = new Map<string, Promise<ManningAgent[]>>();
+const bitmapCache = new Map<string, Uint8Array>();
+
+export const loadAgentIndex = (baseUrl: string = DEFAULT_BASE_URL): Promise<AgentIndex> => {
+  let promise = indexCache.get(baseUrl);
+  if (!promise) {
+    promise = fetch(`${baseUrl}/index.json`).then(res => {
+      if (!res.ok) throw new Error(`Failed to load agent index (${res.status})`);
+      return res.json();
+    });
+    promise.catch(() => indexCache.delete(baseUrl));
+    indexCache.set(baseUrl, promise);
+  }
+  return promise;
+};
+
+const decodeBitmap = (b64: string): Uint8Array => {
+  let bits = bitmapCache.get(b64);
+  if (!bits) {
+    const raw = atob(b64);
+    bits = new Uint8Array(raw.length);
+    for (let i = 0; i < raw.length; i++) bits[i] = raw.charCodeAt(i);
+    bitmapCache.set(b64, bits);
+  }
+  return bits;
+};
+
+const hasBit = (bits: Uint8Array, id: number) => (bits[id >> 3] & (1 << (id & 7))) !== 0;
+
+// First term >= prefix (binary search over the sorted term list)
+const lowerBound = (terms: AgentIndex['terms'], prefix: string): number => {
+  let lo = 0;
+  let hi = terms.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >> 1;
+    if (terms[mid][0] < prefix) lo = mid + 1;
+    else hi = mid;
+  }
+  return lo;
+};
+
+const idsForPrefix = (index: AgentIndex, prefix: string): Set<number> => {
+  const ids = new Set<number>();
+  for (let i = lowerBound(index.terms, prefix); i < index.terms.length && index.terms[i][0].startsWith(prefix); i++) {
+    for (const id of index.terms[i][1]) ids.add(id);
+  }
+  return ids;
+};
+
+/** Doc ids matching every word of the query (as a prefix) and the city/status filters. */
+export const searchAgentIds = (index: AgentIndex, { query = '', city, status }: AgentQuery): number[] => {
+  let candidates: Set<number> | null = null;
+
+  const compact = searchKey(query);
+  if (compact && index.licenses[compact] !== undefined) {
+    candidates = new Set([index.licenses[compact]]);
+  } else {
+    for (const word of query.toLowerCase().split(/[^a-z0-9]+/).filter(Boolean)) {
+      const ids = idsForPrefix(index, word);
+      candidates = candidates === null ? ids : new Set([...candidates].filter(id => ids.has(id)));
+      if (candidates.size === 0) break;
+    }
+    // "MLA-00" splits into words that don't match the compact license key
+    if (candidates !== null && candidates.size === 0 && compact) {
+      candidates = idsForPrefix(index, compact);
+    }
+  }
+
+  const cityBits = city && city !== 'All' && index.cities[city] ? decodeBitmap(index.cities[city]) : null;
+  const statusBits = status && index.statuses[status] ? decodeBitmap(index.statuses[status]) : null;
+
+  const result: number[] = [];
+  const ids = candidates ?? Array.from({ length: index.total }, (_, i) => i);
+  for (const id of ids) {
+    if (cityBits && !hasBit(cityBits, id)) continue;
+    if (statusBits && !hasBit(statusBits, id)) continue;
+    result.push(id);
+  }
+  return result.sort((a, b) => a - b);
+};
+
+const loadShard = (index: AgentIndex, shard: number, baseUrl: string): Promise<ManningAgent[]> => {
+  const key = `${baseUrl}/${shard}`;
+  let promise = shardCache.get(key);
+  if (!promise) {
+    promise = fetch(`${baseUrl}/${index.shards[shard].file}`)
+      .then(res => {
+        if (!res.ok) throw new Error(`Failed to load agent shard ${shard} (${res.status})`);
+        return res.json() as Promise<unknown[][]>;
+      })
+      .then(rows => rows.map(row => {
+        const agent: Record<string, unknown> = {};
+        index.fields.forEach((field, i) => {
+          if (row[i] !== null) agent[field] = row[i];
+        });
+        return agent as unknown as ManningAgent;
+      }));
+    promise.catch(() => shardCache.delete(key));
+    shardCache.set(key, promise);
+  }
+  return promise;
+};
+
+/** Fetch the agents for the given doc ids, loading only the shards they live in. */
+export const getAgentsByIds = async (
+  index: AgentIndex,
+  ids: number[],
+  baseUrl: string = DEFAULT_BASE_URL
+): Promise<ManningAgent[]> => {
+  const shardIds = [...new Set(ids.map(id => Math.floor(id / index.shardSize)))];
+  const shards = new Map<number, ManningAgent[]>();
+  await Promise.all(shardIds.map(async s => shards.set(s, await loadShard(index, s, baseUrl))));
+  return ids.map(id => shards.get(Math.floor(id / index.shardSize))![id % index.shardSize]);
+};
+
+export const searchAgents = async (query: AgentQuery, baseUrl: string = DEFAULT_BASE_URL): Promise<ManningAgent[]> => {
+  const index = await loadAgentIndex(baseUrl);
+  return getAgentsByIds(index, searchAgentIds(index, query), baseUrl);
+};
@@ -0,0 +1,264 @@
+// Static job search index written after each scraper run by `scripts/job_index.py`
+// (default public/data/jobs). index.json holds the facets and file list; the
+// salary/contract range arrays, title term files and job row shards are only
+// fetched when a query or a result needs them.
+
+const DEFAULT_BASE_URL = '/data/jobs';
+
+interface FileInfo {
+  file: string;
+  count: number;
+}
+
+interface ShardInfo extends FileInfo {
+  bytes: number;
+}
+
+export interface JobIndex {
+  version: number;
+  total: number;
+  shardSize: number;
+  fields: string[];
+  rank: Record<string, string>; // base64 bitsets over doc ids
+  shipType: Record<string, string>;
+  agency: Record<string, number[]>; // sorted doc ids
+  ranges: Record<'salary' | 'contract', FileInfo>;
+  terms: Record<string, FileInfo>; // first character of the term -> terms/<c>.json
+  shards: ShardInfo[];
+}
+
+/** A scraped job row as stored in the shards (snake_case, like the scraper output). */
+export interface IndexedJob {
+  id: string;
+  title?: string;
+  rank?: string;
+  ship_type?: string;
+  salary?: string;
+  contract?: string;
+  positions?: number;
+  apply_url?: string;
+  source?: string;
+  mla_number?: string;
+  agency?: string;
+  scraped_at?: string;
+  duplicate_of?: string;
+  salary_min?: number;
+  salary_max?: number;
+  salary_currency?: string;
+  salary_period?: 'day' | 'week' | 'month' | 'year';
+  contract_months?: number;
+  contract_extension_months?: number;
+  dwt?: number;
+  grt?: number;
+  teu?: number;
+  raw_content?: string;
+}
+
+export interface JobQuery {
+  title?: string; // each word matched as a prefix of a title word
+  rank?: string | string[]; // any of the values; 'All' or undefined = no filter
+  shipType?: string | string[];
+  agency?: string;
+  salaryMin?: number; // USD per month (the posting's salary_min, converted to monthly)
+  salaryMax?: number;
+  contractMin?: number; // months
+  contractMax?: number;
+}
+
+interface RangeArray {
+  values: Int32Array; // ascending
+  ids: Uint32Array; // doc id of each value
+}
+
+let indexPromise: Promise<JobIndex> | null = null;
+const rangeCache = new Map<string, Promise<RangeArray>>();
+const termCache = new Map<string, Promise<[string, number[]][]>>();
+const shardCache = new Map<number, Promise<IndexedJob[]>>();
+const bitmapCache = new Map<string, Uint8Array>();
+
+const fetchOk = (url: string, what: string): Promise<Response> =>
+  fetch(url).then(res => {
+    if (!res.ok) throw new Error(`Failed to load ${what} (${res.status})`);
+    return res;
+  });
+
+const cached = <K, V>(cache: Map<K, Promise<V>>, key: K, load: () => Promise<V>): Promise<V> => {
+  let promise = cache.get(key);
+  if (!promise) {
+    promise = load();
+    promise.catch(() => cache.delete(key));
+    cache.set(key, promise);
+  }
+  return promise;
+};
+
+export const loadJobIndex = (baseUrl: string = DEFAULT_BASE_URL): Promise<JobIndex> => {
+  if (!indexPromise) {
+    indexPromise = fetchOk(`${baseUrl}/index.json`, 'job index').then(res => res.json());
+    indexPromise.catch(() => { indexPromise = null; });
+  }
+  return indexPromise;
+};
+
+const decodeBitmap = (b64: string): Uint8Array => {
+  let bits = bitmapCache.get(b64);
+  if (!bits) {
+    const raw = atob(b64);
+    bits = new Uint8Array(raw.length);
+    for (let i = 0; i < raw.length; i++) bits[i] = raw.charCodeAt(i);
+    bitmapCache.set(b64, bits);
+  }
+  return bits;
+};
+
+// uint32 n, int32 values[n], uint32 ids[n], little-endian
+const loadRange = (index: JobIndex, name: 'salary' | 'contract', baseUrl: string): Promise<RangeArray> =>
+  cached(rangeCache, name, () =>
+    fetchOk(`${baseUrl}/${index.ranges[name].file}`, `job ${name} range`)
+      .then(res => res.arrayBuffer())
+      .then(buffer => {
+        const view = new DataView(buffer);
+        const n = view.getUint32(0, true);
+        const values = new Int32Array(n);
+        const ids = new Uint32Array(n);
+        for (let i = 0; i < n; i++) {
+          values[i] = view.getInt32(4 + 4 * i, true);
+          ids[i] = view.getUint32(4 + 4 * (n + i), true);
+        }
+        return { values, ids };
+      }));
+
+const loadTerms = (index: JobIndex, c: string, baseUrl: string): Promise<[string, number[]][]> =>
+  index.terms[c]
+    ? cached(termCache, c, () => fetchOk(`${baseUrl}/${index.terms[c].file}`, 'job terms').then(res => res.json()))
+    : Promise.resolve([]);
+
+// First position whose value is >= target (or > target when `upper`)
+const bound = <T>(length: number, at: (i: number) => T, target: T, upper = false): number => {
+  let lo = 0;
+  let hi = length;
+  while (lo < hi) {
+    const mid = (lo + hi) >> 1;
+    if (at(mid) < target || (upper && at(mid) === target)) lo = mid + 1;
+    else hi = mid;
+  }
+  return lo;
+};
+
+const markFacet = (bits: Uint8Array, facet: Record<string, string>, values: string | string[]) => {
+  for (const value of Array.isArray(values) ? values : [values]) {
+    const valueBits = decodeBitmap(facet[value] ?? '');
+    for (let i = 0; i < valueBits.length; i++) bits[i] |= valueBits[i];
+  }
+};
+
+const markRange = (bits: Uint8Array, range: RangeArray, min?: number, max?: number) => {
+  const start = min === undefined ? 0 : bound(range.values.length, i => range.values[i], min);
+  const end = max === undefined ? range.values.length : bound(range.values.length, i => range.values[i], max, true);
+  for (let i = start; i < end; i++) bits[range.ids[i] >> 3] |= 1 << (range.ids[i] & 7);
+};
+
+const markPrefix = (bits: Uint8Array, terms: [string, number[]][], prefix: string) => {
+  for (let i = bound(terms.length, j => terms[j][0], prefix); i < terms.length && terms[i][0].startsWith(prefix); i++) {
+    for (const id of terms[i][1]) bits[id >> 3] |= 1 << (id & 7);
+  }
+};
+
+/** Monthly USD minimum of a row, the value its salary range entry holds (job_index._salary_value). */
+export const monthlySalary = (job: IndexedJob): number | undefined => {
+  if (job.salary_min === undefined || (job.salary_currency && job.salary_currency !== 'USD')) return undefined;
+  switch (job.salary_period) {
+    case 'day': return job.salary_min * 30;
+    case 'week': return Math.floor(job.salary_min * 52 / 12);
+    case 'year': return Math.floor(job.salary_min / 12);
+    default: return job.salary_min;
+  }
+};
+
+/** Doc ids (ascending, newest job first) matching every filter in the query. */
+export const searchJobIds = async (
+  index: JobIndex,
+  query: JobQuery,
+  baseUrl: string = DEFAULT_BASE_URL
+): Promise<number[]> => {
+  const size = (index.total + 7) >> 3;
+  const masks: Uint8Array[] = [];
+
+  const facets: [Record<string, string>, string | string[] | undefined][] = [
+    [index.rank, query.rank],
+    [index.shipType, query.shipType],
+  ];
+  for (const [facet, values] of facets) {
+    if (!values || values === 'All') continue;
+    const bits = new Uint8Array(size);
+    markFacet(bits, facet, values);
+    masks.push(bits);
+  }
+  if (query.agency) {
+    const bits = new Uint8Array(size);
+    for (const id of index.agency[query.agency] ?? []) bits[id >> 3] |= 1 << (id & 7);
+    masks.push(bits);
+  }
+  for (const word of (query.title ?? '').toLowerCase().split(/[^a-z0-9]+/).filter(Boolean)) {
+    const bits = new Uint8Array(size);
+    markPrefix(bits, await loadTerms(index, word[0], baseUrl), word);
+    masks.push(bits);
+  }
+  if (query.salaryMin !== undefined || query.salaryMax !== undefined) {
+    const bits = new Uint8Array(size);
+    markRange(bits, await loadRange(index, 'salary', baseUrl), query.salaryMin, query.salaryMax);
+    masks.push(bits);
+  }
+  if (query.contractMin !== undefined || query.contractMax !== undefined) {
+    const bits = new Uint8Array(size);
+    markRange(bits, await loadRange(index, 'contract', baseUrl), query.contractMin, query.contractMax);
+    masks.push(bits);
+  }
+
+  const result: number[] = [];
+  for (let byte = 0; byte < size; byte++) {
+    let word = 0xff;
+    for (const mask of masks) word &= mask[byte] ?? 0;
+    if (!word) continue;
+    for (let bit = 0; bit < 8; bit++) {
+      const id = (byte << 3) | bit;
+      if (word & (1 << bit) && id < index.total) result.push(id);
+    }
+  }
+  return result;
+};
+
+const loadShard = (index: JobIndex, shard: number, baseUrl: string): Promise<IndexedJob[]> =>
+  cached(shardCache, shard, () =>
+    fetchOk(`${baseUrl}/${index.shards[shard].file}`, `job shard ${shard}`)
+      .then(res => res.json() as Promise<unknown[][]>)
+      .then(rows => rows.map(row => {
+        const job: Record<string, unknown> = {};
+        index.fields.forEach((field, i) => {
+          if (row[i] !== null) job[field] = row[i];
+        });
+        return job as unknown as IndexedJob;
+      })));
+
+/** Fetch the jobs for the given doc ids, loading only the shards they live in. */
+export const getJobsByIds = async (
+  index: JobIndex,
+  ids: number[],
+  baseUrl: string = DEFAULT_BASE_URL
+): Promise<IndexedJob[]> => {
+  const shardIds = [...new Set(ids.map(id => Math.floor(id / index.shardSize)))];
+  const shards = new Map<number, IndexedJob[]>();
+  await Promise.all(shardIds.map(async s => shards.set(s, await loadShard(index, s, baseUrl))));
+  return ids.map(id => shards.get(Math.floor(id / index.shardSize))![id % index.shardSize]);
+};
+
+/** One page of matching jobs plus the total match count; only that page's shards are fetched. */
+export const searchJobs = async (
+  query: JobQuery,
+  { offset = 0, limit = 50 }: { offset?: number; limit?: number } = {},
+  baseUrl: string = DEFAULT_BASE_URL
+): Promise<{ total: number; jobs: IndexedJob[] }> => {
+  const index = await loadJobIndex(baseUrl);
+  const ids = await searchJobIds(index, query, baseUrl);
+  return { total: ids.length, jobs: await getJobsByIds(index, ids.slice(offset, offset + limit), baseUrl) };
+};
@@ -0,0 +1,13 @@
+-- Manning Agents License Key
+-- parse.py now loads agents with INSERT ... ON CONFLICT (license_number) DO UPDATE
+-- instead of TRUNCATE + INSERT, which needs a unique key on license_number.
+
+-- 1. Drop duplicate licenses left by earlier full reloads (keep the newest row)
+DELETE FROM public.manning_agents a
+USING public.manning_agents b
+WHERE a.license_number = b.license_number
+  AND (a.created_at, a.id) < (b.created_at, b.id);
+
+-- 2. Unique key used by the upsert
+CREATE UNIQUE INDEX IF NOT EXISTS manning_agents_license_number_key
+  ON public.manning_agents (license_number);
@@ -0,0 +1,84 @@
+-- Job Staleness Sweeper
+-- Scrapers only insert, so vacancies removed from the source stayed live forever.
+-- After each scrape, sweep_stale_jobs() is called once with the content hashes
+-- (source_id) of every job still listed; active rows of that source that are
+-- missing count a missed run and expire after p_max_missed consecutive misses.
+
+-- 1. Consecutive runs a row was missing from its source's listing
+ALTER TABLE public.job_postings
+  ADD COLUMN IF NOT EXISTS missed_runs INTEGER NOT NULL DEFAULT 0,
+  ADD COLUMN IF NOT EXISTS last_seen_at TIMESTAMP WITH TIME ZONE;
+
+-- 2. Backfill content-hash ids for scraped rows inserted without one
+--    (source_id = sha1 of raw_content, as in scripts/job_sinks.content_hash)
+CREATE EXTENSION IF NOT EXISTS pgcrypto WITH SCHEMA extensions;
+
+UPDATE public.job_postings
+SET source_id = encode(extensions.digest(raw_content, 'sha1'), 'hex')
+WHERE source = 'MariAid'
+  AND source_id IS NULL
+  AND raw_content IS NOT NULL;
+
+-- 3. Only active rows are swept, so the sweep reads the (small) active set of
+--    one source, however many expired rows pile up behind it
+CREATE INDEX IF NOT EXISTS idx_job_postings_active_source
+  ON public.job_postings (source, source_id)
+  WHERE status IN ('published', 'approved', 'parsed');
+
+-- 4. One set difference and one batched UPDATE per scrape
+CREATE OR REPLACE FUNCTION sweep_stale_jobs(
+  p_source TEXT,
+  p_seen_ids TEXT[],
+  p_max_missed INTEGER DEFAULT 3
+)
+RETURNS TABLE (active INTEGER, seen INTEGER, missed INTEGER, expired INTEGER) AS $$
+BEGIN
+  -- An empty listing means the scrape broke, not that every job was filled
+  IF p_seen_ids IS NULL OR cardinality(p_seen_ids) = 0 THEN
+    RETURN QUERY SELECT 0, 0, 0, 0;
+    RETURN;
+  END IF;
+
+  RETURN QUERY
+  WITH listed AS (
+    SELECT DISTINCT unnest(p_seen_ids) AS source_id
+  ),
+  candidates AS (
+    -- Active rows that need a write: missing now, or seen again after a miss
+    SELECT j.id, (l.source_id IS NOT NULL) AS is_seen
+    FROM public.job_postings j
+    LEFT JOIN listed l ON l.source_id = j.source_id
+    WHERE j.source = p_source
+      AND j.status IN ('published', 'approved', 'parsed')
+      AND j.source_id IS NOT NULL
+      AND (l.source_id IS NULL OR j.missed_runs > 0 OR j.last_seen_at IS NULL)
+  ),
+  swept AS (
+    UPDATE public.job_postings j
+    SET missed_runs = CASE WHEN c.is_seen THEN 0 ELSE j.missed_runs + 1 END,
+        last_seen_at = CASE WHEN c.is_seen THEN NOW() ELSE j.last_seen_at END,
+        status = CASE WHEN NOT c.is_seen AND j.missed_runs + 1 >= p_max_missed
+                      THEN 'expired' ELSE j.status END,
+        expires_at = CASE WHEN NOT c.is_seen AND j.missed_runs + 1 >= p_max_missed
+                          THEN NOW() ELSE j.expires_at END
+    FROM candidates c
+    WHERE j.id = c.id
+    RETURNING c.is_seen, j.status
+  )
+  SELECT
+    (SELECT COUNT(*)::INTEGER FROM public.job_postings
+      WHERE source = p_source AND status IN ('published', 'approved', 'parsed') AND source_id IS NOT NULL),
+    (SELECT COUNT(*)::INTEGER FROM listed),
+    COUNT(*) FILTER (WHERE NOT s.is_seen)::INTEGER,
+    COUNT(*) FILTER (WHERE s.status = 'expired')::INTEGER
+  FROM swept s;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public, pg_temp;
+
+-- Runs with the owner's rights: only the scraper's service role may call it
+REVOKE EXECUTE ON FUNCTION sweep_stale_jobs(TEXT, TEXT[], INTEGER) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION sweep_stale_jobs(TEXT, TEXT[], INTEGER) TO service_role;
+
+COMMENT ON COLUMN job_postings.missed_runs IS 'Consecutive scrapes this row was missing from its source listing (reset when seen)';
+COMMENT ON COLUMN job_postings.last_seen_at IS 'Last scrape that still listed this row';
+COMMENT ON FUNCTION sweep_stale_jobs(TEXT, TEXT[], INTEGER) IS 'Expire active rows of a source missing from p_max_missed consecutive scrapes';
@@ -0,0 +1,89 @@
+-- Numeric Job Attributes
+-- Salary, contract and vessel size were only stored as text ("$3500 - $4200",
+-- "8M (+1)", "DWT/GRT/TEU: 105940/57220" inside raw_content), so every range
+-- filter had to parse strings row by row. The scrapers now normalize them at
+-- ingest (scripts/job_numbers.py) into typed columns; this migration adds the
+-- columns, monthly salary columns generated from them, and range indexes.
+
+-- 1. Typed columns written by the scrapers
+ALTER TABLE public.job_postings
+  ADD COLUMN IF NOT EXISTS salary_min INTEGER,
+  ADD COLUMN IF NOT EXISTS salary_max INTEGER,
+  ADD COLUMN IF NOT EXISTS salary_currency TEXT,
+  ADD COLUMN IF NOT EXISTS salary_period TEXT,
+  ADD COLUMN IF NOT EXISTS contract_months SMALLINT,
+  ADD COLUMN IF NOT EXISTS contract_extension_months SMALLINT,
+  ADD COLUMN IF NOT EXISTS dwt INTEGER,
+  ADD COLUMN IF NOT EXISTS grt INTEGER,
+  ADD COLUMN IF NOT EXISTS teu INTEGER;
+
+ALTER TABLE public.job_postings DROP CONSTRAINT IF EXISTS job_postings_salary_period_check;
+ALTER TABLE public.job_postings
+  ADD CONSTRAINT job_postings_salary_period_check
+  CHECK (salary_period IN ('day', 'week', 'month', 'year'));
+
+-- 2. Salary per month whatever period the posting quoted, so "salary >= X"
+--    compares like with like (same arithmetic as job_numbers.monthly)
+ALTER TABLE public.job_postings
+  ADD COLUMN IF NOT EXISTS salary_min_monthly INTEGER GENERATED ALWAYS AS (
+    CASE salary_period
+      WHEN 'day' THEN salary_min * 30
+      WHEN 'week' THEN salary_min * 52 / 12
+      WHEN 'year' THEN salary_min / 12
+      ELSE salary_min
+    END) STORED,
+  ADD COLUMN IF NOT EXISTS salary_max_monthly INTEGER GENERATED ALWAYS AS (
+    CASE salary_period
+      WHEN 'day' THEN salary_max * 30
+      WHEN 'week' THEN salary_max * 52 / 12
+      WHEN 'year' THEN salary_max / 12
+      ELSE salary_max
+    END) STORED;
+
+-- 3. Backfill scraped rows inserted before the scrapers normalized. Only rows
+--    holding a single MariAid card are parsed; older rows that captured the
+--    whole listing page are left NULL rather than given another card's values.
+UPDATE public.job_postings j
+SET salary_min = replace(p.salary[1], ',', '')::INTEGER,
+    salary_max = replace(coalesce(p.salary[2], p.salary[1]), ',', '')::INTEGER,
+    salary_currency = CASE WHEN p.salary IS NOT NULL THEN 'USD' END,
+    salary_period = CASE WHEN p.salary IS NOT NULL THEN 'month' END,
+    contract_months = p.contract[1]::SMALLINT,
+    contract_extension_months = coalesce(p.contract[2], '0')::SMALLINT,
+    dwt = nullif(p.size[1], '--')::INTEGER,
+    grt = nullif(p.size[2], '--')::INTEGER,
+    teu = nullif(p.size[3], '--')::INTEGER
+FROM (
+  SELECT id,
+         regexp_match(raw_content, 'Salary:\s*\$\s*([\d,]+)(?:\s*-\s*\$?\s*([\d,]+))?') AS salary,
+         regexp_match(raw_content, 'Contract Duration:\s*(\d{1,2})M\s*(?:\(\+(\d{1,2})\))?') AS contract,
+         regexp_match(raw_content, 'DWT/GRT/TEU:\s*(\d+|--)\s*/\s*(\d+|--)(?:\s*/\s*(\d+|--))?') AS size
+  FROM public.job_postings
+  WHERE source = 'MariAid'
+    AND raw_content IS NOT NULL
+    AND raw_content !~ 'Apply Now.*Apply Now'
+    AND salary_min IS NULL AND contract_months IS NULL AND dwt IS NULL
+) p
+WHERE j.id = p.id;
+
+-- 4. Range indexes over active rows. A posting's salary range overlaps
+--    "at least X" when salary_max_monthly >= X and "at most Y" when
+--    salary_min_monthly <= Y.
+CREATE INDEX IF NOT EXISTS idx_job_postings_salary_max_monthly
+  ON public.job_postings (salary_max_monthly)
+  WHERE status IN ('published', 'approved', 'parsed') AND salary_max_monthly IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_job_postings_salary_min_monthly
+  ON public.job_postings (salary_min_monthly)
+  WHERE status IN ('published', 'approved', 'parsed') AND salary_min_monthly IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_job_postings_contract_months
+  ON public.job_postings (contract_months)
+  WHERE status IN ('published', 'approved', 'parsed') AND contract_months IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_job_postings_dwt
+  ON public.job_postings (dwt)
+  WHERE status IN ('published', 'approved', 'parsed') AND dwt IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_job_postings_grt
+  ON public.job_postings (grt)
+  WHERE status IN ('published', 'approved', 'parsed') AND grt IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_job_postings_teu
+  ON public.job_postings (teu)
+  WHERE status IN ('published', 'approved', 'parsed') AND teu IS NOT NULL;
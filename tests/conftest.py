@@ -0,0 +1,8 @@
+import os
+import sys
+
+# scripts/ modules import each other by plain name, as when run from there
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (REPO_ROOT, os.path.join(REPO_ROOT, "scripts")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -0,0 +1,49 @@
+import json
+
+import benchmark_gemini_models as bench
+from gemini_stub_server import start_stub_server
+
+CARDS = [
+    "SECOND OFF - VLCC | Deadline: By Date | Contract Duration: 8M (+1) | Salary: $3500 - $4200",
+    "AB - Crude Oil | Deadline: Urgent | Contract Duration: 8M (+1) | Salary: Negotiable",
+    "OILER - Oil/Chem | Deadline: By Date | Contract Duration: 6M (+1) | Salary: $1200",
+    "THIRD ENG - Crude Oil | Deadline: By Date | Contract Duration: 6M (+1) | Salary: $5000 - $5500",
+]
+
+
+def write_snapshot(jobs_dir):
+    jobs_dir.mkdir()
+    jobs = [{'title': card.split(' | ', 1)[0], 'raw_text': card + " | View Details | Apply Now"} for card in CARDS]
+    (jobs_dir / "jobs_20260101_000000.json").write_text(json.dumps(jobs))
+
+
+def test_corpus_expects_what_the_card_carries(tmp_path):
+    write_snapshot(tmp_path / "jobs")
+    corpus = bench.build_corpus(str(tmp_path / "jobs"))
+    first = next(item for item in corpus if item['text'].startswith("SECOND OFF"))
+    assert first['expected'] == {'rank': 'SECOND OFF', 'salary': '$3500 - $4200', 'joining_date': 'By Date'}
+
+
+def test_stub_benchmark_ranks_clean_over_noisy_failing_and_missing_models(tmp_path):
+    write_snapshot(tmp_path / "jobs")
+    server, base_url = start_stub_server({
+        'models/clean': {},
+        'models/noisy': {'noise': 1.0},
+        'models/flaky': {'error_rate': 1.0},
+    })
+    try:
+        report = bench.run_benchmark(['models/noisy', 'models/flaky', 'models/missing', 'models/clean'],
+                                     base_url=base_url, reports_dir=str(tmp_path / "reports"),
+                                     jobs_dir=str(tmp_path / "jobs"), timeout=5)
+    finally:
+        server.shutdown()
+
+    by_model = {r['model']: r for r in report['ranking']}
+    assert report['recommended_model'] == 'models/clean'
+    assert [r['model'] for r in report['ranking']][:2] == ['models/clean', 'models/noisy']
+    assert by_model['models/clean']['accuracy'] == 1.0 and by_model['models/clean']['invented_rate'] == 0.0
+    assert by_model['models/noisy']['field_accuracy']['salary'] == 0.0
+    assert by_model['models/noisy']['invented_rate'] == 1.0
+    assert by_model['models/flaky']['error_rate'] == 1.0 and by_model['models/missing']['error_rate'] == 1.0
+    assert by_model['models/clean']['prompt_tokens'] > 0
+    assert (tmp_path / "reports" / "latest-model-bench.md").exists()
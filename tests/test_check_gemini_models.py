@@ -0,0 +1,71 @@
+import time
+import threading
+from types import SimpleNamespace
+
+import check_gemini_models as checker
+
+
+class FakeModels:
+    """Stands in for `client.models`: a slow model, a missing one, and the rest answer at once."""
+
+    def __init__(self, names, slow=(), missing=()):
+        self.names = names
+        self.slow = set(slow)
+        self.missing = set(missing)
+        self.list_calls = 0
+        self.release = threading.Event()
+
+    def list(self):
+        self.list_calls += 1
+        return [SimpleNamespace(name=name) for name in self.names]
+
+    def get(self, model):
+        if model in self.slow:
+            self.release.wait(5)
+        if model in self.missing:
+            raise RuntimeError(f"404 NOT_FOUND. models/{model} is not found")
+        return SimpleNamespace(name=model, display_name=model.split('/')[-1], description='',
+                               input_token_limit=1000, output_token_limit=100, supported_actions=['generateContent'])
+
+
+def fake_client(**kwargs):
+    return SimpleNamespace(models=FakeModels(**kwargs))
+
+
+def test_probe_reports_available_missing_and_timed_out_models():
+    client = fake_client(names=[], slow=['models/slow'], missing=['models/gone'])
+    started = time.perf_counter()
+    try:
+        results = checker.probe_models(client, ['models/ok', 'models/gone', 'models/slow'], timeout=0.3)
+    finally:
+        client.models.release.set()
+
+    assert time.perf_counter() - started < 2  # the slow probe does not hold up the check
+    assert results['models/ok']['available'] and results['models/ok']['info']['display_name'] == 'ok'
+    assert not results['models/gone']['available'] and '404' in results['models/gone']['error']
+    assert results['models/slow'] == {"available": False, "info": None,
+                                      "error": "timeout after 0.3s", "latency_ms": None}
+
+
+def test_probe_deduplicates_model_names():
+    results = checker.probe_models(fake_client(names=[]), ['models/a', 'models/a'])
+    assert list(results) == ['models/a']
+
+
+def test_catalog_is_served_from_cache_until_ttl(tmp_path):
+    cache_file = str(tmp_path / "model-catalog.json")
+    client = fake_client(names=['models/gemini-2.5-flash'])
+
+    catalog, from_cache = checker.get_model_catalog(client, cache_file=cache_file, ttl=60)
+    assert not from_cache and client.models.list_calls == 1
+    checker.save_catalog(catalog, cache_file)
+
+    catalog, from_cache = checker.get_model_catalog(client, cache_file=cache_file, ttl=60)
+    assert from_cache and catalog['models'] == ['models/gemini-2.5-flash']
+    assert client.models.list_calls == 1
+
+    # Expired, or an explicit refresh, lists again
+    _, from_cache = checker.get_model_catalog(client, cache_file=cache_file, ttl=-1)
+    assert not from_cache and client.models.list_calls == 2
+    _, from_cache = checker.get_model_catalog(client, cache_file=cache_file, ttl=60, refresh=True)
+    assert not from_cache and client.models.list_calls == 3
@@ -0,0 +1,60 @@
+import json
+import random
+
+from job_index import JobIndex, main, write_job_index
+from job_numbers import monthly
+
+PERIODS = (None, 'month', 'day', 'year')
+
+
+def make_jobs(n, seed=0):
+    rng = random.Random(seed)
+    jobs = []
+    for i in range(n):
+        title = f"AB - Crude Oil {i}"
+        job = {'title': title, 'raw_content': f"{title} | Salary: ...", 'scraped_at': f"2026-01-01T00:00:{i:06d}"}
+        if rng.random() < 0.8:
+            job.update(salary_min=rng.randrange(30, 6000), salary_period=rng.choice(PERIODS))
+        if rng.random() < 0.7:
+            job['contract_months'] = rng.randrange(1, 12)
+        jobs.append(job)
+    return jobs
+
+
+def test_range_filters_match_a_full_scan(tmp_path):
+    write_job_index(make_jobs(1300), str(tmp_path))  # a few RANGE_BLOCK checkpoints
+    index = JobIndex(str(tmp_path))
+    assert index.total == 1300
+    rows = index.rows(range(index.total))
+    salary = [monthly(job.get('salary_min'), job.get('salary_period')) for job in rows]
+
+    rng = random.Random(1)
+    bounds = [(None, None), (4000, 1000), (2000, 2000), (-5, 0), (200000, None), (None, 30)]
+    bounds += [(rng.randrange(0, 8000), rng.randrange(0, 8000)) for _ in range(50)]
+    for low, high in bounds:
+        expected = [i for i, value in enumerate(salary) if value is not None
+                    and (low is None or value >= low) and (high is None or value <= high)]
+        if low is None and high is None:
+            expected = list(range(index.total))
+        assert index.query(salary_min=low, salary_max=high) == expected, (low, high)
+        assert index.count(salary_min=low, salary_max=high) == len(expected)
+
+    for low, high in [(6, 3), (3, 6), (None, 4), (11, None), (12, 12)]:
+        expected = [i for i, job in enumerate(rows) if job.get('contract_months') is not None
+                    and (low is None or job['contract_months'] >= low)
+                    and (high is None or job['contract_months'] <= high)]
+        assert index.query(contract_min=low, contract_max=high) == expected, (low, high)
+
+
+def test_build_fills_rank_and_ship_type_on_basic_scraper_records(tmp_path):
+    snapshot = tmp_path / 'latest_jobs.json'
+    snapshot.write_text(json.dumps({'jobs': [
+        {'title': 'AB - Crude Oil', 'raw_text': 'AB - Crude Oil | Salary: $1500'},
+        {'title': 'THIRD ENG - Oil/Chem', 'raw_text': 'THIRD ENG - Oil/Chem | Salary: Negotiable'},
+    ]}))
+    main(['build', str(snapshot), '--out', str(tmp_path / 'index')])
+    index = JobIndex(str(tmp_path / 'index'))
+    assert sorted(index.index['rank']) == ['3rd Engineer', 'Able Seaman']
+    assert sorted(index.index['shipType']) == ['Chemical Tanker', 'Oil Tanker']
+    assert [job['title'] for job in index.rows(index.query(rank='Able Seaman', ship_type='Oil Tanker', salary_min=1000))] \
+        == ['AB - Crude Oil']
@@ -0,0 +1,36 @@
+import json
+
+import pytest
+
+from job_sinks import JSONSnapshotSink, NDJSONSink, write_jobs, read_jobs
+
+
+class FailingSink(NDJSONSink):
+    """Writes like NDJSONSink but fails while finishing, after the other sinks have finished theirs."""
+    name = 'failing'
+
+    def finish(self):
+        super().finish()
+        raise OSError('disk full')
+
+
+def test_failed_finish_leaves_every_previous_output_in_place(tmp_path):
+    latest = tmp_path / 'latest_jobs.json'
+    ndjson = tmp_path / 'jobs.ndjson'
+    write_jobs([{'title': 'Old'}], [JSONSnapshotSink(str(latest)), NDJSONSink(str(ndjson))])
+
+    sinks = [JSONSnapshotSink(str(latest)), NDJSONSink(str(ndjson)), FailingSink(str(tmp_path / 'broken.ndjson'))]
+    with pytest.raises(OSError):
+        write_jobs([{'title': 'New'}], sinks)
+
+    assert [job['title'] for job in read_jobs(str(latest))] == ['Old']
+    assert [job['title'] for job in read_jobs(str(ndjson))] == ['Old']
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['jobs.ndjson', 'latest_jobs.json']
+
+
+def test_write_jobs_reports_sizes_of_renamed_files(tmp_path):
+    latest = tmp_path / 'latest_jobs.json'
+    stats = write_jobs([{'title': 'A'}, {'title': 'B'}], [JSONSnapshotSink(str(latest))])
+    assert stats['json']['records'] == 2
+    assert stats['json']['bytes'] == latest.stat().st_size
+    assert json.loads(latest.read_text())['total_jobs'] == 2
@@ -0,0 +1,33 @@
+from job_posting import JobPosting
+from job_terms import extract_rank, extract_ship_type
+from near_dup import NearDupIndex, mark_near_duplicates
+
+CARD = ("{title} | Deadline: Urgent | Contract Duration: 8M (+1) | Total Needed: 1 | "
+        "Salary: $2050 | DWT/GRT/TEU: 105940/57220 | Flag: Marshall Islands | Joining: Singapore | View Details")
+
+
+def basic_record(title):
+    """What scrape_mariaid_jobs.py keeps: title and card text, no rank."""
+    return JobPosting.from_dict({'title': title, 'raw_text': CARD.format(title=title)})
+
+
+def simple_record(title):
+    """What scrape_mariaid_jobs_simple.py keeps: rank and ship type read from the card."""
+    text = CARD.format(title=title) + " | Apply Now"
+    return JobPosting.from_dict({'title': title, 'raw_text': text, 'rank': extract_rank(title),
+                                 'ship_type': extract_ship_type(text), 'source': 'MariAid'})
+
+
+def test_repost_from_the_other_scraper_is_flagged(tmp_path):
+    with NearDupIndex(str(tmp_path / 'near_dup.sqlite')) as index:
+        assert mark_near_duplicates([basic_record('AB - Crude Oil')], index) == 0
+        repost = simple_record('AB - Crude Oil')
+        assert repost['rank'] == 'Able Seaman'
+        assert mark_near_duplicates([repost], index) == 1
+        assert repost['duplicate_of']
+
+
+def test_cards_for_different_ranks_are_not_flagged(tmp_path):
+    with NearDupIndex(str(tmp_path / 'near_dup.sqlite')) as index:
+        mark_near_duplicates([simple_record('THIRD ENG - Crude Oil'), basic_record('FITTER - Crude Oil')], index)
+        assert mark_near_duplicates([basic_record('THIRD OFF - Crude Oil'), simple_record('OILER - Crude Oil')], index) == 0
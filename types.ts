@@ -187,6 +187,7 @@ export interface JobPosting {
   agencyAddress?: string; // Physical address of the agency
   mobile?: string; // Phone number (separate from email)
   email?: string; // Email address (separate from phone)
+  salaryMin?: number; // Monthly USD minimum (salary_min_monthly), for the salary filter
 }
 
 // Forum Types